@@ -0,0 +1,6 @@
+"""
+Segmentasyon ve kayıt sıcak yolları için çevrimdışı (CPU) mikro-benchmark.
+
+    python -m bench --sizes 50k,500k --out bench_results.json
+    python -m bench --compare bench_baseline.json --threshold 0.2
+"""
@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+
+import numpy as np
+import open3d as o3d
+
+from bench.runner import compare, measure
+from bench.stages import build_cases, default_workdir
+from bench.synthetic import parse_size
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m bench")
+    ap.add_argument("--sizes", default="50k,500k,2M",
+                    help="virgülle ayrılmış sahne boyutları (50k, 500k, 2M, ya da sayı)")
+    ap.add_argument("--filter", default="", help="yalnızca adı bu metni içeren vakalar")
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", help="karşılaştırılacak baseline JSON")
+    ap.add_argument("--threshold", type=float, default=0.2,
+                    help="izin verilen göreli yavaşlama (0.2 = %%20)")
+    args = ap.parse_args(argv)
+
+    o3d.utility.set_verbosity_level(o3d.utility.VerbosityLevel.Error)
+    sizes = [(s, parse_size(s)) for s in args.sizes.split(",") if s]
+    workdir = default_workdir()
+    try:
+        cases = build_cases(sizes, workdir, args.seed)
+        results = {}
+        for name, (fn, setup) in cases.items():
+            if args.filter and args.filter not in name:
+                continue
+            res = measure(fn, setup, repeats=args.repeats)
+            results[name] = res
+            print(f"{name:<36} {res['median_s'] * 1e3:10.1f} ms"
+                  f"  peak +{res['peak_mb']:7.1f} MB", flush=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "open3d": o3d.__version__,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, base, cur, ratio in regressions:
+            print(f"REGRESYON {name}: {base * 1e3:.1f} ms → {cur * 1e3:.1f} ms "
+                  f"(x{ratio:.2f})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# ─── runner.py ────────────────────────────────────────────────────────────────
+"""Zamanlama, tepe bellek ölçümü ve baseline karşılaştırması."""
+import statistics
+import threading
+import time
+
+from inference.tracing import current_rss
+
+
+class PeakMemory:
+    """
+    Blok süresince RSS'i arka planda örnekler. Open3D belleği C++ tarafında
+    ayırdığı için tracemalloc yerine RSS kullanılır.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.start = self.peak = 0
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self.start = self.peak = current_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    @property
+    def delta_mb(self) -> float:
+        return (self.peak - self.start) / 2**20
+
+
+def measure(fn, setup=None, repeats: int = 3, warmup: int = 0) -> dict:
+    """
+    `setup()` zamanlanmaz ve dönüşü `fn`'e verilir. Her tekrar için duvar
+    süresi ve tepe bellek artışı ölçülür; medyan ve minimum raporlanır.
+    """
+    for _ in range(warmup):
+        fn(setup() if setup else None)
+
+    times, peaks, extra = [], [], None
+    for _ in range(repeats):
+        arg = setup() if setup else None
+        with PeakMemory() as mem:
+            t0 = time.perf_counter()
+            out = fn(arg)
+            times.append(time.perf_counter() - t0)
+        peaks.append(mem.delta_mb)
+        if isinstance(out, dict):
+            extra = out
+    res = {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "repeats": repeats,
+        "peak_mb": max(peaks),
+    }
+    if extra:
+        res["info"] = extra
+    return res
+
+
+def compare(current: dict, baseline: dict, threshold: float):
+    """
+    Medyan süresi baseline'a göre `threshold` oranından fazla artan vakaları
+    (isim, baseline, şimdiki, oran) listesi olarak döner.
+    """
+    regressions = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "median_s" not in cur or base["median_s"] <= 0:
+            continue
+        ratio = cur["median_s"] / base["median_s"]
+        if ratio > 1.0 + threshold:
+            regressions.append((name, base["median_s"], cur["median_s"], ratio))
+    return regressions
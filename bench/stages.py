@@ -0,0 +1,130 @@
+# ─── stages.py ────────────────────────────────────────────────────────────────
+"""Benchmark vakaları: her sıcak yol aşaması ayrı ölçülür."""
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench.synthetic import make_scene, make_segment, write_stl_library
+from inference.cad import FACTOR, ensure_point_cloud
+from inference.registration import (
+    GLOBAL_BACKENDS,
+    REFINE_POINTS,
+    align_part_to_segment,
+    diagonal,
+    global_reg,
+    preprocess,
+    register_part_to_segment,
+)
+from inference.density import analyze_cloud, auto_params
+from inference.segmentation import segment_cloud
+
+CAD_POINTS = 10000
+
+# Soğuk süreçte pencerenin görünene kadar geçen süre; ağır modüllerin
+# (Open3D, VisPy) pencere açılırken yüklenmediği de raporlanır
+STARTUP_PROBE = """
+import json, os, sys, time
+t0 = time.perf_counter()
+from PyQt5 import QtWidgets
+app = QtWidgets.QApplication([])
+from gui.windows import MainWindow
+t1 = time.perf_counter()
+w = MainWindow(); w.show(); app.processEvents()
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1e3, "shown_ms": (t2 - t0) * 1e3,
+                  "open3d": "open3d" in sys.modules, "vispy": "vispy" in sys.modules}))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def _startup(_):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run([sys.executable, "-c", STARTUP_PROBE], env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _scaled_part(stl_path, cache_dir):
+    part = ensure_point_cloud(stl_path, CAD_POINTS, cache_dir)
+    part.scale(FACTOR, center=part.get_center())
+    return part
+
+
+def build_cases(sizes, workdir: Path, seed: int = 0):
+    """{vaka adı: (fn, setup)} sözlüğü. Girdiler bir kez üretilip paylaşılır."""
+    stl = write_stl_library(workdir / "part")
+    cache_dir = workdir / "STLtoPoint"
+    part = _scaled_part(stl["box"], cache_dir)
+    cases = {}
+
+    # ensure_point_cloud: her tekrar boş önbellekle Poisson örnekleme
+    def fresh_cache():
+        shutil.rmtree(workdir / "cold", ignore_errors=True)
+        return workdir / "cold"
+
+    for name, path in stl.items():
+        cases[f"ensure_point_cloud/{name}"] = (
+            lambda d, p=path: ensure_point_cloud(p, CAD_POINTS, d) and None,
+            fresh_cache,
+        )
+
+    if importlib.util.find_spec("PyQt5") is not None:
+        cases["startup/main_window"] = (_startup, None)
+
+    for label, n in sizes:
+        scene = make_scene(n, seed)
+        cases[f"segment_cloud/{label}"] = (
+            lambda _, s=scene: {"parts": len(segment_cloud(s))},
+            None,
+        )
+        cases[f"analyze_cloud/{label}"] = (
+            lambda _, s=scene: {"spacing": analyze_cloud(s).spacing},
+            None,
+        )
+        cases[f"segment_cloud/auto/{label}"] = (
+            lambda _, s=scene: {"parts": len(segment_cloud(s, params=auto_params(s)))},
+            None,
+        )
+
+        seg = make_segment(n, seed)
+        voxel = 0.01 * diagonal(seg)
+        cases[f"preprocess/{label}"] = (
+            lambda _, s=seg, v=voxel: preprocess(s, v) and None,
+            None,
+        )
+
+        # İsteğe bağlı son ince ayarın maliyeti aynı girdilerle ölçülür
+        for name, refine in ((label, 0), (f"refine/{label}", REFINE_POINTS)):
+            def register(_, s=seg, r=refine):
+                _, fit, rmse = register_part_to_segment(part, s, refine_points=r)
+                return {"fitness": fit, "rmse": float(rmse)}
+            cases[f"register_part_to_segment/{name}"] = (register, None)
+
+        src = preprocess(part, voxel)
+        tgt = preprocess(seg, voxel)
+        # Arka uçlar aynı girdilerle ölçülür; RANSAC eski vaka adını korur
+        for backend in GLOBAL_BACKENDS:
+            suffix = label if backend == "ransac" else f"{backend}/{label}"
+            cases[f"global_reg/{suffix}"] = (
+                lambda _, s=src, t=tgt, v=voxel, b=backend:
+                    {"fitness": global_reg(s[0], t[0], s[1], t[1], 1.5 * v, b).fitness},
+                None,
+            )
+
+            def align(_, s=seg, b=backend):
+                _, fit, rmse = align_part_to_segment(part, s, backend=b)
+                return {"fitness": fit, "rmse": float(rmse)}
+            cases[f"align_part_to_segment/{suffix}"] = (align, None)
+
+    return cases
+
+
+def default_workdir() -> Path:
+    return Path(tempfile.mkdtemp(prefix="3dinf_bench_"))
@@ -0,0 +1,101 @@
+# ─── synthetic.py ─────────────────────────────────────────────────────────────
+"""Deterministik sentetik girdiler: düzlem + kutu/silindir sahnesi ve STL'ler."""
+from pathlib import Path
+
+import numpy as np
+import open3d as o3d
+
+from inference.cad import FACTOR
+from inference.segmentation import PLANE_EPS
+
+SIZES = {"50k": 50_000, "500k": 500_000, "2M": 2_000_000}
+
+# CAD birimlerinde (mm) parça boyutları; FACTOR ile sahne birimine iner
+BOX_MM = (60.0, 40.0, 30.0)
+CYL_MM = (15.0, 45.0)            # yarıçap, yükseklik
+
+
+def parse_size(s: str) -> int:
+    return SIZES[s] if s in SIZES else int(float(s))
+
+
+def _box_surface(rng, n, ext):
+    """Kutu yüzeyinden alanla orantılı düzgün örnekleme."""
+    ex, ey, ez = ext
+    areas = np.array([ey * ez, ey * ez, ex * ez, ex * ez, ex * ey, ex * ey])
+    face = rng.choice(6, size=n, p=areas / areas.sum())
+    uvw = rng.random((n, 3)) * ext
+    axis = face // 2
+    uvw[np.arange(n), axis] = (face % 2) * np.asarray(ext)[axis]
+    return uvw - np.asarray(ext) / 2
+
+
+def _cylinder_surface(rng, n, r, h):
+    t = rng.random(n) * 2 * np.pi
+    z = (rng.random(n) - 0.5) * h
+    return np.c_[r * np.cos(t), r * np.sin(t), z]
+
+
+def _random_rotation(rng) -> np.ndarray:
+    q = rng.normal(size=4)
+    q /= np.linalg.norm(q)
+    return o3d.geometry.get_rotation_matrix_from_quaternion(q)
+
+
+def make_scene(n_points: int, seed: int = 0, noise: float = 0.0003):
+    """
+    1×1 düzlem üzerinde, düzlem eşiğinin (PLANE_EPS) üstünde duran kutu ve
+    silindirler. Noktaların yarısı düzlemde, yarısı nesnelerde; nesne sayısı
+    nokta sayısıyla artar ki nesne yüzey yoğunluğu sabit kalsın.
+    """
+    rng = np.random.default_rng(seed)
+    n_obj = int(np.clip(n_points // 25_000, 4, 60))
+    n_plane = n_points // 2
+    per_obj = (n_points - n_plane) // n_obj
+
+    plane = np.c_[rng.random((n_plane, 2)) - 0.5, rng.normal(0, noise, n_plane)]
+    grid = int(np.ceil(np.sqrt(n_obj)))
+    box = np.asarray(BOX_MM) * FACTOR
+    r, h = np.asarray(CYL_MM) * FACTOR
+
+    parts = [plane]
+    for i in range(n_obj):
+        if i % 2 == 0:
+            pts = _box_surface(rng, per_obj, box)
+        else:
+            pts = _cylinder_surface(rng, per_obj, r, h)
+        pts = pts @ _random_rotation(rng).T
+        cx, cy = (np.array(divmod(i, grid)) + 0.5) / grid - 0.5
+        pts += (cx, cy, 1.5 * PLANE_EPS)
+        parts.append(pts + rng.normal(0, noise, pts.shape))
+
+    pcd = o3d.geometry.PointCloud(o3d.utility.Vector3dVector(np.vstack(parts)))
+    return pcd
+
+
+def make_segment(n_points: int, seed: int = 0, noise: float = 0.0003):
+    """Rastgele pozda, FACTOR ölçeğinde tek bir kutu segmenti."""
+    rng = np.random.default_rng(seed)
+    pts = _box_surface(rng, n_points, np.asarray(BOX_MM) * FACTOR)
+    pts = pts @ _random_rotation(rng).T + rng.random(3)
+    pts += rng.normal(0, noise, pts.shape)
+    return o3d.geometry.PointCloud(o3d.utility.Vector3dVector(pts))
+
+
+def write_stl_library(directory) -> dict:
+    """Prosedürel kutu ve silindir STL'leri yazar; {isim: yol} döner."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    meshes = {
+        "box": o3d.geometry.TriangleMesh.create_box(*BOX_MM),
+        "cylinder": o3d.geometry.TriangleMesh.create_cylinder(
+            radius=CYL_MM[0], height=CYL_MM[1], resolution=64, split=8
+        ),
+    }
+    paths = {}
+    for name, mesh in meshes.items():
+        mesh.compute_vertex_normals()
+        path = directory / f"{name}.stl"
+        o3d.io.write_triangle_mesh(str(path), mesh)
+        paths[name] = path
+    return paths
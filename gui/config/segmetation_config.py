@@ -13,7 +13,26 @@ DEFAULT_CONFIG = {
         "distance_threshold": 0.1,
         "num_iterations": 1000,
         "eps": 0.01,
-        "min_points": 10
+        "min_points": 10,
+        "voxel_size": 0.002          # 0 = downsample kapalı
+    },
+    # Göreli modda parametreler nokta aralığının katı olarak saklanır ve
+    # her yeni bulutta onun aralığıyla mutlak değere çevrilir
+    "density": {
+        "relative": False,
+        "params": None               # None = density.RELATIVE_DEFAULTS
+    },
+    # Canlı önizleme: gecikme ve vekil bulut için zaman bütçesi
+    "preview": {
+        "enabled": False,
+        "debounce_ms": 300,
+        "budget_ms": 500
+    },
+    # Online mod kaynağı; donanım yoksa simüle kamera PLY karelerini oynatır
+    "camera": {
+        "source": "simulated",
+        "directory": "dataset/screen",
+        "fps": 10
     }
 }
 
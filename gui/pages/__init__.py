@@ -1,5 +1,20 @@
-from .home_page import HomePage
-from .segmentation_page import SegmentationPage
-from .calibration_page import CalibrationPage
-from .settings_page import SettingsPage
-from .account_page import AccountPage
+# Sayfa modülleri ilk erişimde içe aktarılır; Open3D/VisPy yükü pencere
+# açıldıktan sonraya kalır.
+import importlib
+
+_PAGES = {
+    "HomePage": ".home_page",
+    "SegmentationPage": ".segmentation_page",
+    "CalibrationPage": ".calibration_page",
+    "SettingsPage": ".settings_page",
+    "AccountPage": ".account_page",
+}
+
+__all__ = list(_PAGES)
+
+
+def __getattr__(name):
+    module = _PAGES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
@@ -6,16 +6,30 @@ PyQt5 + VisPy GUI
 – Eşleştir butonu: ICP-tabanlı segment hizalama ve görselleştirme
 """
 
-import sys, os, json, copy
+import sys, os, json
 from pathlib import Path
 
 import numpy as np
-import open3d as o3d
 
-from PyQt5 import QtWidgets, QtCore
-from vispy import scene
-from vispy.scene import visuals
-from matplotlib import cm
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+from inference import (
+    FACTOR, ensure_point_cloud, load_cloud, segment_cloud, match_segments,
+    match_library, assign_library, stage_cache,
+)
+from inference.cad import CACHE_DIR, cad_key, prewarm, scaled_cloud
+from inference.matching import transform_points
+from inference.signature import SIZE_TOL
+from inference.camera import open_camera
+from inference.segmentation import DEFAULT_PARAMS, PlaneTracker
+from inference.density import auto_params
+from inference.tracking import PoseTracker
+from inference import tracing
+from gui.utils.colors import PACKED, PART_RGB, label_colors, pack_rgb
+from gui.utils.camera_worker import CameraWorker
+from gui.utils.renderer import PointCanvas
+from gui.utils.scheduler import job_scheduler
+from gui.utils.timing_panel import TimingPanel
 
 # ------------------------------------------------------
 # 0) Ayarlar
@@ -24,157 +38,185 @@ settings_path = Path("config/settings.json")
 if settings_path.exists():
     with open(settings_path, "r") as sf:
         settings = json.load(sf)
-    cad_point_count = settings.get("cad_point_count", 10000)
 else:
-    cad_point_count = 10000
-
-CACHE_DIR = Path("dataset/STLtoPoint")
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
-def ensure_point_cloud(path: Path, n_pts: int) -> o3d.geometry.PointCloud:
-    cache_file = CACHE_DIR / f"{path.stem}_{n_pts}pts.ply"
-    if cache_file.exists():
-        return o3d.io.read_point_cloud(str(cache_file))
-
-    if path.suffix.lower() == ".ply":
-        pcd = o3d.io.read_point_cloud(str(path))
-    elif path.suffix.lower() == ".stl":
-        mesh = o3d.io.read_triangle_mesh(str(path))
-        if not mesh.has_vertex_normals():
-            mesh.compute_vertex_normals()
-        pcd = mesh.sample_points_poisson_disk(n_pts)
-        o3d.io.write_point_cloud(str(cache_file), pcd)
-    else:
-        raise ValueError(f"Desteklenmeyen uzantı: {path.suffix}")
-    return pcd
+    settings = {}
+cad_point_count = settings.get("cad_point_count", 10000)
+# Eşleştirme: paralel süreç sayısı ve erken durdurma eşiği
+match_workers = settings.get("match_workers", 0) or os.cpu_count() or 1
+match_fitness_threshold = settings.get("match_fitness_threshold", 0.95)
+# Kütüphane eşleştirmesi: bu fitness'ın altındaki çiftler atanmaz
+library_min_fitness = settings.get("library_min_fitness", 0.05)
+# RANSAC öncesi imza ön elemesi toleransı (null = kapalı)
+prefilter_size_tol = settings.get("prefilter_size_tol", SIZE_TOL)
+# Ön eleme sıralamasına ortalama FPFH histogramı (daha isabetli, daha yavaş)
+prefilter_fpfh = settings.get("prefilter_fpfh", False)
+# ICP kestirimi: nokta-nokta (varsayılan) ya da nokta-düzlem
+icp_point_to_plane = settings.get("icp_point_to_plane", False)
+# Global kayıt arka ucu: "ransac" (uyarlamalı) ya da "fgr"
+global_registration = settings.get("global_registration", "ransac")
+# Online modda seçili parçanın pozunu kareden kareye izle
+pose_tracking = settings.get("pose_tracking", True)
+track_min_fitness = settings.get("track_min_fitness", 0.5)
+# Online mod: kamera kaynağı (donanım yoksa simüle kamera PLY karelerini oynatır)
+camera_cfg = settings.get(
+    "camera", {"source": "simulated", "directory": "dataset/screen", "fps": 10}
+)
+# Tuval başına kare başı nokta bütçesi (0 = LOD kapalı, tüm noktalar çizilir)
+render_point_budget = settings.get("render_point_budget", 1_000_000)
+# Segmentasyon aşama önbelleğinin bellek sınırı (MB)
+stage_cache_mb = settings.get("stage_cache_mb", 512)
+# CAD nokta bulutu önbelleğinin disk bütçesi (MB)
+cad_cache_mb = settings.get("cad_cache_mb", 1024)
+# Eşleştirmenin tepe bellek bütçesi (MB, 0 = sınırsız): işler gruplanır,
+# bütçeyi tek başına aşan segmentler alt örneklenir
+match_memory_mb = settings.get("match_memory_mb", 0)
+match_memory_budget = (match_memory_mb << 20) or None
+# Segmentasyon parametreleri: sabitler ya da bulutun nokta aralığından
+# türetilenler (göreli katlar; null = density.RELATIVE_DEFAULTS)
+auto_segment_params = settings.get("auto_segment_params", False)
+segment_relative_params = settings.get("segment_relative_params", None)
+# Aşama izleme (span) açılışta açık mı; panelden de açılıp kapatılabilir
+trace_stages = settings.get("tracing", False)
+CAD_DIR = Path("dataset/part")
+
+# segment_cloud parametreleri; aynı bulut + aynı parametre = aynı iş anahtarı
+# (otomatik modda parametreler buluttan belirlenir, sürüm yeterli)
+SEGMENT_PARAMS = ("auto",) if auto_segment_params else tuple(DEFAULT_PARAMS)
+
+
+def segment_scene(pcd, cache=None):
+    """Ayara göre sabit ya da yoğunluktan türetilmiş parametrelerle segmentasyon."""
+    params = auto_params(pcd, segment_relative_params) if auto_segment_params else None
+    return segment_cloud(pcd, cache=cache, params=params)
+
+
+def camera_segmenter():
+    """
+    Kamera kareleri için segmentasyon; zemin düzlemi kareden kareye sıcak
+    başlatılır. Otomatik modda parametreler ilk kareden bir kez türetilir.
+    """
+    tracker = PlaneTracker()
+    params = []
+
+    def process(cloud):
+        if auto_segment_params and not params:
+            params.append(auto_params(cloud, segment_relative_params))
+        return segment_cloud(cloud, tracker, params=params[0] if params else None)
+    return process
 
 # ------------------------------------------------------
-# 1) VisPyCanvas
+# 1) Paralel eşleştirme
 # ------------------------------------------------------
-class VisPyCanvas(scene.SceneCanvas):
-    def __init__(self, parent=None):
-        super().__init__(keys=None, parent=parent, bgcolor="black")
-        self.unfreeze()
-        self.view = self.central_widget.add_view()
-        self.view.camera = scene.cameras.ArcballCamera(fov=60.0)
-        self.markers = visuals.Markers()
-        self.view.add(self.markers)
-        self.freeze()
-
-    def set_points(self, pts: np.ndarray, colors=None, size=3.0):
-        if pts.size == 0:
-            return
-        if colors is None:
-            colors = np.tile([0.3, 0.6, 1.0, 1.0], (pts.shape[0], 1))
-        self.markers.set_data(pts, edge_width=0.0, face_color=colors, size=size)
-        self.view.camera.set_range(
-            x=(pts[:, 0].min(), pts[:, 0].max()),
-            y=(pts[:, 1].min(), pts[:, 1].max()),
-            z=(pts[:, 2].min(), pts[:, 2].max()),
-        )
-
-# ------------------------------------------------------
-# 2) Yardımcı hizalama fonksiyonları
-# ------------------------------------------------------
-def diagonal(pc: o3d.geometry.PointCloud) -> float:
-    aabb = pc.get_axis_aligned_bounding_box()
-    return np.linalg.norm(aabb.get_max_bound() - aabb.get_min_bound())
-
-def preprocess(pc: o3d.geometry.PointCloud, voxel: float):
-    down = pc.voxel_down_sample(voxel)
-    down.estimate_normals(
-        o3d.geometry.KDTreeSearchParamHybrid(radius=4 * voxel, max_nn=50)
-    )
-    fpfh = o3d.pipelines.registration.compute_fpfh_feature(
-        down,
-        o3d.geometry.KDTreeSearchParamHybrid(radius=6 * voxel, max_nn=200),
-    )
-    return down, fpfh
-
-def global_reg(src_d, tgt_d, src_f, tgt_f, dist):
-    return o3d.pipelines.registration.registration_ransac_based_on_feature_matching(
-        src_d,
-        tgt_d,
-        src_f,
-        tgt_f,
-        mutual_filter=False,
-        max_correspondence_distance=dist,
-        estimation_method=o3d.pipelines.registration.TransformationEstimationPointToPoint(),
-        ransac_n=4,
-        checkers=[
-            o3d.pipelines.registration.CorrespondenceCheckerBasedOnEdgeLength(0.9),
-            o3d.pipelines.registration.CorrespondenceCheckerBasedOnDistance(dist),
-        ],
-        criteria=o3d.pipelines.registration.RANSACConvergenceCriteria(50000, 1000),
-    )
-
-# Segmentasyon parametreleri (gerekirse düzenleyin)
-VOXEL_SZ  = 0.002
-PLANE_EPS = 0.422
-DB_EPS_1, DB_PTS_1 = 0.025, 120
-DB_EPS_2, DB_PTS_2 = 0.015, 20
-FACTOR = 0.00068                 # ← parça ölçek faktörü
-
-def segment_cloud(pcd: o3d.geometry.PointCloud):
-    pcd_ds = pcd.voxel_down_sample(VOXEL_SZ)
-    pcd_ds, _ = pcd_ds.remove_statistical_outlier(nb_neighbors=30, std_ratio=2.0)
-
-    _, inliers = pcd_ds.segment_plane(
-        distance_threshold=PLANE_EPS, ransac_n=3, num_iterations=5000
-    )
-    ground  = pcd_ds.select_by_index(inliers)
-    objects = pcd_ds.select_by_index(inliers, invert=True)
-
-    lbl1 = np.array(objects.cluster_dbscan(
-        eps=DB_EPS_1, min_points=DB_PTS_1, print_progress=False))
-    cmap = cm.get_cmap("tab20", max(20, lbl1.max() + 1))
-
-    raw_parts, colored_parts = [], []
-    for l1 in range(lbl1.max() + 1):
-        sub = objects.select_by_index(np.where(lbl1 == l1)[0])
-
-        lbl2 = np.array(sub.cluster_dbscan(
-            eps=DB_EPS_2, min_points=DB_PTS_2, print_progress=False))
-
-        for l2 in range(lbl2.max() + 1):
-            part_raw = sub.select_by_index(np.where(lbl2 == l2)[0])
-            raw_parts.append(part_raw)
-
-            color = cmap(len(colored_parts))[:3]
-            colored_parts.append(copy.deepcopy(part_raw).paint_uniform_color(color))
-
-    ground.paint_uniform_color([0.6, 0.6, 0.6])
-    return ground, raw_parts, colored_parts
-
-def align_part_to_segment(part_orig: o3d.geometry.PointCloud,
-                          segment:   o3d.geometry.PointCloud):
-    seg_diag = diagonal(segment)
-    if seg_diag == 0:
-        return None, 0, np.inf
-
-    part = copy.deepcopy(part_orig)
-    part.translate(segment.get_center() - part.get_center(), relative=True)
-
-    voxel = 0.01 * seg_diag
-    src_d, src_f = preprocess(part, voxel)
-    tgt_d, tgt_f = preprocess(segment, voxel)
-
-    r = global_reg(src_d, tgt_d, src_f, tgt_f, 1.5 * voxel)
-    icp = o3d.pipelines.registration.registration_icp(
-        part,
-        segment,
-        max_correspondence_distance=voxel,
-        init=r.transformation,
-        estimation_method=o3d.pipelines.registration.TransformationEstimationPointToPoint(),
-        criteria=o3d.pipelines.registration.ICPConvergenceCriteria(max_iteration=50),
-    )
-
-    part_aligned = copy.deepcopy(part)
-    part_aligned.transform(icp.transformation)
-    return part_aligned, icp.fitness, icp.inlier_rmse
+class MatchingWorker(QtCore.QObject):
+    """
+    Tüm segmentleri süreç havuzunda aynı anda hizalar; her segmentin sonucu
+    biter bitmez yayınlanır. Fitness eşiğe ulaşınca kalan işler iptal edilir.
+    `run` iş zamanlayıcısının thread havuzunda çalışır.
+    """
+    segment_done = QtCore.pyqtSignal(int, float, float)
+    best_updated = QtCore.pyqtSignal(np.ndarray, float, float)
+    error = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, pool, part_pcd, segments, fit_threshold, cad_key=None):
+        super().__init__()
+        self.pool = pool
+        self.part_pcd = part_pcd
+        self.segments = segments
+        self.cad_key = cad_key
+        self.fit_threshold = fit_threshold
+        self.best_fit, self.best_rmse = -1.0, np.inf
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    @property
+    def cancelled(self) -> bool:
+        """Kullanıcı iptal etti (eşikle erken durma iptal sayılmaz)."""
+        return self._stop
+
+    def run(self):
+        try:
+            for idx, pts, _, fit, rmse in match_segments(
+                self.pool, self.part_pcd, self.segments, self.cad_key,
+                prefilter_size_tol, icp_point_to_plane, global_registration,
+                match_memory_budget, prefilter_fpfh,
+            ):
+                if pts is not None and (
+                    fit > self.best_fit
+                    or (fit == self.best_fit and rmse < self.best_rmse)
+                ):
+                    self.best_fit, self.best_rmse = fit, rmse
+                    self.best_updated.emit(pts, fit, rmse)
+                self.segment_done.emit(idx, fit, rmse)
+                if self._stop or self.best_fit >= self.fit_threshold:
+                    break
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            self.finished.emit()
+
+
+class LibraryMatchingWorker(QtCore.QObject):
+    """
+    Kütüphanedeki tüm parçaları tüm segmentlere süreç havuzunda hizalar,
+    ardından bire bir atamayı çözer. `run` zamanlayıcının thread'inde çalışır.
+    """
+    pair_done = QtCore.pyqtSignal(int, int)          # biten, toplam
+    result_ready = QtCore.pyqtSignal(object)         # (adlar, [SegmentMatch], [noktalar])
+    error = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, pool, load_part, cad_paths, segments, min_fitness):
+        super().__init__()
+        self.pool = pool
+        self.load_part = load_part           # yol -> (PointCloud, cad_key)
+        self.cad_paths = cad_paths
+        self.segments = segments
+        self.min_fitness = min_fitness
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    def run(self):
+        try:
+            parts = []
+            for path in self.cad_paths:
+                pcd, key = self.load_part(path)
+                pcd.scale(FACTOR, center=pcd.get_center())
+                parts.append((pcd, key))
+                if self._stop:
+                    return
+
+            total = len(parts) * len(self.segments)
+            results = []
+            for res in match_library(self.pool, parts, self.segments,
+                                     prefilter_size_tol, icp_point_to_plane,
+                                     global_registration, match_memory_budget,
+                                     prefilter_fpfh):
+                results.append(res)
+                self.pair_done.emit(len(results), total)
+                if self._stop:
+                    return
+
+            matches = assign_library(results, len(self.segments), len(parts),
+                                     self.min_fitness)
+            aligned = [
+                None if m.part < 0 else
+                transform_points(np.asarray(parts[m.part][0].points), m.pose)
+                for m in matches
+            ]
+            names = [Path(p).name for p in self.cad_paths]
+            self.result_ready.emit((names, matches, aligned))
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            self.finished.emit()
 
 # ------------------------------------------------------
-# 3) HomePage
+# 2) HomePage
 # ------------------------------------------------------
 COLORS = {
     "Screen 3D Point Cloud":    "#868686",
@@ -232,30 +274,74 @@ class HomePage(QtWidgets.QWidget):
         self.eslestirButton.clicked.connect(self.handleMatching)
         vbox.addWidget(self.eslestirButton)
 
+        self.libraryButton = QtWidgets.QPushButton("Kütüphaneyle Eşleştir")
+        self.libraryButton.setToolTip(
+            "Tüm CAD parçalarını tüm segmentlere hizalar ve bire bir atar"
+        )
+        self.libraryButton.clicked.connect(self.handleLibraryMatching)
+        vbox.addWidget(self.libraryButton)
+
+        self.matchStatus = QtWidgets.QLabel("")
+        self.matchStatus.setWordWrap(True)
+        vbox.addWidget(self.matchStatus)
+
+        # Kütüphane eşleştirmesinin segment başına sonucu
+        self.libraryTable = QtWidgets.QTableWidget(0, 5)
+        self.libraryTable.setHorizontalHeaderLabels(
+            ["Segment", "Parça", "Fitness", "RMSE", "Konum (x, y, z)"]
+        )
+        self.libraryTable.verticalHeader().setVisible(False)
+        self.libraryTable.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.libraryTable.horizontalHeader().setStretchLastSection(True)
+        self.libraryTable.hide()
+        vbox.addWidget(self.libraryTable, 1)
+
+        # Segmentasyon + eşleştirme aşama süreleri (süreç havuzundakiler dahil)
+        if trace_stages:
+            tracing.enable()
+        self.timingPanel = TimingPanel(self)
+        vbox.addWidget(self.timingPanel)
+
         self.cadLabel = QtWidgets.QLabel("CAD Dosyaları")
         self.cadLabel.setStyleSheet("font-weight: bold;")
         vbox.addWidget(self.cadLabel)
 
         self.cadList = QtWidgets.QListWidget()
-        self.loadStlFiles("dataset/part")
+        self.loadStlFiles(CAD_DIR)
         self.cadList.itemClicked.connect(self.handleCadSelection)
         vbox.addWidget(self.cadList, 1)
 
         mainLayout.addWidget(rightWidget, 1)
 
         # ── Canvas'lar
-        self.screenCanvas = VisPyCanvas(self)
+        self.screenCanvas = PointCanvas(self, render_point_budget)
         self.screenBody.addWidget(self.screenCanvas.native)
 
-        self.cadCanvas = VisPyCanvas(self)
+        self.cadCanvas = PointCanvas(self, render_point_budget)
         self.cadBody.addWidget(self.cadCanvas.native)
 
-        self.segCanvas = VisPyCanvas(self)
+        self.segCanvas = PointCanvas(self, render_point_budget)
         self.segBody.addWidget(self.segCanvas.native)
 
-        self.matchCanvas = VisPyCanvas(self)
+        self.matchCanvas = PointCanvas(self, render_point_budget)
         self.matchBody.addWidget(self.matchCanvas.native)
 
+        # Arka plan işleri ortak zamanlayıcıda; bulut sürümü iş anahtarına girer
+        self._jobs = job_scheduler()
+        self._cloud_version = 0
+        self._match_worker = None
+        self._library_worker = None
+        self._camera_worker = None
+
+        # CAD kütüphanesi arka planda örneklenir; dizin/dosya değişince yeniden
+        self._prewarm = {}
+        self._cad_watcher = QtCore.QFileSystemWatcher(self)
+        self._cad_watcher.directoryChanged.connect(self._schedule_prewarm)
+        self._cad_watcher.fileChanged.connect(self._schedule_prewarm)
+        self._prewarm_timer = QtCore.QTimer(self, singleShot=True, interval=500)
+        self._prewarm_timer.timeout.connect(self._prewarm_cad)
+        self._prewarm_cad()
+
     # ───────────────────────── UI yardımcıları ──────────────────
     def box(self, title: str):
         frame = QtWidgets.QFrame()
@@ -282,117 +368,427 @@ class HomePage(QtWidgets.QWidget):
 
     # ───────────────────────── Olaylar ──────────────────────────
     def handleCameraConnection(self):
-        QtWidgets.QMessageBox.warning(
-            self,
-            "Kamera Bağlantısı",
-            "Kameraya bağlanılamadı, lütfen .ply dosyası seçin.",
+        if self._camera_worker is not None:
+            self.stopCamera()
+            return
+
+        cam = open_camera(camera_cfg)
+        if cam is None:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Kamera Bağlantısı",
+                "Kameraya bağlanılamadı, lütfen .ply dosyası seçin.",
+            )
+            fn, _ = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Ply dosyası seç", "", "PLY Files (*.ply)"
+            )
+            if fn:
+                self.load_ply_and_display(fn)
+            return
+
+        # Her kare kamera thread'inde segmentlenir, UI yalnızca çizer.
+        # Sabit kamerada zemin düzlemi kareden kareye sıcak başlatılır.
+        process = camera_segmenter()
+        if pose_tracking and hasattr(self, "current_cad_pcd"):
+            process = self._tracking_process(process)
+        self._camera_worker = CameraWorker(cam, process)
+        self._camera_worker.frame_ready.connect(self._on_camera_frame)
+        self._camera_worker.error.connect(self._on_camera_error)
+        self._camera_worker.start()
+        self.cameraButton.setText("Online")
+        self.cameraButton.setStyleSheet(
+            "background-color: green; color: white; font-weight: bold;"
         )
-        fn, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Ply dosyası seç", "", "PLY Files (*.ply)"
+
+    def _tracking_process(self, segment):
+        """Segmentasyona seçili parçanın poz izlemesini ekler; (sonuç, eşleşmeler) döner."""
+        part = scaled_cloud(self.current_cad_pcd, FACTOR)
+        self._track_part_pts = np.asarray(part.points)
+        tracker = PoseTracker(
+            [(part, self.current_cad_key)], track_min_fitness,
+            size_tol=prefilter_size_tol, point_to_plane=icp_point_to_plane,
+            backend=global_registration,
         )
-        if fn:
-            self.load_ply_and_display(fn)
+
+        def process(cloud):
+            result = segment(cloud)
+            return result, tracker.update(result)
+        return process
+
+    def stopCamera(self):
+        if self._camera_worker is None:
+            return
+        self._camera_worker.stop()
+        self._camera_worker.wait()
+        self._camera_worker = None
+        self.cameraButton.setText("Offline")
+        self.cameraButton.setStyleSheet(
+            "background-color: red; color: white; font-weight: bold;"
+        )
+
+    def _on_camera_frame(self, frame, result, stats):
+        pcd = frame.cloud
+        self.current_pcd = pcd
+        self._cloud_version += 1
+        cols = np.asarray(pcd.colors) if pcd.has_colors() else None
+        self.screenCanvas.set_points(np.asarray(pcd.points), cols, fit=False)
+        matches = None
+        if isinstance(result, tuple):
+            result, matches = result
+        if result is not None:
+            self.showSegmentation(result)
+        if matches is not None:
+            self._show_tracked(np.asarray(pcd.points), matches)
+        self.cameraButton.setText(
+            f"Online · {stats['fps']:.1f} FPS · {stats['latency_ms']['p50']:.0f} ms"
+            f" · düşen {stats.get('dropped', 0)}"
+        )
+
+    def _show_tracked(self, ref_pts, matches):
+        # ref gri, izlenen parçalar kırmızı; global kayıt atlanan kareler sayılır
+        aligned = [transform_points(self._track_part_pts, m.pose) for m in matches]
+        cols = [pack_rgb((102, 102, 102), len(ref_pts))]
+        cols += [pack_rgb((255, 0, 0), len(a)) for a in aligned]
+        self.matchCanvas.set_points(np.vstack([ref_pts, *aligned]),
+                                    np.concatenate(cols), fit=False)
+        warm = sum(m.warm for m in matches)
+        best = max((m.fitness for m in matches), default=0.0)
+        self.matchStatus.setText(
+            f"İzlenen: {len(matches)} (sıcak {warm})   En iyi fitness: {best:.3f}"
+        )
+
+    def _on_camera_error(self, msg):
+        QtWidgets.QMessageBox.warning(self, "Kamera", f"Akış hatası: {msg}")
+
+    def shutdown(self):
+        """Pencere kapanırken arka plan işlerini durdurur."""
+        self.stopCamera()
+        self._prewarm_timer.stop()
+        for fut in self._prewarm.values():
+            fut.cancel()
+        for slot in ("home.segment", "home.match.segment", "home.match", "home.cad",
+                     "home.library.segment", "home.library"):
+            self._jobs.cancel(slot)
 
     def loadStlFiles(self, directory):
+        names = []
         if os.path.isdir(directory):
-            for fn in os.listdir(directory):
-                if fn.lower().endswith(".stl"):
-                    self.cadList.addItem(fn)
+            names = [fn for fn in os.listdir(directory) if fn.lower().endswith(".stl")]
+        shown = [self.cadList.item(i).text() for i in range(self.cadList.count())]
+        if names != shown:
+            self.cadList.clear()
+            self.cadList.addItems(names)
+        return [Path(directory) / fn for fn in names]
+
+    def _schedule_prewarm(self, _path=None):
+        # Kaydetme sırasında art arda gelen bildirimler tek taramaya toplanır
+        self._prewarm_timer.start()
+
+    def _prewarm_cad(self):
+        """Listeyi yeniler, her STL'yi süreç havuzunda önbelleğe örnekler."""
+        paths = self.loadStlFiles(CAD_DIR)
+        watched = set(self._cad_watcher.files() + self._cad_watcher.directories())
+        missing = [str(p) for p in [CAD_DIR, *paths] if str(p) not in watched and p.exists()]
+        if missing:
+            self._cad_watcher.addPaths(missing)
+        # Süren işler tekrar gönderilmez; bitmiş olanlar yalnız özet + başlık okur
+        todo = [p for p in paths if p not in self._prewarm or self._prewarm[p].done()]
+        if todo:
+            self._prewarm.update(prewarm(
+                todo, cad_point_count, self._jobs.process_pool(match_workers),
+                CACHE_DIR, cad_cache_mb << 20,
+            ))
 
     def load_ply_and_display(self, ply_path):
-        pcd = o3d.io.read_point_cloud(str(ply_path))
-        self.current_pcd = pcd
-        pts = np.asarray(pcd.points)
-        cols = (
-            np.hstack([np.asarray(pcd.colors), np.ones((len(pcd.points), 1))])
-            if pcd.colors
-            else None
-        )
-        self.screenCanvas.set_points(pts, cols)
+        cloud = load_cloud(ply_path)
+        self.current_pcd = cloud.to_o3d()
+        self._cloud_version += 1
+        # Görüntüleme memmap sütunlarından kopyasız beslenir
+        self.screenCanvas.set_points(cloud.points, cloud.colors)
 
     def handleCadSelection(self, item: QtWidgets.QListWidgetItem):
-        stl_path = Path("dataset/part") / item.text()
-        pcd = ensure_point_cloud(stl_path, cad_point_count)
+        # Tıklama GUI'yi bloklamaz: ön ısıtma sürüyorsa onun bitmesi beklenir
+        stl_path = CAD_DIR / item.text()
+        job = self._jobs.submit("home.cad", None, self._load_cad, stl_path,
+                                self._prewarm.get(stl_path))
+        job.then(self._show_cad,
+                 lambda msg: QtWidgets.QMessageBox.warning(self, "CAD", msg))
+
+    @staticmethod
+    def _load_cad(stl_path, warm=None):
+        if warm is not None and not warm.cancelled():
+            warm.exception()             # hata varsa aşağıda yeniden denenir
+        pcd = ensure_point_cloud(stl_path, cad_point_count,
+                                 max_bytes=cad_cache_mb << 20)
+        return stl_path, pcd, cad_key(stl_path, cad_point_count)
+
+    def _show_cad(self, loaded):
+        stl_path, pcd, key = loaded
         self.current_cad_pcd = pcd
+        self.current_cad_path = stl_path
+        self.current_cad_key = key
         pts = np.asarray(pcd.points)
-        cols = (
-            np.hstack([np.asarray(pcd.colors), np.ones((len(pcd.points), 1))])
-            if pcd.colors
-            else None
-        )
+        cols = np.asarray(pcd.colors) if pcd.has_colors() else None
         self.cadCanvas.set_points(pts, cols)
 
     # ───────────────────── Segmentasyon Butonu ──────────────────
+    def _segment_job(self, slot):
+        """Güncel bulutun segmentasyonu; aynı bulut için iş paylaşılır."""
+        key = ("segment", self._cloud_version) + SEGMENT_PARAMS
+        return self._jobs.submit(slot, key, segment_scene, self.current_pcd,
+                                 cache=stage_cache(stage_cache_mb << 20))
+
     def handleSegmentation(self):
         if not hasattr(self, "current_pcd"):
             QtWidgets.QMessageBox.warning(self, "Segmentasyon", "Önce .ply yükleyin.")
             return
 
-        ground, raw_parts, colored_parts = segment_cloud(self.current_pcd)
-
-        pts  = np.concatenate(
-            [np.asarray(ground.points)] + [np.asarray(p.points) for p in colored_parts]
+        self._segment_job("home.segment").then(
+            self.showSegmentation,
+            lambda msg: QtWidgets.QMessageBox.warning(self, "Segmentasyon", f"Hata: {msg}"),
         )
-        cols = np.concatenate(
-            [np.tile([0.5, 0.5, 0.5, 1.0], (len(ground.points), 1))]
-            + [
-                np.tile(list(p.colors[0]) + [1.0], (len(p.points), 1))
-                for p in colored_parts
-            ]
-        )
-        self.segCanvas.set_points(pts, cols)
+
+    def showSegmentation(self, result):
+        # Zemin + parçalar sıralı dizinin sonunda bitişik; gürültü gösterilmez
+        gs = result.ground_start
+        cols = label_colors(result.labels[gs:], len(result), PACKED)
+        self.segCanvas.set_points(result.points[gs:], cols)
 
     # ───────────────────── Eşleştir Butonu ──────────────────────
     def handleMatching(self):
+        if self._jobs.current("home.match.segment") is not None:
+            self._cancel_matching()
+            return
+
         if not hasattr(self, "current_pcd") or not hasattr(self, "current_cad_pcd"):
             QtWidgets.QMessageBox.warning(
                 self, "Eşleştirme", "Önce hem Screen hem de CAD verisi yükleyin."
             )
             return
 
-        # 1) Kopyalar & ölçek
-        ref_pc = copy.deepcopy(self.current_pcd)
-        tgt_pc = copy.deepcopy(self.current_cad_pcd)
-        tgt_pc.scale(FACTOR, center=tgt_pc.get_center())
+        # 1) Ölçekli CAD (yalnız nokta + normal; renkler kopyalanmaz)
+        tgt_pc = scaled_cloud(self.current_cad_pcd, FACTOR)
+        cad_key = self.current_cad_key
 
-        # 2) Segmentasyon
-        _, raw_parts, _ = segment_cloud(ref_pc)
-        if not raw_parts:
+        # 2) Segmentasyon: aynı bulutun süren ya da biten işi yeniden kullanılır
+        ref_pts = np.asarray(self.current_pcd.points)
+        seg_job = self._segment_job("home.match.segment")
+        seg_job.then(
+            lambda result: self._start_matching(seg_job, result, ref_pts, tgt_pc, cad_key),
+            self._on_matching_error,
+        )
+        self.eslestirButton.setText("İptal Et")
+        self.matchStatus.setText("Segmentasyon bekleniyor…")
+
+    def _start_matching(self, seg_job, result, ref_pts, tgt_pc, cad_key):
+        if self._jobs.current("home.match.segment") is not seg_job:
+            return                      # bu arada iptal edildi
+        if not len(result):
+            self._reset_matching()
             QtWidgets.QMessageBox.warning(self, "Eşleştirme", "Parça bulunamadı.")
             return
 
-        # 3) Her segmente hizala, en iyisini seç
-        best_fit, best_rmse, best_aligned = -1, np.inf, None
-        for seg in raw_parts:
-            aligned, fit, rmse = align_part_to_segment(tgt_pc, seg)
-            if aligned is None:
-                continue
-            if fit > best_fit or (fit == best_fit and rmse < best_rmse):
-                best_fit, best_rmse, best_aligned = fit, rmse, aligned
+        # 3) Tüm segmentlere paralel hizala, en iyiyi akışla göster
+        self._set_reference(ref_pts)
+        self._match_total, self._match_done = len(result), 0
 
-        if best_aligned is None:
+        worker = self._match_worker = MatchingWorker(
+            self._jobs.process_pool(match_workers), tgt_pc,
+            list(result.iter_part_points()), match_fitness_threshold, cad_key
+        )
+        worker.segment_done.connect(self._on_segment_matched)
+        worker.best_updated.connect(self._on_best_match)
+        worker.error.connect(self._on_matching_error)
+        worker.finished.connect(self._on_matching_finished)
+
+        self.matchStatus.setText(f"Eşleştiriliyor: 0/{self._match_total}")
+        self._jobs.submit("home.match", None, worker.run, on_cancel=worker.stop)
+
+    def _cancel_matching(self):
+        # Süren eşleştirme kendi finished sinyaliyle kapanır
+        self._jobs.cancel("home.match")
+        if self._match_worker is None:
+            self._reset_matching()
+
+    def _reset_matching(self):
+        self._jobs.cancel("home.match.segment")
+        self.eslestirButton.setText("Eşleştir")
+        self.matchStatus.setText("")
+
+    def _on_segment_matched(self, idx, fit, rmse):
+        self._match_done += 1
+        w = self.sender()
+        self.matchStatus.setText(
+            f"Eşleştiriliyor: {self._match_done}/{self._match_total}\n"
+            f"En iyi fitness: {max(w.best_fit, 0):.3f}   RMSE: {w.best_rmse:.6f}"
+        )
+
+    def _set_reference(self, ref_pts):
+        """Eşleştirme tuvalinin gri sahnesi; parçalar ortak tamponun sonuna yazılır."""
+        self._ref_pts = ref_pts
+        self._ref_cols = pack_rgb((102, 102, 102), len(ref_pts))
+        self._overlay = None
+        self.matchCanvas.set_points(ref_pts, self._ref_cols)
+
+    def _show_overlay(self, parts):
+        """
+        parts: [(noktalar, paketli renk)]. Sahne + parçalar tek float32 tampona
+        bir kez yazılır; aynı boyutta yeni sonuçta yalnız parça kısmı güncellenir.
+        """
+        n_ref = len(self._ref_pts)
+        n = n_ref + sum(len(p) for p, _ in parts)
+        if self._overlay is None or len(self._overlay[0]) != n:
+            pos = np.empty((n, 3), dtype=np.float32)
+            rgb = np.empty(n, dtype=np.float32)
+            pos[:n_ref] = self._ref_pts
+            rgb[:n_ref] = self._ref_cols
+            self._overlay = (pos, rgb)
+        pos, rgb = self._overlay
+        at = n_ref
+        for p, c in parts:
+            pos[at:at + len(p)] = p
+            rgb[at:at + len(p)] = c
+            at += len(p)
+        self.matchCanvas.set_points(pos, rgb, fit=False)
+
+    def _on_best_match(self, pts, fit, rmse):
+        # ref gri, hizalanan kırmızı
+        self._show_overlay([(pts, pack_rgb((255, 0, 0), len(pts)))])
+
+    def _on_matching_error(self, msg):
+        if self._match_worker is None:
+            self._reset_matching()
+        QtWidgets.QMessageBox.warning(self, "Eşleştirme", f"Hata: {msg}")
+
+    def _on_matching_finished(self):
+        w, self._match_worker = self.sender(), None
+        self._reset_matching()
+        if w.cancelled:
+            self.matchStatus.setText("Eşleştirme iptal edildi")
+            return
+        if w.best_fit < 0:
             QtWidgets.QMessageBox.warning(self, "Eşleştirme", "Hizalama başarısız.")
             return
-
-        # 4) Ekranda göster (ref gri, hizalanan kırmızı)
-        ref_pts  = np.asarray(ref_pc.points)
-        ref_cols = np.tile([0.4, 0.4, 0.4, 1.0], (len(ref_pts), 1))
-        best_aligned.paint_uniform_color([1.0, 0.0, 0.0])
-        tgt_pts  = np.asarray(best_aligned.points)
-        tgt_cols = np.tile([1.0, 0.0, 0.0, 1.0], (len(tgt_pts), 1))
-
-        self.matchCanvas.set_points(
-            np.vstack([ref_pts, tgt_pts]), np.vstack([ref_cols, tgt_cols])
+        self.matchStatus.setText(
+            f"En iyi fitness: {w.best_fit:.3f}   RMSE: {w.best_rmse:.6f}"
         )
-
         QtWidgets.QMessageBox.information(
             self,
             "Eşleştirme Tamam",
-            f"En iyi fitness: {best_fit:.3f}   RMSE: {best_rmse:.6f}",
+            f"En iyi fitness: {w.best_fit:.3f}   RMSE: {w.best_rmse:.6f}",
+        )
+
+    # ───────────────── Kütüphaneyle Eşleştir Butonu ─────────────────
+    def handleLibraryMatching(self):
+        if self._jobs.current("home.library.segment") is not None:
+            self._cancel_library()
+            return
+
+        if not hasattr(self, "current_pcd"):
+            QtWidgets.QMessageBox.warning(
+                self, "Kütüphane Eşleştirme", "Önce Screen verisi yükleyin."
+            )
+            return
+        cad_paths = self.loadStlFiles(CAD_DIR)
+        if not cad_paths:
+            QtWidgets.QMessageBox.warning(
+                self, "Kütüphane Eşleştirme", f"{CAD_DIR} altında STL bulunamadı."
+            )
+            return
+
+        # Segmentasyon tek sefer: diğer düğmelerle aynı iş anahtarı paylaşılır
+        ref_pts = np.asarray(self.current_pcd.points)
+        seg_job = self._segment_job("home.library.segment")
+        seg_job.then(
+            lambda result: self._start_library(seg_job, result, ref_pts, cad_paths),
+            self._on_library_error,
+        )
+        self.libraryButton.setText("İptal Et")
+        self.matchStatus.setText("Segmentasyon bekleniyor…")
+
+    def _start_library(self, seg_job, result, ref_pts, cad_paths):
+        if self._jobs.current("home.library.segment") is not seg_job:
+            return
+        if not len(result):
+            self._reset_library()
+            self.matchStatus.setText("")
+            QtWidgets.QMessageBox.warning(self, "Kütüphane Eşleştirme", "Parça bulunamadı.")
+            return
+
+        self._set_reference(ref_pts)
+
+        # Ön ısıtması süren parçalar beklenir, yeniden örneklenmez
+        warm = dict(self._prewarm)
+        worker = self._library_worker = LibraryMatchingWorker(
+            self._jobs.process_pool(match_workers),
+            lambda path: self._load_cad(path, warm.get(path))[1:], cad_paths,
+            list(result.iter_part_points()), library_min_fitness,
+        )
+        worker.pair_done.connect(
+            lambda done, total: self.matchStatus.setText(
+                f"Kütüphane eşleştiriliyor: {done}/{total}")
+        )
+        worker.result_ready.connect(self._show_library_result)
+        worker.error.connect(self._on_library_error)
+        worker.finished.connect(self._on_library_finished)
+
+        n = len(result) * len(cad_paths)
+        self.matchStatus.setText(f"Kütüphane eşleştiriliyor: 0/{n}")
+        self._jobs.submit("home.library", None, worker.run, on_cancel=worker.stop)
+
+    def _cancel_library(self):
+        self._jobs.cancel("home.library")
+        self.matchStatus.setText("")
+        if self._library_worker is None:
+            self._reset_library()
+
+    def _reset_library(self):
+        self._jobs.cancel("home.library.segment")
+        self.libraryButton.setText("Kütüphaneyle Eşleştir")
+
+    def _on_library_error(self, msg):
+        if self._library_worker is None:
+            self._reset_library()
+        self.matchStatus.setText("")
+        QtWidgets.QMessageBox.warning(self, "Kütüphane Eşleştirme", f"Hata: {msg}")
+
+    def _on_library_finished(self):
+        self._library_worker = None
+        self._reset_library()
+
+    def _show_library_result(self, payload):
+        names, matches, aligned = payload
+        # Sahne gri, her atanan parça kendi paletindeki renkle
+        self._show_overlay([
+            (a, pack_rgb(tuple(PART_RGB[m.part % len(PART_RGB)]), len(a)))
+            for m, a in zip(matches, aligned) if a is not None
+        ])
+
+        table = self.libraryTable
+        table.setRowCount(len(matches))
+        for row, (m, a) in enumerate(zip(matches, aligned)):
+            if m.part < 0:
+                cells = [str(m.segment), "—", "", "", ""]
+            else:
+                # Pozun öteleme kısmı CAD orijinine bağlı; konum hizalı parçanın merkezi
+                x, y, z = a.mean(axis=0)
+                cells = [str(m.segment), names[m.part], f"{m.fitness:.3f}",
+                         f"{m.rmse:.6f}", f"{x:.4f}, {y:.4f}, {z:.4f}"]
+            for col, text in enumerate(cells):
+                table.setItem(row, col, QtWidgets.QTableWidgetItem(text))
+            if m.part >= 0:
+                r, g, b = PART_RGB[m.part % len(PART_RGB)]
+                table.item(row, 1).setBackground(QtGui.QColor(int(r), int(g), int(b)))
+        table.resizeColumnsToContents()
+        table.show()
+
+        n_matched = sum(m.part >= 0 for m in matches)
+        self.matchStatus.setText(
+            f"Kütüphane eşleştirme: {n_matched}/{len(matches)} segment atandı"
         )
 
 # ------------------------------------------------------
-# 4) Uygulama
+# 3) Uygulama
 # ------------------------------------------------------
 if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)
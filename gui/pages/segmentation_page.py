@@ -1,132 +1,210 @@
 import os
 import sys
+import time
 import numpy as np
-
-from PyQt5 import QtWidgets, QtCore
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
-from PyQt5.QtWidgets import QApplication, QMessageBox
-
 import open3d as o3d
-import matplotlib.cm as cm
 
-from vispy import scene
-from vispy.scene import visuals
+from PyQt5 import QtWidgets, QtCore
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QMessageBox
 
 from gui.config.segmetation_config import (
     load_segmentation_config,
     save_segmentation_config,
 )
+from gui.utils.colors import PACKED, label_colors
+from gui.utils.camera_worker import CameraWorker
+from gui.utils.viewer import PointCloudViewer
+from gui.utils.scheduler import job_scheduler
+from gui.utils.timing_panel import TimingPanel
+from gui.config.config_util import load as load_settings
+from inference.camera import open_camera
+from inference.cloud_cache import load_cloud
+from inference.segmentation import (
+    NOISE, GROUND, VOXEL_SZ, PlaneTracker, SegmentParams, segment_cloud,
+)
+from inference.density import analyze_cloud, derive_params, relative_params
+from inference.stage_cache import cloud_digest, stage_cache
+from inference import tracing
+from inference.tracing import span
+from inference.preview import (
+    preview_points, proxy_voxel, scale_dbscan, surface_area, work_units,
+)
+
+# Önizlemenin ilk koşusu için varsayılan saniye/iş oranı; sonra ölçülür
+INITIAL_PREVIEW_RATE = 1e-5
 
 # ------------------------------------------------------------
 #  Worker Thread for Segmentation
 # ------------------------------------------------------------
-class SegmentationWorker(QThread):
+class SegmentationCancelled(Exception):
+    """İptal isteği bir aşama sınırında fark edildi."""
+
+
+class SegmentationWorker(QObject):
+    """
+    Segmentasyonu aşamalara böler; her aşama başında iptal kontrol edilir ve
+    ilerleme yayınlanır. Zemin/nesne ayrımı kümeleme beklenmeden gösterilir.
+    Open3D çağrıları bölünmez, iptal bir sonraki aşama sınırında işler ve
+    ara bulutlar run() dönerken serbest kalır. `run` ortak iş zamanlayıcısının
+    thread havuzunda çalışır.
+    """
+    STAGES = ("Downsample", "Aykırı nokta temizliği", "Zemin düzlemi",
+              "Kümeleme", "Renklendirme")
+    # İzleme aralığı adları (SegmentationWorker/<ad>)
+    STAGE_KEYS = ("downsample", "outliers", "plane", "clustering", "colors")
+
+    progress = pyqtSignal(int, str)                     # aşama no, aşama adı
+    partial_ready = pyqtSignal(np.ndarray, np.ndarray)  # zemin/nesne ayrımı
     result_ready = pyqtSignal(np.ndarray, np.ndarray, int)
+    cancelled = pyqtSignal()
     error = pyqtSignal(str)
+    finished = pyqtSignal()
 
-    def __init__(self, pcd, dist_thresh, num_iter, eps, min_pts):
+    def __init__(self, pcd, dist_thresh, num_iter, eps, min_pts,
+                 voxel_size=VOXEL_SZ, plane_tracker=None, cache=None,
+                 work_budget=None):
         super().__init__()
         self.pcd = pcd
+        self.cache = cache
+        # Önizleme: verilirse bulut bu iş bütçesine sığan bir vekile indirilir
+        self.work_budget = work_budget
+        self.proxy_voxel = 0.0
+        self.work = self.elapsed = 0.0
+        self.plane_tracker = plane_tracker
         self.dist_thresh = dist_thresh
         self.num_iter = num_iter
         self.eps = eps
         self.min_pts = min_pts
+        self.voxel_size = voxel_size
+        self._cancel = False
+        self._span = None
+
+    def cancel(self):
+        self._cancel = True
+
+    def _stage(self, i: int, points_in=None):
+        self._end_span()
+        if self._cancel:
+            raise SegmentationCancelled()
+        self._span = span(f"SegmentationWorker/{self.STAGE_KEYS[i]}", points_in)
+        self.progress.emit(i, self.STAGES[i])
+
+    def _end_span(self, points_out=None):
+        if self._span is not None:
+            self._span.end(points_out)
+            self._span = None
+
+    @property
+    def preview(self) -> bool:
+        return self.work_budget is not None
+
+    @property
+    def view_key(self):
+        """Aynı anahtarlı sonuçlar aynı noktaları gösterir."""
+        return (self.voxel_size, self.proxy_voxel)
 
     def run(self):
+        t0 = time.perf_counter()
         try:
-            # 1) RANSAC Plane Segmentation
-            plane_model, inliers = self.pcd.segment_plane(
+            with span("SegmentationWorker/run", len(self.pcd.points)):
+                self._run()
+        except SegmentationCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            self._end_span()
+            self.elapsed = time.perf_counter() - t0
+            self.finished.emit()
+
+    def _run(self):
+        # Aşama sonuçları önbellekten gelebilir: anahtar bulut özeti + önceki
+        # tüm aşamaların parametreleri, yalnız değişen aşama ve sonrası hesaplanır
+        run = self.cache.stage if self.cache is not None else (
+            lambda key, name, params, compute: (compute(), None))
+        key = cloud_digest(self.pcd) if self.cache is not None else None
+
+        # 1) Downsample (0 = kapalı; önbelleğe kaynağın kopyası girer)
+        self._stage(0, len(self.pcd.points))
+        src = self.pcd
+        down, key = run(key, "downsample", (self.voxel_size,),
+                        lambda: src.voxel_down_sample(self.voxel_size)
+                        if self.voxel_size > 0 else o3d.geometry.PointCloud(src))
+        area = surface_area(down)
+
+        # Önizleme vekili: DBSCAN parametreleri azalan yoğunluğa göre ölçeklenir
+        if self.preview:
+            n_full = len(down.points)
+            n_target = preview_points(self.eps, area, self.work_budget)
+            voxel = proxy_voxel(area, n_target)
+            if n_target < n_full and voxel > self.voxel_size:
+                full = down
+                down, key = run(key, "proxy", (voxel,),
+                                lambda: full.voxel_down_sample(voxel))
+                self.proxy_voxel = voxel
+                self.eps, self.min_pts = scale_dbscan(
+                    self.eps, self.min_pts, len(down.points) / n_full, voxel)
+
+        # 2) Aykırı nokta temizliği
+        self._end_span(len(down.points))
+        self._stage(1, len(down.points))
+        pcd, key = run(key, "outliers", (30, 2.0),
+                       lambda: down.remove_statistical_outlier(
+                           nb_neighbors=30, std_ratio=2.0)[0])
+        pts = np.asarray(pcd.points, dtype=np.float32)
+        self._end_span(len(pts))
+
+        # 3) RANSAC Plane Segmentation (önceki düzlemden sıcak başlatılabilir)
+        self._stage(2, len(pts))
+
+        def plane():
+            if self.plane_tracker is not None:
+                return np.asarray(self.plane_tracker.segment(pcd)[1], dtype=np.int64)
+            return np.asarray(pcd.segment_plane(
                 distance_threshold=self.dist_thresh,
                 ransac_n=3,
                 num_iterations=self.num_iter
-            )
-            ground = self.pcd.select_by_index(inliers)
-            objects = self.pcd.select_by_index(inliers, invert=True)
+            )[1], dtype=np.int64)
 
-            # 2) DBSCAN Clustering
-            labels = np.array(objects.cluster_dbscan(
+        inliers, key = run(key, "plane", (self.dist_thresh, 3, self.num_iter), plane)
+        obj_mask = np.ones(len(pts), dtype=bool)
+        obj_mask[inliers] = False
+
+        # Ara sonuç: nesneler tek renkte, zemin gri
+        self.partial_ready.emit(
+            pts, label_colors(np.where(obj_mask, 0, GROUND), 1, dtype=PACKED)
+        )
+
+        # 4) DBSCAN Clustering
+        self._end_span(len(inliers))
+        self._stage(3, len(pts) - len(inliers))
+
+        def cluster():
+            objects = pcd.select_by_index(inliers, invert=True)
+            obj_labels = np.asarray(objects.cluster_dbscan(
                 eps=self.eps,
                 min_points=self.min_pts,
                 print_progress=False
-            ))
-            
-
-            max_label = labels.max()
-
-            if max_label < 0:
-                objects.paint_uniform_color([1, 0, 0])
-            else:
-                cmap = cm.get_cmap("tab20", max(20, max_label + 1))
-                colors = np.zeros((labels.shape[0], 3))
-                for i in range(max_label + 1):
-                    colors[labels == i] = cmap(i)[:3]
-                objects.colors = o3d.utility.Vector3dVector(colors)
-
-            ground.paint_uniform_color([0.5, 0.5, 0.5])
-            combined = ground + objects
-
-            # Prepare data for visualization
-            pts_comb = np.asarray(combined.points, dtype=np.float32)
-            cols_comb = None
-            if combined.has_colors():
-                cols = np.asarray(combined.colors, dtype=np.float32)
-                if cols.shape[1] == 3:
-                    alpha = np.ones((cols.shape[0], 1), dtype=np.float32)
-                    cols = np.hstack([cols, alpha])
-                cols_comb = cols
-
-            self.result_ready.emit(pts_comb, cols_comb, len(pts_comb))
-        except Exception as e:
-            self.error.emit(str(e))
-
-
-# ------------------------------------------------------------
-#  VisPyCanvas
-# ------------------------------------------------------------
-class VisPyCanvas(scene.SceneCanvas):
-    def __init__(self, parent=None):
-        super().__init__(keys=None, parent=parent, bgcolor="black")
-        self.unfreeze()
-        self.view = self.central_widget.add_view()
-        self.view.camera = scene.cameras.ArcballCamera(fov=60.0)
-        self.markers = visuals.Markers()
-        self.view.add(self.markers)
-        self.freeze()
-
-    def set_points(self, points: np.ndarray, colors: np.ndarray = None):
-        if colors is None:
-            colors = (0.3, 0.6, 1.0, 1.0)
-        self.markers.set_data(
-            points,
-            edge_width=0.0,
-            face_color=colors,
-            size=2.0
-        )
-        if points.size > 0:
-            self.view.camera.set_range(
-                x=(points[:, 0].min(), points[:, 0].max()),
-                y=(points[:, 1].min(), points[:, 1].max()),
-                z=(points[:, 2].min(), points[:, 2].max()),
-            )
+            ), dtype=np.int32)
+            obj_labels[obj_labels < 0] = NOISE
+            labels = np.full(len(pts), GROUND, dtype=np.int32)
+            labels[obj_mask] = obj_labels
+            return labels
 
+        labels, key = run(key, "clustering", (self.eps, self.min_pts), cluster)
+        self.work = work_units(len(pts), self.eps, area)
 
-# ------------------------------------------------------------
-#  VisPyWidget
-# ------------------------------------------------------------
-class VisPyWidget(QtWidgets.QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.canvas = VisPyCanvas(parent=self)
-        layout = QtWidgets.QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self.canvas.native)
+        # 5) Renklendirme (tek palet araması)
+        self._stage(4, len(labels))
+        cols = label_colors(labels, dtype=PACKED)
+        self._end_span(len(cols))
 
-    def set_points(self, points: np.ndarray, colors: np.ndarray = None):
-        self.canvas.set_points(points, colors)
+        self.result_ready.emit(pts, cols, len(pts))
 
 
 # ------------------------------------------------------------
-#  SegmentationPage with QThread support
+#  SegmentationPage (işler ortak zamanlayıcıda)
 # ------------------------------------------------------------
 class SegmentationPage(QtWidgets.QWidget):
     def __init__(self):
@@ -135,6 +213,8 @@ class SegmentationPage(QtWidgets.QWidget):
         # Load config
         self._config = load_segmentation_config()
         self._worker = None
+        self._camera_worker = None
+        self._plane_tracker = None
 
         # Main layout
         main_lay = QtWidgets.QHBoxLayout(self)
@@ -145,13 +225,18 @@ class SegmentationPage(QtWidgets.QWidget):
         main_lay.addLayout(left_vlayout, stretch=1)
 
         # Original point cloud
-        self._viewer_original = VisPyWidget()
+        settings = load_settings()
+        budget = settings.get("render_point_budget", 1_000_000)
+        self._cache_bytes = settings.get("stage_cache_mb", 512) << 20
+        if settings.get("tracing", False):
+            tracing.enable()
+        self._viewer_original = PointCloudViewer(budget=budget, size=2.0)
         self._viewer_original.setMinimumSize(600, 300)
         left_vlayout.addWidget(QtWidgets.QLabel("Orijinal Nokta Bulutu:"))
         left_vlayout.addWidget(self._viewer_original, stretch=1)
 
         # Segmented result
-        self._viewer_segmented = VisPyWidget()
+        self._viewer_segmented = PointCloudViewer(budget=budget, size=2.0)
         self._viewer_segmented.setMinimumSize(600, 300)
         left_vlayout.addWidget(QtWidgets.QLabel("Segmentasyon Sonucu:"))
         left_vlayout.addWidget(self._viewer_segmented, stretch=1)
@@ -185,6 +270,7 @@ class SegmentationPage(QtWidgets.QWidget):
 
         self._dist_threshold = QtWidgets.QDoubleSpinBox()
         self._dist_threshold.setRange(0.0, 9999.0)
+        self._dist_threshold.setDecimals(4)
         self._dist_threshold.setSingleStep(0.01)
         self._dist_threshold.setValue(
             self._config["ransac_params"].get("distance_threshold", 0.1)
@@ -198,6 +284,7 @@ class SegmentationPage(QtWidgets.QWidget):
 
         self._eps = QtWidgets.QDoubleSpinBox()
         self._eps.setRange(0.0, 9999.0)
+        self._eps.setDecimals(4)
         self._eps.setSingleStep(0.01)
         self._eps.setValue(
             self._config["ransac_params"].get("eps", 0.02)
@@ -209,12 +296,52 @@ class SegmentationPage(QtWidgets.QWidget):
             self._config["ransac_params"].get("min_points", 40)
         )
 
+        self._voxel_size = QtWidgets.QDoubleSpinBox()
+        self._voxel_size.setRange(0.0, 1000.0)
+        self._voxel_size.setDecimals(4)
+        self._voxel_size.setSingleStep(0.001)
+        self._voxel_size.setValue(
+            self._config["ransac_params"].get("voxel_size", VOXEL_SZ)
+        )
+
+        form.addRow("Voxel boyutu (0 = kapalı):", self._voxel_size)
         form.addRow("RANSAC distance_threshold:", self._dist_threshold)
         form.addRow("RANSAC num_iterations:", self._num_iter)
         form.addRow("DBSCAN eps:", self._eps)
         form.addRow("DBSCAN min_points:", self._min_points)
+
+        # Yoğunluk analizi: parametreler nokta aralığının katı olarak türetilir
+        density_cfg = self._config.get("density", {})
+        self._density = None
+        self._density_label = QtWidgets.QLabel("Nokta aralığı: –")
+        self._density_label.setWordWrap(True)
+        density_btn = QtWidgets.QPushButton("Yoğunluktan türet")
+        density_btn.clicked.connect(lambda: self._apply_density())
+        self._relative_check = QtWidgets.QCheckBox("Göreli parametreler (aralık katı)")
+        self._relative_check.setChecked(density_cfg.get("relative", False))
+        form.addRow(self._density_label)
+        form.addRow(density_btn, self._relative_check)
         side_panel.addWidget(self._ransac_group)
 
+        # Canlı önizleme: parametre değişince gecikmeli, vekil bulutta segmentasyon
+        preview_cfg = self._config.get("preview", {})
+        self._preview_check = QtWidgets.QCheckBox("Canlı önizleme")
+        self._preview_check.setChecked(preview_cfg.get("enabled", False))
+        self._preview_check.toggled.connect(self._schedule_preview)
+        side_panel.addWidget(self._preview_check)
+        self._preview_budget = preview_cfg.get("budget_ms", 500) / 1000.0
+        self._preview_rate = INITIAL_PREVIEW_RATE
+        self._preview_worker = None
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(preview_cfg.get("debounce_ms", 300))
+        self._preview_timer.timeout.connect(self._run_preview)
+        for box in (self._dist_threshold, self._num_iter, self._eps,
+                    self._min_points, self._voxel_size):
+            box.valueChanged.connect(self._schedule_preview)
+            box.valueChanged.connect(self._update_stream_params)
+        self._update_stream_params()
+
         self._alg_combo.currentTextChanged.connect(self._on_algorithm_changed)
         self._on_algorithm_changed(self._alg_combo.currentText())
 
@@ -224,21 +351,36 @@ class SegmentationPage(QtWidgets.QWidget):
         self._btn_segment.clicked.connect(self._on_segment_button_clicked)
         side_panel.addWidget(self._btn_segment)
 
+        # Aşama ilerlemesi
+        self._progress = QtWidgets.QProgressBar()
+        self._progress.setRange(0, len(SegmentationWorker.STAGES))
+        self._progress.setFormat("")
+        self._progress.setTextVisible(True)
+        side_panel.addWidget(self._progress)
+
         # Save config
         save_btn = QtWidgets.QPushButton("Ayarları Kaydet")
         save_btn.clicked.connect(self._save_config)
         side_panel.addWidget(save_btn)
+
+        # Aşama süreleri (yalnız segmentasyon aşamaları)
+        self._timing = TimingPanel(
+            self, prefixes=("SegmentationWorker/", "segment_cloud/")
+        )
+        side_panel.addWidget(self._timing)
         side_panel.addStretch()
 
         # State
         self._segment_in_progress = False
         self._current_pcd = None
+        self._segmented_src = None
 
     # ------------------- Offline/Online toggle
     def _on_mode_button_clicked(self):
         current_mode = self._config.get("source_mode", "offline")
         if current_mode == "online":
-            QMessageBox.information(self, "Zaten Online", "Kamera bağlı.")
+            self._disconnect_camera()
+            self._set_mode("offline")
             return
 
         if self._connect_camera():
@@ -262,70 +404,243 @@ class SegmentationPage(QtWidgets.QWidget):
             self._btn_mode.setStyleSheet("background-color:#2e7d32; color:white;")
 
     def _connect_camera(self) -> bool:
-        return False
+        cam = open_camera(self._config.get("camera"))
+        if cam is None:
+            return False
+        self._camera_worker = CameraWorker(cam, self._stream_segmenter())
+        self._camera_worker.frame_ready.connect(self._on_camera_frame)
+        self._camera_worker.error.connect(
+            lambda msg: self._progress.setFormat(f"Akış hatası: {msg}"))
+        self._camera_worker.start()
+        return True
+
+    def _update_stream_params(self):
+        # Kamera thread'i spinbox'ları okumaz; yalnız bu anlık görüntüyü alır
+        eps, mp = self._eps.value(), self._min_points.value()
+        self._stream_params = SegmentParams(
+            self._voxel_size.value(), self._dist_threshold.value(), eps, mp, eps, mp,
+        )
 
-    # ------------------- PLY yükle
-    def _load_ply_in_viewer(self, file_path: str):
-        pc = o3d.io.read_point_cloud(file_path)
+    def _stream_segmenter(self):
+        """
+        Online modda her kare kamera thread'inde segmentlenir; zemin düzlemi
+        kareden kareye sıcak başlatılır. Sayfa tek aşamalı DBSCAN gösterdiği
+        için ikinci aşama aynı parametrelerle çalışır.
+        """
+        tracker = PlaneTracker(num_iterations=self._num_iter.value())
+
+        def process(cloud):
+            return segment_cloud(cloud, tracker, params=self._stream_params)
+        return process
+
+    def _disconnect_camera(self):
+        if self._camera_worker is not None:
+            self._camera_worker.stop()
+            self._camera_worker.wait()
+            self._camera_worker = None
+
+    def _on_camera_frame(self, frame, result, stats):
+        pc = frame.cloud
         pts = np.asarray(pc.points, dtype=np.float32)
+        cols = np.asarray(pc.colors) if pc.has_colors() else None
+        self._viewer_original.set_points(pts, colors=cols, fit=False)
+        self._current_pcd = pc
+        if result is not None:
+            # Zemin + parçalar sıralı dizinin sonunda bitişik; gürültü gösterilmez
+            gs = result.ground_start
+            self._viewer_segmented.set_points(
+                result.points[gs:],
+                label_colors(result.labels[gs:], len(result), PACKED),
+                fit=False,
+            )
+            self._segmented_src = None
+        self._btn_mode.setText(
+            f"Online · {stats['fps']:.1f} FPS · "
+            f"{stats['latency_ms']['p50']:.0f} ms"
+        )
 
-        cols = None
-        if pc.has_colors():
-            cols = np.asarray(pc.colors, dtype=np.float32)
-            if cols.shape[1] == 3:
-                alpha_col = np.ones((cols.shape[0], 1), dtype=np.float32)
-                cols = np.hstack([cols, alpha_col])
+    # ------------------- PLY yükle
+    def _load_ply_in_viewer(self, file_path: str):
+        cloud = load_cloud(file_path)
+        pc = cloud.to_o3d()
 
-        self._viewer_original.set_points(pts, colors=cols)
+        self._viewer_original.set_points(cloud.points, colors=cloud.colors)
         self._viewer_segmented.set_points(np.zeros((0, 3), dtype=np.float32))
+        self._segmented_src = None
         self._current_pcd = pc
+        # Göreli modda kayıtlı katlar yeni bulutun aralığıyla mutlağa çevrilir
+        if self._relative_check.isChecked():
+            self._apply_density(self._config.get("density", {}).get("params"))
+        else:
+            self._analyze_density()
+        self._schedule_preview()
+
+    # ------------------- Yoğunluk analizi
+    def _analyze_density(self):
+        """Güncel bulutun nokta aralığı, boyutu ve birimi (etikette gösterilir)."""
+        if not self._current_pcd:
+            return None
+        try:
+            d = self._density = analyze_cloud(self._current_pcd)
+        except ValueError as e:
+            self._density_label.setText(str(e))
+            return None
+        size = " × ".join(f"{x:.3g}" for x in d.extent)
+        self._density_label.setText(
+            f"Nokta aralığı {d.spacing:.4g} · boyut {size} · birim ~{d.unit_name}"
+        )
+        return d
+
+    def _apply_density(self, relative=None):
+        """Spinbox'ları göreli katlardan doldurur (None = varsayılan katlar)."""
+        d = self._analyze_density()
+        if d is None:
+            return
+        p = derive_params(d, relative)
+        self._voxel_size.setValue(p.voxel)
+        self._dist_threshold.setValue(p.plane_eps)
+        self._eps.setValue(p.eps_1)
+        self._min_points.setValue(p.pts_1)
 
     # ------------------- Segment button handler
     def _on_segment_button_clicked(self):
-        if self._worker is None or not self._worker.isRunning():
+        if self._worker is None:
             # Start segmentation
             if not self._current_pcd:
                 QMessageBox.warning(self, "Hata", "Önce bir nokta bulutu yüklemelisiniz.")
                 return
 
+            # Tam çözünürlük yalnız burada: bekleyen önizleme düşürülür
+            self._preview_timer.stop()
+            job_scheduler().cancel("segpage.preview")
+            self._preview_worker = None
+
             dt = self._dist_threshold.value()
             ni = self._num_iter.value()
             eps = self._eps.value()
             mp = self._min_points.value()
 
-            self._worker = SegmentationWorker(self._current_pcd, dt, ni, eps, mp)
+            tracker = self._plane_tracker
+            if (tracker is None or tracker.distance_threshold != dt
+                    or tracker.num_iterations != ni):
+                tracker = self._plane_tracker = PlaneTracker(dt, ni)
+
+            self._worker = SegmentationWorker(
+                self._current_pcd, dt, ni, eps, mp,
+                voxel_size=self._voxel_size.value(), plane_tracker=tracker,
+                cache=stage_cache(self._cache_bytes),
+            )
+            self._worker.progress.connect(self._on_segmentation_progress)
+            self._worker.partial_ready.connect(self._show_segmented)
             self._worker.result_ready.connect(self._on_segmentation_finished)
+            self._worker.cancelled.connect(self._on_segmentation_cancelled)
             self._worker.error.connect(self._on_segmentation_error)
             self._worker.finished.connect(self._cleanup_after_seg)
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
+            self._progress.setValue(0)
             self._btn_segment.setText("İptal Et")
             self._btn_segment.setStyleSheet("background-color:#c62828;color:white;")
 
-            self._worker.start()
+            job_scheduler().submit(
+                "segpage.segment", None, self._worker.run,
+                on_cancel=self._worker.cancel,
+            )
         else:
             # Cancel ongoing segmentation
             reply = QMessageBox.question(
                 self, "İptal?", "Segmentasyonu iptal etmek istiyor musunuz?",
                 QMessageBox.Yes | QMessageBox.No
             )
-            if reply == QMessageBox.Yes:
-                self._worker.terminate()
+            # Worker bu arada bitmiş olabilir
+            if reply == QMessageBox.Yes and self._worker is not None:
+                self._worker.cancel()
+                self._btn_segment.setText("İptal ediliyor…")
+                self._btn_segment.setEnabled(False)
+
+    def _on_segmentation_progress(self, stage, name):
+        self._progress.setValue(stage)
+        self._progress.setFormat(f"{stage + 1}/{self._progress.maximum()} · {name}")
+
+    def _show_segmented(self, pts, cols):
+        # Aynı bulut aynı voxel ile segmentlendiyse konumlar zaten GPU'da: yalnız renk
+        w = self.sender()
+        if w.preview and w is not self._preview_worker:
+            return                      # yerini yenisine bırakmış önizleme
+        src = self._segmented_src
+        if src is not None and src[0] is w.pcd and src[1] == w.view_key:
+            self._viewer_segmented.set_colors(cols)
+        else:
+            self._viewer_segmented.set_points(pts, colors=cols)
+            self._segmented_src = (w.pcd, w.view_key)
+
+    # ------------------- Canlı önizleme
+    def _schedule_preview(self):
+        if self._preview_check.isChecked():
+            self._preview_timer.start()
+
+    def _run_preview(self):
+        if not self._current_pcd or self._worker is not None:
+            return
+        w = self._preview_worker = SegmentationWorker(
+            self._current_pcd, self._dist_threshold.value(), self._num_iter.value(),
+            self._eps.value(), self._min_points.value(),
+            voxel_size=self._voxel_size.value(), cache=stage_cache(self._cache_bytes),
+            work_budget=self._preview_budget / self._preview_rate,
+        )
+        w.partial_ready.connect(self._show_segmented)
+        w.result_ready.connect(self._show_segmented)
+        w.error.connect(lambda msg: self._progress.setFormat(f"Önizleme hatası: {msg}"))
+        w.finished.connect(self._on_preview_finished)
+        self._progress.setValue(0)
+        self._progress.setFormat("Önizleme hesaplanıyor…")
+        # Aynı yuvadaki eski önizleme düşürülür (bir sonraki aşama sınırında durur)
+        job_scheduler().submit("segpage.preview", None, w.run, on_cancel=w.cancel)
+
+    def _on_preview_finished(self):
+        w = self.sender()
+        self._learn_rate(w)
+        if w is not self._preview_worker:
+            return
+        self._preview_worker = None
+        if w.work > 0:
+            self._progress.setValue(self._progress.maximum())
+            self._progress.setFormat(
+                f"Önizleme · voxel {max(w.proxy_voxel, w.voxel_size):.4g} · "
+                f"eps {w.eps:.4g} · min {w.min_pts} · {w.elapsed * 1000:.0f} ms"
+            )
+
+    def _learn_rate(self, w):
+        """Saniye/iş oranını son koşulardan günceller (önizleme boyutu buna göre)."""
+        if w.work > 0 and w.elapsed > 0:
+            self._preview_rate = 0.5 * (self._preview_rate + w.elapsed / w.work)
 
     def _on_segmentation_finished(self, pts, cols, count):
-        self._viewer_segmented.set_points(pts, colors=cols)
+        self._show_segmented(pts, cols)
+        self._progress.setValue(self._progress.maximum())
+        self._progress.setFormat("Tamamlandı")
         QMessageBox.information(self, "Tamamlandı",
                                 f"Segmentasyon tamamlandı. {count} nokta!")
 
+    def _on_segmentation_cancelled(self):
+        self._progress.setFormat("İptal edildi")
+
     def _on_segmentation_error(self, msg):
         QMessageBox.warning(self, "Hata", f"Segmentasyon sırasında hata: {msg}")
 
     def _cleanup_after_seg(self):
-        QApplication.restoreOverrideCursor()
+        self._learn_rate(self.sender())
+        self._btn_segment.setEnabled(True)
         self._btn_segment.setText("Segmentasyon Başlat")
         self._btn_segment.setStyleSheet("background-color:#2e7d32;color:white;")
         self._worker = None
 
+    def shutdown(self):
+        """Pencere kapanırken kamera ve segmentasyon thread'lerini bekler."""
+        self._disconnect_camera()
+        self._preview_timer.stop()
+        job_scheduler().cancel("segpage.preview")
+        job_scheduler().cancel("segpage.segment")
+
     def _on_algorithm_changed(self, alg: str):
         self._ransac_group.setVisible(alg == "RANSAC")
 
@@ -335,6 +650,19 @@ class SegmentationPage(QtWidgets.QWidget):
         self._config["ransac_params"]["num_iterations"] = self._num_iter.value()
         self._config["ransac_params"]["eps"] = self._eps.value()
         self._config["ransac_params"]["min_points"] = self._min_points.value()
+        self._config["ransac_params"]["voxel_size"] = self._voxel_size.value()
+        self._config["preview"] = dict(self._config.get("preview", {}),
+                                       enabled=self._preview_check.isChecked())
+        density = dict(self._config.get("density", {}),
+                       relative=self._relative_check.isChecked())
+        if density["relative"] and self._density is not None:
+            # Sayfada tek aşamalı DBSCAN var; 2. aşama katları varsayılan kalır
+            eps, mp = self._eps.value(), self._min_points.value()
+            rel = relative_params(SegmentParams(
+                self._voxel_size.value(), self._dist_threshold.value(), eps, mp, eps, mp,
+            ), self._density.spacing)
+            density["params"] = {k: v for k, v in rel.items() if not k.endswith("_2")}
+        self._config["density"] = density
 
         save_segmentation_config(self._config)
         QMessageBox.information(self, "Kaydedildi", "Segmentation ayarları kaydedildi.")
@@ -0,0 +1,41 @@
+# ─── camera_worker.py ─────────────────────────────────────────────────────────
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from inference.stream import StreamStats, run_stream
+
+
+class CameraWorker(QThread):
+    """
+    Kamera kaynağından en yeni kareyi alır, `process(cloud)` ile bu thread'de
+    işler ve sonucu istatistiklerle birlikte yayınlar.
+    """
+    frame_ready = pyqtSignal(object, object, dict)   # Frame, process çıktısı, istatistik
+    error = pyqtSignal(str)
+
+    def __init__(self, source, process=None):
+        super().__init__()
+        self.source = source
+        self.process = process or (lambda cloud: None)
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+        self.source.stop()
+
+    def run(self):
+        stats = StreamStats()
+        self.source.start()
+        try:
+            run_stream(
+                self.source,
+                self.process,
+                stats,
+                should_stop=lambda: self._stop,
+                on_result=lambda f, out: self.frame_ready.emit(
+                    f, out, stats.summary(self.source)
+                ),
+            )
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            self.source.stop()
@@ -0,0 +1,87 @@
+# ─── colors.py ────────────────────────────────────────────────────────────────
+"""
+Etiket → renk dönüşümü: tek bir palet araması ile RGBA.
+
+Etiketler `inference.segmentation` ile aynıdır: NOISE (-2), GROUND (-1)
+ve 0.. parça numaraları. Zemin ve gürültünün ayrılmış renkleri vardır.
+`dtype=PACKED` paleti çizicinin paketli float32 biçiminde önceden hesaplar;
+etiketler doğrudan (N,) paketli renge çevrilir, ara RGBA dizisi oluşmaz.
+"""
+import functools
+
+import numpy as np
+
+from inference.segmentation import NOISE, GROUND
+
+# tab20 (matplotlib sırası), zeminle karışmasın diye griler çıkarıldı
+PART_RGB = np.array([
+    (0x1f, 0x77, 0xb4), (0xae, 0xc7, 0xe8), (0xff, 0x7f, 0x0e), (0xff, 0xbb, 0x78),
+    (0x2c, 0xa0, 0x2c), (0x98, 0xdf, 0x8a), (0xd6, 0x27, 0x28), (0xff, 0x98, 0x96),
+    (0x94, 0x67, 0xbd), (0xc5, 0xb0, 0xd5), (0x8c, 0x56, 0x4b), (0xc4, 0x9c, 0x94),
+    (0xe3, 0x77, 0xc2), (0xf7, 0xb6, 0xd2), (0xbc, 0xbd, 0x22), (0xdb, 0xdb, 0x8d),
+    (0x17, 0xbe, 0xcf), (0x9e, 0xda, 0xe5),
+], dtype=np.uint8)
+NOISE_RGBA  = (40, 40, 40, 255)
+GROUND_RGBA = (128, 128, 128, 255)
+DEFAULT_RGB = (77, 153, 255)          # renk verilmeyen bulutlar
+PACKED = "packed"                     # label_palette/label_colors: pack_rgb biçimi
+
+
+def label_palette(n_parts: int, dtype=np.float32) -> np.ndarray:
+    """(n_parts + 2, 4) palet; satır `label - NOISE` etikete karşılık gelir."""
+    if isinstance(dtype, str) and dtype == PACKED:
+        return _packed_palette(n_parts)
+    pal = np.empty((n_parts + 2, 4), dtype=np.uint8)
+    pal[NOISE - NOISE] = NOISE_RGBA
+    pal[GROUND - NOISE] = GROUND_RGBA
+    pal[2:, :3] = PART_RGB[np.arange(n_parts) % len(PART_RGB)]
+    pal[2:, 3] = 255
+    if np.dtype(dtype) == np.uint8:
+        return pal
+    return pal.astype(dtype) / dtype(255)
+
+
+@functools.lru_cache(maxsize=16)
+def _packed_palette(n_parts: int) -> np.ndarray:
+    """(n_parts + 2,) paketli palet; paylaşılır, değiştirilmemelidir."""
+    pal = pack_rgb(label_palette(n_parts, np.uint8), n_parts + 2)
+    pal.flags.writeable = False
+    return pal
+
+
+def label_colors(labels: np.ndarray, n_parts: int = None,
+                 dtype=np.float32) -> np.ndarray:
+    """
+    Etiket dizisinden (N, 4) RGBA; uint8 [0, 255] ya da float32 [0, 1].
+    Çizici için en ucuzu `dtype=PACKED`: (N,) paketli float32, çiziciye
+    dönüştürülmeden geçer.
+    """
+    labels = np.asarray(labels)
+    if n_parts is None:
+        n_parts = int(labels.max()) + 1 if labels.size else 0
+    pal = label_palette(max(n_parts, 0), dtype)
+    if pal.ndim == 1:
+        return pal.take(labels - NOISE)
+    return pal.take(labels - NOISE, axis=0)
+
+
+def pack_rgb(colors, n: int) -> np.ndarray:
+    """
+    Renkleri nokta başına tek float32'ye paketler: R·65536 + G·256 + B.
+    2^24'ten küçük tamsayılar float32'de tam temsil edilir; çizici bunu
+    gölgelendiricide açar. Kabul edilenler: None (varsayılan renk), tek renk
+    demeti, (N, 3|4) uint8 [0, 255] ya da float [0, 1] dizisi veya zaten
+    paketli (N,) float32. Alfa kanalı yok sayılır.
+    """
+    if isinstance(colors, np.ndarray) and colors.ndim == 1:
+        return colors.astype(np.float32, copy=False)
+    single = not isinstance(colors, np.ndarray)
+    c = np.asarray(DEFAULT_RGB if colors is None else colors)
+    if c.dtype == np.uint8 or (single and c.dtype.kind in "iu"):
+        rgb = c[..., :3].astype(np.uint32)
+    else:
+        rgb = np.clip(np.rint(c[..., :3] * 255), 0, 255).astype(np.uint32)
+    packed = (rgb[..., 0] << 16 | rgb[..., 1] << 8 | rgb[..., 2]).astype(np.float32)
+    if single:
+        return np.full(n, packed, dtype=np.float32)
+    return packed
@@ -0,0 +1,235 @@
+# ─── lod.py ───────────────────────────────────────────────────────────────────
+"""
+Çok milyon noktalı taramalar için octree tabanlı ayrıntı seviyesi (LOD).
+
+Noktalar Morton (Z-order) koduna göre sıralanır; her octree düğümü bu
+sıralı dizide bitişik bir aralıktır. Z-eğrisi uzayı doldurduğu için bir
+aralıktan adımlı (strided) örnek almak düğüm içinde düzgün dağılmış bir
+alt küme verir; böylece düğüm başına ayrı örnek saklamaya gerek kalmaz.
+"""
+import numpy as np
+from PyQt5 import QtCore
+
+from gui.utils.scheduler import job_scheduler
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """10 bitlik tamsayıların bitlerini 3'er aralıkla yayar (30 bit)."""
+    v = v.astype(np.uint32) & np.uint32(0x3FF)
+    v = (v | v << np.uint32(16)) & np.uint32(0x030000FF)
+    v = (v | v << np.uint32(8)) & np.uint32(0x0300F00F)
+    v = (v | v << np.uint32(4)) & np.uint32(0x030C30C3)
+    v = (v | v << np.uint32(2)) & np.uint32(0x09249249)
+    return v
+
+
+# Morton kodu için tablo: her eksen en fazla 10 bit (derinlik ≤ 10)
+_SPREAD = _spread_bits(np.arange(1024))
+
+
+def _concat_ranges(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """[lo_i, hi_i) aralıklarının birleşimi, döngüsüz."""
+    n = hi - lo
+    total = int(n.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    rep = np.repeat(np.arange(len(n)), n)
+    return lo[rep] + np.arange(total) - np.repeat(np.cumsum(n) - n, n)
+
+
+class PointOctree:
+    """Morton sıralı noktalar üzerinde seviye seviye düğüm aralıkları."""
+
+    def __init__(self, pts: np.ndarray, leaf_size: int = 256, max_depth: int = 10):
+        n = len(pts)
+        self.lo = pts.min(axis=0).astype(np.float64)
+        self.size = float((pts.max(axis=0) - self.lo).max()) or 1.0
+        self.depth = int(np.clip(np.ceil(np.log(max(n / leaf_size, 1)) / np.log(8)),
+                                 1, max_depth))
+        cells = 1 << self.depth
+        q = ((pts - self.lo) * (cells / self.size)).astype(np.int32)
+        np.clip(q, 0, cells - 1, out=q)
+        codes = _SPREAD[q[:, 0]] | _SPREAD[q[:, 1]] << np.uint32(1) \
+            | _SPREAD[q[:, 2]] << np.uint32(2)
+        self.order = np.argsort(codes)
+        codes = codes[self.order]
+
+        # levels[l] = (başlangıçlar, bitişler, merkezler)
+        self.levels = []
+        for l in range(self.depth + 1):
+            key = codes >> np.uint32(3 * (self.depth - l))
+            starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+            ends = np.r_[starts[1:], n]
+            cell = q[self.order[starts]] >> (self.depth - l)
+            centers = self.lo + (cell + 0.5) * (self.size / (1 << l))
+            self.levels.append((starts, ends, centers))
+
+    def __len__(self):
+        return len(self.order)
+
+    def node_size(self, level: int) -> float:
+        return self.size / (1 << level)
+
+    def coarse(self, n: int) -> np.ndarray:
+        """Bakıştan bağımsız, uzayda düzgün `n` noktalık örnek."""
+        step = max(1, len(self.order) // max(n, 1))
+        return self.order[::step]
+
+    def select(self, project, budget: int, refine_px: float = 64.0) -> np.ndarray:
+        """
+        Kameraya göre en fazla `budget` nokta seçer.
+
+        project(merkezler, boyut) → (görünür maskesi, ekran boyutu piksel).
+        Görünmeyen düğümler elenir, ekranda `refine_px`'ten büyük düğümler alt
+        düğümlere ayrılır. Bütçe seçilen düğümlere ekran alanlarıyla (px²)
+        orantılı dağıtılır; düğümdeki nokta sayısını aşan pay diğerlerine kalır.
+        """
+        sel_lo, sel_hi, sel_px = [], [], []
+        level = 0
+        nodes = np.arange(len(self.levels[0][0]))
+        while nodes.size:
+            starts, ends, centers = self.levels[level]
+            vis, px = project(centers[nodes], self.node_size(level))
+            nodes, px = nodes[vis], px[vis]
+            refine = (px > refine_px) & (level < self.depth)
+            keep = ~refine
+            sel_lo.append(starts[nodes[keep]])
+            sel_hi.append(ends[nodes[keep]])
+            sel_px.append(px[keep])
+            if not refine.any():
+                break
+            child_starts = self.levels[level + 1][0]
+            lo = np.searchsorted(child_starts, starts[nodes[refine]])
+            hi = np.searchsorted(child_starts, ends[nodes[refine]])
+            nodes = _concat_ranges(lo, hi)
+            level += 1
+
+        lo, hi, px = np.concatenate(sel_lo), np.concatenate(sel_hi), np.concatenate(sel_px)
+        count = hi - lo
+        if count.sum() <= budget:
+            want = count
+        else:
+            # Su doldurma: dolan düğümlerin artan payı birkaç turda dağıtılır
+            weight = np.maximum(px, 1e-6) ** 2
+            want = np.zeros_like(count)
+            for _ in range(4):
+                left = budget - want.sum()
+                open_ = want < count
+                if left <= 0 or not open_.any():
+                    break
+                share = weight * open_ * (left / weight[open_].sum())
+                want = np.minimum(count, want + np.floor(share).astype(np.int64))
+
+        # Düğüm aralığından adımlı örnek: lo + j * count // want
+        rep = np.repeat(np.arange(len(want)), want)
+        j = np.arange(int(want.sum())) - np.repeat(np.cumsum(want) - want, want)
+        idx = lo[rep] + (j * count[rep]) // want[rep]
+        return self.order[idx]
+
+
+class PointLOD:
+    """
+    Nokta görseli için LOD denetleyicisi. Bütçeyi aşan bulutlarda önce kaba
+    bir alt küme gösterilir; kamera durduğunda bakışa göre seçilen ayrıntı
+    her adımda ikiye katlanarak bütçeye kadar artırılır. Kamera hareket
+    edince tekrar kaba alt kümeye dönülür ki döndürme akıcı kalsın.
+
+    `visual`, `set_data(pts, rgb)` ve `set_colors(rgb)` sağlar; renkler
+    paketli (N,) dizidir, gösterilen alt küme indeksiyle birlikte seçilir.
+    Octree ortak iş zamanlayıcısında kurulur; hazır olana dek adımlı kaba
+    örnek gösterilir, ağaç GUI thread'inde devreye alınır.
+    """
+
+    def __init__(self, canvas, visual, budget: int = 1_000_000,
+                 coarse_div: int = 8, idle_ms: int = 150):
+        self.canvas = canvas
+        self.visual = visual
+        self.budget = budget
+        self.coarse_div = coarse_div
+        self.tree = None
+        self.pts = self.rgb = np.zeros(0, dtype=np.float32)
+        self._idx = None
+        self._shown = 0
+        self._level = 0
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(idle_ms)
+        self._timer.timeout.connect(self._refine)
+        self._slot = f"lod.{id(self)}"
+        canvas.view.scene.transform.changed.connect(self._on_view_changed)
+
+    def set_data(self, pts, rgb):
+        self._timer.stop()
+        self.pts, self.rgb = pts, rgb
+        self.tree = None
+        if self.budget <= 0 or len(pts) <= self.budget:
+            job_scheduler().cancel(self._slot)
+            self._idx = None
+            self.visual.set_data(pts, rgb)
+            return
+        # Önce düz adımlı kaba örnek; octree arka planda kurulur (önceki kurulum düşer)
+        step = max(1, len(pts) // self._coarse_size())
+        self._show(np.arange(0, len(pts), step))
+        job_scheduler().submit(self._slot, None, PointOctree, pts).then(
+            lambda tree, p=pts: self._set_tree(p, tree)
+        )
+
+    def set_colors(self, rgb):
+        self.rgb = rgb
+        self.visual.set_colors(rgb if self._idx is None else rgb[self._idx])
+
+    def _set_tree(self, pts, tree):
+        if pts is not self.pts:
+            return                      # bu arada yeni veri geldi
+        self.tree = tree
+        self._level = self._coarse_size()
+        self._timer.start()
+
+    def _coarse_size(self) -> int:
+        return max(1, self.budget // self.coarse_div)
+
+    def _show(self, idx):
+        self._idx = idx
+        self.visual.set_data(self.pts[idx], self.rgb[idx])
+        self._shown = len(idx)
+
+    def _show_coarse(self):
+        self._level = self._coarse_size()
+        self._show(self.tree.coarse(self._level))
+        self._timer.start()
+
+    def _on_view_changed(self, event=None):
+        if self.tree is None:
+            return
+        if self._shown > self._coarse_size():
+            self._show_coarse()
+        else:
+            self._timer.start()
+
+    def _project(self, centers, size):
+        """Düğüm merkezlerini tuval piksellerine izdüşürür."""
+        tr = self.visual.get_transform("visual", "canvas")
+        c = tr.map(centers)
+        w = c[:, 3]
+        front = w > 0
+        w = np.where(front, w, 1.0)
+        px = c[:, :2] / w[:, None]
+        ext = np.zeros(len(centers))
+        for axis in range(3):
+            off = centers.copy()
+            off[:, axis] += size
+            o = tr.map(off)
+            ow = np.where(o[:, 3] > 0, o[:, 3], 1.0)
+            ext = np.maximum(ext, np.linalg.norm(o[:, :2] / ow[:, None] - px, axis=1))
+        W, H = self.canvas.size
+        vis = front & (px[:, 0] > -ext) & (px[:, 0] < W + ext) \
+            & (px[:, 1] > -ext) & (px[:, 1] < H + ext)
+        return vis, ext
+
+    def _refine(self):
+        if self.tree is None:
+            return
+        self._level = min(self.budget, self._level * 2)
+        self._show(self.tree.select(self._project, self._level))
+        if self._level < self.budget:
+            self._timer.start()
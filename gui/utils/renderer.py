@@ -0,0 +1,150 @@
+# ─── renderer.py ──────────────────────────────────────────────────────────────
+"""
+Tüm sayfaların ortak nokta bulutu çizicisi.
+
+Konumlar float32 (N, 3), renkler paketli RGB float32 (N,) olarak iki GPU
+tamponunda tutulur (nokta başına 16 bayt). Yeni veri tamponlara sığıyorsa
+yalnızca `set_subdata` ile yerinde yazılır; çizilen nokta sayısı tampon
+görünümüyle (view) sınırlandığından yeniden ayırma gerekmez. Yalnız
+renkler değiştiğinde (aynı bulutun yeniden segmentasyonu) konum tamponuna
+dokunulmaz.
+"""
+import numpy as np
+from vispy import gloo, scene
+from vispy.visuals import Visual
+
+from gui.utils.colors import pack_rgb
+from gui.utils.lod import PointLOD
+
+VERT = """
+attribute vec3 a_position;
+attribute float a_rgb;
+uniform float u_size;
+uniform float u_alpha;
+varying vec4 v_color;
+
+void main() {
+    float r = floor(a_rgb / 65536.0);
+    float g = floor((a_rgb - r * 65536.0) / 256.0);
+    float b = a_rgb - r * 65536.0 - g * 256.0;
+    v_color = vec4(vec3(r, g, b) / 255.0, u_alpha);
+    gl_Position = $transform(vec4(a_position, 1.0));
+    gl_PointSize = u_size;
+}
+"""
+
+FRAG = """
+varying vec4 v_color;
+
+void main() {
+    vec2 d = gl_PointCoord - vec2(0.5);
+    if (dot(d, d) > 0.25)
+        discard;
+    gl_FragColor = v_color;
+}
+"""
+
+
+class PointsVisual(Visual):
+    """Kapasiteli, yerinde güncellenen nokta tamponları (ekran pikseli boyutlu)."""
+
+    def __init__(self, size: float = 3.0, alpha: float = 1.0):
+        super().__init__(vcode=VERT, fcode=FRAG)
+        self.size = size
+        self.count = 0
+        self.capacity = 0
+        self._pos = gloo.VertexBuffer(np.zeros((1, 3), dtype=np.float32))
+        self._rgb = gloo.VertexBuffer(np.zeros(1, dtype=np.float32))
+        self.shared_program["u_alpha"] = alpha
+        self._draw_mode = "points"
+        self.set_gl_state("translucent", depth_test=True)
+        self._bind(0)
+        self.uploads = self.reallocs = 0
+
+    def _bind(self, n):
+        # Tamponların ilk n elemanı: sayım değişince yalnız öznitelik yeniden bağlanır
+        self.shared_program["a_position"] = self._pos[:max(n, 1)]
+        self.shared_program["a_rgb"] = self._rgb[:max(n, 1)]
+
+    def _reserve(self, n):
+        """Kapasite yetmiyorsa %25 payla yeniden ayırır; küçülürken ayırmaz."""
+        if n <= self.capacity:
+            return
+        cap = max(n + n // 4, 1)
+        self._pos.resize_bytes(cap * 12)
+        self._rgb.resize_bytes(cap * 4)
+        self.capacity = cap
+        self.count = -1            # görünümler yeniden bağlansın
+        self.reallocs += 1
+
+    def set_data(self, pos: np.ndarray, rgb: np.ndarray):
+        """
+        pos: (N, 3) float32, rgb: `pack_rgb` çıktısı (N,). Yükleme çizime
+        ertelenir; diziler o ana kadar değiştirilmemelidir.
+        """
+        pos = np.ascontiguousarray(pos, dtype=np.float32)
+        n = len(pos)
+        self._reserve(n)
+        if n:
+            self._pos.set_subdata(pos)
+            self._rgb.set_subdata(np.ascontiguousarray(rgb, dtype=np.float32))
+        if n != self.count:
+            self._bind(n)
+        self.count = n
+        self.uploads += 1
+        self.update()
+
+    def set_colors(self, rgb: np.ndarray):
+        """Konumlara dokunmadan yalnız renk tamponunu yazar."""
+        if self.count > 0:
+            self._rgb.set_subdata(np.ascontiguousarray(rgb[:self.count], dtype=np.float32))
+            self.update()
+
+    def _prepare_transforms(self, view):
+        view.view_program.vert["transform"] = view.get_transform()
+
+    def _prepare_draw(self, view):
+        if self.count <= 0:
+            return False
+        self.shared_program["u_size"] = self.size * view.transforms.pixel_scale
+
+    def _compute_bounds(self, axis, view):
+        return None
+
+
+Points = scene.visuals.create_visual_node(PointsVisual)
+
+
+class PointCanvas(scene.SceneCanvas):
+    """
+    Tek nokta görseli + LOD içeren VisPy tuvali. `set_points` kamera
+    aralığını yalnız ilk veride ya da `fit=True` iken yeniden hesaplar;
+    akış kareleri bu yüzden sınır taraması yapmaz.
+    """
+
+    def __init__(self, parent=None, budget: int = 1_000_000, size: float = 3.0):
+        super().__init__(keys=None, parent=parent, bgcolor="black")
+        self.unfreeze()
+        self.view = self.central_widget.add_view()
+        self.view.camera = scene.cameras.ArcballCamera(fov=60.0)
+        self.points = Points(size=size, parent=self.view.scene)
+        self.lod = PointLOD(self, self.points, budget)
+        self._fitted = False
+        self.freeze()
+
+    def set_points(self, pts: np.ndarray, colors=None, fit: bool = True):
+        """
+        pts: (N, 3); colors: `pack_rgb`'nin kabul ettiği her biçim. Paketli
+        (N,) float32 renkler (ör. `label_colors(..., PACKED)`) kopyalanmaz.
+        """
+        pts = np.asarray(pts, dtype=np.float32)
+        self.lod.set_data(pts, pack_rgb(colors, len(pts)))
+        if len(pts) and (fit or not self._fitted):
+            lo, hi = pts.min(axis=0), pts.max(axis=0)
+            self.view.camera.set_range(x=(lo[0], hi[0]), y=(lo[1], hi[1]),
+                                       z=(lo[2], hi[2]))
+            self._fitted = True
+
+    def set_colors(self, colors):
+        """Gösterilen bulutu yeniden renklendirir (nokta sayısı aynı olmalı)."""
+        self.lod.set_colors(pack_rgb(colors, len(self.lod.pts)))
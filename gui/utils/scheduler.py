@@ -0,0 +1,168 @@
+# ─── scheduler.py ─────────────────────────────────────────────────────────────
+"""
+Sayfaların ortak arka plan iş zamanlayıcısı.
+
+İşler bir thread havuzunda çalışır; CPU ağırlıklı alt işler için aynı
+zamanlayıcı tembel oluşturulan bir süreç havuzu da sağlar. Her iş bir
+"yuva"ya (ör. "home.segment") gönderilir:
+
+- Aynı yuvaya yeni bir iş gelince eskisi düşürülür: başlamadıysa iptal
+  edilir, çalışıyorsa sonucu teslim edilmez. Başka bir yuva aynı işi hâlâ
+  tutuyorsa iş düşürülmez.
+- `key` verilen işler paylaşılır: aynı anahtarla çalışan ya da bitmiş bir
+  iş varsa yenisi başlatılmaz, mevcut iş döner (ör. eşleştirme, aynı bulutun
+  az önceki segmentasyonunu yeniden kullanır).
+"""
+import functools
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PyQt5 import QtCore
+
+
+class Job(QtCore.QObject):
+    """Zamanlayıcıdaki tek iş; sinyaller GUI thread'ine kuyrukla ulaşır."""
+    result_ready = QtCore.pyqtSignal(object)
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, key, fn, args, kwargs, on_cancel=None):
+        super().__init__()
+        self.key = key
+        self.stale = False
+        self.future = None
+        self._call = functools.partial(fn, *args, **kwargs)
+        self._on_cancel = on_cancel
+
+    def _finish(self, fut):
+        # Havuz thread'inde (ya da iş zaten bittiyse çağıran thread'de) çalışır
+        if self.stale or fut.cancelled():
+            return
+        exc = fut.exception()
+        if exc is not None:
+            self.error.emit(str(exc))
+        else:
+            self.result_ready.emit(fut.result())
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def cancel(self):
+        """Başlamadıysa iptal eder; çalışıyorsa sonucu düşürür ve `on_cancel`'ı çağırır."""
+        self.stale = True
+        if self.future is not None:
+            self.future.cancel()
+        if self._on_cancel is not None:
+            self._on_cancel()
+
+    def then(self, fn, on_error=None):
+        """
+        Sonuç gelince `fn(sonuç)` çağrılır; iş zaten bittiyse bir sonraki olay
+        döngüsünde. Her çağrı için en fazla bir kez, yalnız GUI thread'inde.
+        """
+        fired = []
+
+        def once(handler, value):
+            if not fired and not self.stale:
+                fired.append(True)
+                handler(value)
+
+        self.result_ready.connect(functools.partial(once, fn))
+        if on_error is not None:
+            self.error.connect(functools.partial(once, on_error))
+        if self.done() and not self.future.cancelled():
+            exc = self.future.exception()
+            if exc is None:
+                QtCore.QTimer.singleShot(0, lambda: once(fn, self.future.result()))
+            elif on_error is not None:
+                QtCore.QTimer.singleShot(0, lambda: once(on_error, str(exc)))
+        return self
+
+
+class JobScheduler(QtCore.QObject):
+    """Yuva başına son iş, anahtarla paylaşılan işler ve biten işlerin küçük LRU'su."""
+
+    def __init__(self, max_threads: int = 2, max_finished: int = 8):
+        super().__init__()
+        self._threads = ThreadPoolExecutor(max_workers=max_threads,
+                                           thread_name_prefix="job")
+        self._processes = None
+        self._slots = {}
+        self._keyed = OrderedDict()
+        self.max_finished = max_finished
+
+    def submit(self, slot: str, key, fn, *args, on_cancel=None, **kwargs) -> Job:
+        job = self._keyed.get(key) if key is not None else None
+        if job is not None and not job.stale:
+            self._keyed.move_to_end(key)
+        else:
+            job = Job(key, fn, args, kwargs, on_cancel)
+            job.error.connect(lambda _, j=job: self._forget(j))
+            job.future = self._threads.submit(job._call)
+            job.future.add_done_callback(job._finish)
+            if key is not None:
+                self._keyed[key] = job
+                self._trim()
+
+        prev = self._slots.get(slot)
+        self._slots[slot] = job
+        if prev is not None and prev is not job:
+            self._drop(prev)
+        return job
+
+    def current(self, slot: str):
+        return self._slots.get(slot)
+
+    def cancel(self, slot: str):
+        job = self._slots.pop(slot, None)
+        if job is not None:
+            self._drop(job)
+
+    def process_pool(self, max_workers: int = None) -> ProcessPoolExecutor:
+        """Tembel oluşturulan ortak süreç havuzu (spawn)."""
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._processes
+
+    def shutdown(self):
+        """Tüm işleri düşürür, çalışanların bitmesini bekler."""
+        for job in list(self._slots.values()):
+            job.cancel()
+        self._slots.clear()
+        self._keyed.clear()
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+        self._threads.shutdown(wait=True, cancel_futures=True)
+
+    def _drop(self, job: Job):
+        # Başka bir yuva hâlâ tutuyorsa dokunma
+        if any(j is job for j in self._slots.values()):
+            return
+        if not job.done():
+            job.cancel()
+            self._forget(job)
+
+    def _forget(self, job: Job):
+        if job.key is not None and self._keyed.get(job.key) is job:
+            del self._keyed[job.key]
+
+    def _trim(self):
+        finished = [k for k, j in self._keyed.items() if j.done()]
+        for k in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._keyed[k]
+
+
+_SCHEDULER = None
+
+
+def job_scheduler() -> JobScheduler:
+    """Uygulama başına tek zamanlayıcı."""
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = JobScheduler()
+    return _SCHEDULER
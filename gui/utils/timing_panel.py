@@ -0,0 +1,101 @@
+# ─── timing_panel.py ──────────────────────────────────────────────────────────
+from PyQt5 import QtCore, QtWidgets
+
+from inference import tracing
+
+
+class TimingPanel(QtWidgets.QWidget):
+    """
+    Katlanabilir aşama süreleri paneli. `inference.tracing` kayıtlarını aşama
+    adına göre özetler; panel açıkken saniyede bir yenilenir. `prefixes`
+    verilirse yalnız bu öneklerle başlayan aşamalar gösterilir.
+    """
+    COLUMNS = ["Aşama", "Adet", "Süre (ms)", "CPU (ms)", "Nokta", "RSS Δ (MB)"]
+
+    def __init__(self, parent=None, prefixes=None, interval_ms: int = 1000):
+        super().__init__(parent)
+        self.prefixes = tuple(prefixes) if prefixes else None
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self._toggle = QtWidgets.QToolButton()
+        self._toggle.setText("Aşama süreleri")
+        self._toggle.setCheckable(True)
+        self._toggle.setToolButtonStyle(QtCore.Qt.ToolButtonTextBesideIcon)
+        self._toggle.setArrowType(QtCore.Qt.RightArrow)
+        self._toggle.setStyleSheet("QToolButton { border: none; font-weight: bold; }")
+        self._toggle.toggled.connect(self._set_expanded)
+        layout.addWidget(self._toggle)
+
+        self._body = QtWidgets.QWidget()
+        body = QtWidgets.QVBoxLayout(self._body)
+        body.setContentsMargins(0, 0, 0, 0)
+
+        row = QtWidgets.QHBoxLayout()
+        self._enabled = QtWidgets.QCheckBox("İzleme")
+        self._enabled.setChecked(tracing.enabled())
+        self._enabled.toggled.connect(tracing.enable)
+        row.addWidget(self._enabled)
+        row.addStretch()
+        clear_btn = QtWidgets.QPushButton("Temizle")
+        clear_btn.clicked.connect(self._clear)
+        row.addWidget(clear_btn)
+        export_btn = QtWidgets.QPushButton("Chrome trace…")
+        export_btn.clicked.connect(self._export)
+        row.addWidget(export_btn)
+        body.addLayout(row)
+
+        self._table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self._table.setHorizontalHeaderLabels(self.COLUMNS)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self._table.horizontalHeader().setStretchLastSection(True)
+        body.addWidget(self._table)
+        self._body.hide()
+        layout.addWidget(self._body)
+
+        # Yalnız panel açıkken yenilenir; kapalıyken maliyeti yok
+        self._timer = QtCore.QTimer(self, interval=interval_ms)
+        self._timer.timeout.connect(self.refresh)
+
+    def _set_expanded(self, on: bool):
+        self._toggle.setArrowType(QtCore.Qt.DownArrow if on else QtCore.Qt.RightArrow)
+        self._body.setVisible(on)
+        if on:
+            self._enabled.setChecked(tracing.enabled())
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _events(self):
+        evts = tracing.events()
+        if self.prefixes is None:
+            return evts
+        return [e for e in evts if e.name.startswith(self.prefixes)]
+
+    def refresh(self):
+        stats = tracing.summary(self._events())
+        self._table.setRowCount(len(stats))
+        for r, (name, s) in enumerate(stats.items()):
+            pts = ""
+            if s["points_in"] is not None or s["points_out"] is not None:
+                pts = (f"{s['points_in'] if s['points_in'] is not None else '–'} → "
+                       f"{s['points_out'] if s['points_out'] is not None else '–'}")
+            cells = [name, str(s["count"]), f"{s['wall_ms']:.1f}",
+                     f"{s['cpu_ms']:.1f}", pts, f"{s['rss_mb']:+.1f}"]
+            for c, text in enumerate(cells):
+                self._table.setItem(r, c, QtWidgets.QTableWidgetItem(text))
+        self._table.resizeColumnsToContents()
+
+    def _clear(self):
+        tracing.clear()
+        self.refresh()
+
+    def _export(self):
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Chrome trace kaydet", "trace.json", "JSON (*.json)"
+        )
+        if fn:
+            tracing.export_chrome(fn, self._events())
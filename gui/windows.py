@@ -1,4 +1,5 @@
 # windows.py
+import importlib
 import sys
 from pathlib import Path
 from PyQt5 import QtWidgets, QtGui, QtCore
@@ -6,12 +7,20 @@ from PyQt5 import QtWidgets, QtGui, QtCore
 # Yerel modüller (tema, config, sayfalar vb.)
 from gui.style import apply            # tema paletini uygular
 from gui.config.config_util import load, save
-
-from gui.pages.home_page          import HomePage
-from gui.pages.segmentation_page  import SegmentationPage
-from gui.pages.calibration_page   import CalibrationPage
-from gui.pages.settings_page      import SettingsPage     # tema seçicisi
-from gui.pages.account_page       import AccountPage
+from gui.utils.scheduler import job_scheduler
+
+# Sayfalar ilk gösterimde içe aktarılıp oluşturulur: (modül, sınıf)
+PAGES = [
+    ("gui.pages.home_page",         "HomePage"),
+    ("gui.pages.segmentation_page", "SegmentationPage"),
+    ("gui.pages.calibration_page",  "CalibrationPage"),
+    ("gui.pages.settings_page",     "SettingsPage"),     # tema seçicisi
+    ("gui.pages.account_page",      "AccountPage"),
+]
+# Pencere açıldıktan sonra arka planda ısıtılan ağır modüller. Yalnız Qt'siz
+# modüller: sayfa modülleri (Qt nesneleri, ayar okuma, VisPy) GUI thread'inde
+# sayfa oluşturulurken içe aktarılır
+WARM_MODULES = ("numpy", "open3d", "inference")
 
 # sidebar’da sırasıyla görünecek ikon isimleri
 ICON_NAMES   = ["home", "segment", "calibration", "settings", "account"]
@@ -19,6 +28,11 @@ TOP_ICONS    = ["home", "segment", "calibration"]   # üst tarafta
 BOTTOM_ICONS = ["settings", "account"]              # alt tarafta
 
 
+def _import_modules(names):
+    for name in names:
+        importlib.import_module(name)
+
+
 def icon_path(theme: str, name: str) -> str:
     """
     icons/<light|dark>/<name>.png döner.
@@ -92,22 +106,11 @@ class MainWindow(QtWidgets.QWidget):
         self._stack = QtWidgets.QStackedWidget()
         root.addWidget(self._stack, 1)
 
-        # 4) Sayfaları oluştur
-        self._settings_page = SettingsPage()    # tema sinyali
-        self._settings_page.theme_changed.connect(self._update_theme)
-
-        # Burada segmentation_page'i de değişkende tutuyoruz
-        self.seg_page = SegmentationPage()
-
-        pages = [
-            HomePage(),
-            self.seg_page,
-            CalibrationPage(),
-            self._settings_page,
-            AccountPage()
-        ]
-        for page in pages:
-            self._stack.addWidget(page)
+        # 4) Sayfa yer tutucuları; gerçek sayfa ilk gösterimde oluşturulur
+        self._pages = [None] * len(PAGES)
+        for _ in PAGES:
+            self._stack.addWidget(QtWidgets.QLabel(
+                "Yükleniyor…", alignment=QtCore.Qt.AlignCenter))
 
         # 5) Kenar çubuğu butonları
         self._buttons = []
@@ -139,7 +142,49 @@ class MainWindow(QtWidgets.QWidget):
         # 7) Uygulama paletini uygula (tema)
         apply(QtWidgets.QApplication.instance(), self._theme)
 
+        # 8) Pencere boş sayfayla hemen açılır; Open3D ve çıkarım çekirdeği
+        #    arka planda yüklenince açık sayfa GUI thread'inde oluşturulur
+        job_scheduler().submit(
+            "app.warmup", None, _import_modules, WARM_MODULES
+        ).then(self._on_warm, self._on_warm)
+
+    @property
+    def home_page(self):
+        return self.page(0)
+
+    @property
+    def seg_page(self):
+        return self.page(1)
+
+    def page(self, idx: int) -> QtWidgets.QWidget:
+        """idx'teki sayfa; ilk çağrıda modülü içe aktarıp oluşturur."""
+        page = self._pages[idx]
+        if page is not None:
+            return page
+        module, cls = PAGES[idx]
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            page = getattr(importlib.import_module(module), cls)()
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        if hasattr(page, "theme_changed"):
+            page.theme_changed.connect(self._update_theme)
+
+        current = self._stack.currentIndex()
+        placeholder = self._stack.widget(idx)
+        self._stack.insertWidget(idx, page)
+        self._stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self._stack.setCurrentIndex(current)
+        self._pages[idx] = page
+        return page
+
+    def _on_warm(self, _):
+        # İçe aktarma hatası varsa sayfa oluşturulurken görünür olur
+        self.page(self._stack.currentIndex())
+
     def _switch_page(self, idx: int):
+        self.page(idx)
         self._stack.setCurrentIndex(idx)
         for i, b in enumerate(self._buttons):
             b.setChecked(i == idx)
@@ -160,14 +205,14 @@ class MainWindow(QtWidgets.QWidget):
 
     def closeEvent(self, event: QtGui.QCloseEvent):
         """
-        Pencere kapanırken eğer SegmentationPage üzerinde bir thread çalışıyorsa
-        durdurup bekleyelim. Aksi halde "QThread: Destroyed while thread is still running"
-        hatası alırız.
+        Pencere kapanırken sayfalardaki thread'leri (kamera, segmentasyon,
+        eşleştirme) durdurup bekleyelim. Aksi halde "QThread: Destroyed while
+        thread is still running" hatası alırız.
         """
-        # seg_page içinde thread var mı?
-        if self.seg_page._segment_thread and self.seg_page._segment_thread.isRunning():
-            self.seg_page._segment_thread.stop()
-            self.seg_page._segment_thread.wait()
+        for page in self._pages:
+            if page is not None and hasattr(page, "shutdown"):
+                page.shutdown()
+        job_scheduler().shutdown()
         super().closeEvent(event)
 
 
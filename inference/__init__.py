@@ -0,0 +1,31 @@
+"""
+GUI'siz çıkarım çekirdeği: CAD önbelleği, segmentasyon ve hizalama.
+PyQt5 / VisPy içe aktarmaz; sunucuda `python -m inference` ile çalışır.
+"""
+from .cad import (
+    CACHE_DIR, FACTOR, cad_key, ensure_point_cloud, prewarm, scaled_cloud,
+    trim_cache,
+)
+from .cloud_cache import CloudArrays, load_cloud, read_cache, write_cache
+from .segmentation import (
+    DEFAULT_PARAMS, PlaneTracker, SegmentParams, SegmentationResult, segment_cloud,
+)
+from .density import CloudStats, analyze_cloud, auto_params, derive_params, relative_params
+from .stage_cache import StageCache, cloud_digest, stage_cache
+from .registration import (
+    GLOBAL_BACKENDS,
+    diagonal,
+    preprocess,
+    global_reg,
+    multiscale_icp,
+    refine_icp,
+    register_part_to_segment,
+    track_part_to_segment,
+    align_part_to_segment,
+)
+from .matching import (
+    SegmentMatch, align_job, assign_library, match_library, match_segments,
+)
+from .assignment import assign_parts, linear_assignment
+from .tracking import PoseTracker, TrackMatch
+from . import tracing
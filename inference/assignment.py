@@ -0,0 +1,103 @@
+# ─── assignment.py ────────────────────────────────────────────────────────────
+"""
+Segment ↔ CAD parçası bire bir ataması.
+
+Her (segment, parça) çiftinin maliyeti `1 - fitness` ve küçük bir RMSE
+terimidir; toplam maliyet Macar (Hungarian) algoritmasıyla en aza indirilir.
+SciPy kuruluysa `linear_sum_assignment`, değilse aynı sonucu veren NumPy
+uygulaması kullanılır.
+"""
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment as _scipy_lsa
+except ImportError:              # SciPy isteğe bağlı
+    _scipy_lsa = None
+
+RMSE_WEIGHT = 0.1                # RMSE yalnız yakın fitness'lar arasında belirleyici
+INVALID_COST = 1e6               # hizalanamayan çift: ancak başka seçenek yoksa atanır
+
+
+def _hungarian(cost: np.ndarray):
+    """Potansiyelli O(n²·m) Macar algoritması; satır sayısı ≤ sütun sayısı."""
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)      # p[j]: j. sütunun satırı (1 tabanlı)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            cand = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(cand)) + 1
+            delta = cand[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    cols = np.nonzero(p[1:])[0]
+    rows = p[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def linear_assignment(cost):
+    """
+    Dikdörtgen maliyet matrisi için en düşük toplamlı bire bir eşleme;
+    `scipy.optimize.linear_sum_assignment` ile aynı (satırlar, sütunlar) döner.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.size == 0:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    if _scipy_lsa is not None:
+        return _scipy_lsa(cost)
+    if cost.shape[0] > cost.shape[1]:
+        cols, rows = _hungarian(cost.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+    return _hungarian(cost)
+
+
+def match_cost(fitness: np.ndarray, rmse: np.ndarray,
+               min_fitness: float = 0.0) -> np.ndarray:
+    """
+    (segment, parça) fitness/RMSE matrislerinden maliyet matrisi. RMSE en
+    büyük geçerli değere göre ölçeklenir; hizalanamayan ya da `min_fitness`
+    altında kalan çiftler INVALID_COST alır.
+    """
+    fitness = np.asarray(fitness, dtype=np.float64)
+    rmse = np.asarray(rmse, dtype=np.float64)
+    valid = np.isfinite(rmse) & (fitness > min_fitness)
+    scale = rmse[valid].max() if valid.any() else 1.0
+    cost = np.full(fitness.shape, INVALID_COST)
+    cost[valid] = 1.0 - fitness[valid] + RMSE_WEIGHT * rmse[valid] / max(scale, 1e-12)
+    return cost
+
+
+def assign_parts(fitness, rmse, min_fitness: float = 0.0) -> np.ndarray:
+    """
+    Her segmente en fazla bir parça, her parçaya en fazla bir segment atar.
+    Segment başına parça indisi döner; atanamayanlar -1.
+    """
+    cost = match_cost(fitness, rmse, min_fitness)
+    parts = np.full(cost.shape[0], -1, dtype=np.int64)
+    rows, cols = linear_assignment(cost)
+    ok = cost[rows, cols] < INVALID_COST
+    parts[rows[ok]] = cols[ok]
+    return parts
@@ -0,0 +1,173 @@
+# ─── cad.py ───────────────────────────────────────────────────────────────────
+"""
+CAD (STL) → nokta bulutu dönüşümü ve disk önbelleği.
+
+Önbellek dosyaları STL içeriğinin özetiyle adlandırılır
+(`{stem}-{özet}_{n}pts.pcb`); düzenlenen bir STL aynı adla gelse de yeni
+anahtar alır. Dizin toplamı bir disk bütçesiyle sınırlıdır; en uzun süre
+kullanılmayan dosyalar (mtime) önce silinir.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import open3d as o3d
+
+from inference.cloud_cache import SUFFIX, is_fresh, load_cloud, read_cache, write_cache
+from inference.tracing import span
+
+CACHE_DIR = Path("dataset/STLtoPoint")
+CACHE_MAX_BYTES = 1 << 30
+FACTOR = 0.00068                 # ← parça ölçek faktörü
+
+_HASHES = {}                     # (yol, mtime_ns, boyut) -> içerik özeti
+
+
+def content_hash(path) -> str:
+    """STL içeriğinin kısa özeti; dosya değişmedikçe yeniden okunmaz."""
+    path = Path(path)
+    st = path.stat()
+    memo = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    digest = _HASHES.get(memo)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=8)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = _HASHES[memo] = h.hexdigest()
+    return digest
+
+
+def cad_id(path) -> str:
+    """Önbellek anahtarlarındaki parça kimliği: `{stem}-{içerik özeti}`."""
+    path = Path(path)
+    return f"{path.stem}-{content_hash(path)}"
+
+
+def cad_key(path, n_pts: int, factor: float = FACTOR) -> tuple:
+    """Öznitelik önbelleği anahtarı (parça kimliği, nokta sayısı, ölçek)."""
+    return cad_id(path), n_pts, factor
+
+
+def cache_file(path, n_pts: int, cache_dir: Path = CACHE_DIR) -> Path:
+    return Path(cache_dir) / f"{cad_id(path)}_{n_pts}pts{SUFFIX}"
+
+
+def _touch(path: Path):
+    # LRU sırası mtime ile tutulur (atime noatime bağlamalarda güncellenmez)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def trim_cache(cache_dir: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+               keep=()) -> int:
+    """
+    Dizindeki önbellek dosyalarını (.pcb, öznitelik .npz) toplamı
+    `max_bytes`'a inene dek en eskiden başlayarak siler; silinen bayt döner.
+    """
+    keep = {Path(p) for p in keep}
+    entries = []
+    for p in Path(cache_dir).rglob("*"):
+        if p.suffix not in (SUFFIX, ".npz") or ".tmp" in p.name:
+            continue
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime_ns, st.st_size, p))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, p in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if p in keep:
+            continue
+        try:
+            p.unlink()
+        except OSError:
+            continue             # başka süreç sildi ya da dosya kullanımda
+        total -= size
+        removed += size
+    return removed
+
+
+def _sample(path: Path, n_pts: int, target: Path, cache_dir: Path,
+            max_bytes: int) -> o3d.geometry.PointCloud:
+    with span("ensure_point_cloud/read_mesh") as s:
+        mesh = o3d.io.read_triangle_mesh(str(path))
+        if not mesh.has_vertex_normals():
+            mesh.compute_vertex_normals()
+        s.points_out = len(mesh.vertices)
+    with span("ensure_point_cloud/poisson", len(mesh.vertices)) as s:
+        pcd = mesh.sample_points_poisson_disk(n_pts)
+        s.points_out = len(pcd.points)
+    write_cache(target, np.asarray(pcd.points),
+                np.asarray(pcd.normals) if pcd.has_normals() else None,
+                source=path)
+    trim_cache(cache_dir, max_bytes, keep=(target,))
+    return pcd
+
+
+def scaled_cloud(pcd: o3d.geometry.PointCloud,
+                 factor: float = FACTOR) -> o3d.geometry.PointCloud:
+    """
+    Merkez etrafında ölçeklenmiş yeni bulut (nokta + normal). `deepcopy` +
+    `scale` yerine noktalar tek geçişte üretilir, renkler taşınmaz.
+    """
+    pts = np.asarray(pcd.points)
+    c = pts.mean(axis=0) if len(pts) else np.zeros(3)
+    out = o3d.geometry.PointCloud(o3d.utility.Vector3dVector((pts - c) * factor + c))
+    if pcd.has_normals():
+        out.normals = o3d.utility.Vector3dVector(np.asarray(pcd.normals))
+    return out
+
+
+def ensure_point_cloud(path: Path, n_pts: int, cache_dir: Path = CACHE_DIR,
+                       max_bytes: int = CACHE_MAX_BYTES) -> o3d.geometry.PointCloud:
+    """
+    STL'den Poisson örneklenmiş bulut. Örnekler `cache_dir` altında ikili
+    önbellekte (.pcb) tutulur. PLY kaynaklar ekran önbelleğinden yüklenir.
+    """
+    path = Path(path)
+    cache_dir = Path(cache_dir)
+    if path.suffix.lower() == ".ply":
+        return load_cloud(path).to_o3d()
+    if path.suffix.lower() != ".stl":
+        raise ValueError(f"Desteklenmeyen uzantı: {path.suffix}")
+
+    target = cache_file(path, n_pts, cache_dir)
+    if is_fresh(target):
+        _touch(target)
+        with span("ensure_point_cloud/cached") as s:
+            pcd = read_cache(target).to_o3d()
+            s.points_out = len(pcd.points)
+        return pcd
+    return _sample(path, n_pts, target, cache_dir, max_bytes)
+
+
+def warm_point_cloud(path: Path, n_pts: int, cache_dir: Path = CACHE_DIR,
+                     max_bytes: int = CACHE_MAX_BYTES) -> Path:
+    """
+    Önbellekte yoksa örnekleyip yazar, bulutu döndürmez (süreç havuzundan
+    geri taşınmasın diye); önbellek dosyasının yolunu döner.
+    """
+    path, cache_dir = Path(path), Path(cache_dir)
+    target = cache_file(path, n_pts, cache_dir)
+    if is_fresh(target):
+        _touch(target)
+    else:
+        _sample(path, n_pts, target, cache_dir, max_bytes)
+    return target
+
+
+def prewarm(paths, n_pts: int, executor, cache_dir: Path = CACHE_DIR,
+            max_bytes: int = CACHE_MAX_BYTES) -> dict:
+    """Her STL için `warm_point_cloud`'u havuza gönderir; {yol: future} döner."""
+    return {
+        Path(p): executor.submit(warm_point_cloud, Path(p), n_pts,
+                                 Path(cache_dir), max_bytes)
+        for p in paths
+    }
@@ -0,0 +1,160 @@
+# ─── camera.py ────────────────────────────────────────────────────────────────
+"""
+Kamera kaynakları ve sınırlı kare kuyruğu.
+
+Kaynak kendi thread'inde kare üretir ve `FrameQueue`'ya koyar. Kuyruk
+doluysa en eski kare atılır; tüketici `get_latest()` ile her zaman en yeni
+kareyi alır, arada kalanlar düşürülmüş sayılır (latest-frame-wins).
+"""
+import threading
+import time
+from collections import deque, namedtuple
+from pathlib import Path
+
+import open3d as o3d
+
+from inference.cloud_cache import load_cloud
+
+Frame = namedtuple("Frame", "index timestamp cloud")
+
+
+class FrameQueue:
+    """Thread-safe halka tampon; dolunca en eskiyi düşürür."""
+
+    def __init__(self, maxlen: int = 4):
+        self._buf = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._buf)
+
+    def put(self, frame: Frame):
+        with self._cond:
+            if len(self._buf) == self._buf.maxlen:
+                self.dropped += 1
+            self._buf.append(frame)
+            self._cond.notify()
+
+    def get_latest(self, timeout: float = None):
+        """En yeni kareyi döner, eskileri atar. Zaman aşımında None."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._buf or self._closed, timeout)
+            if not self._buf:
+                return None
+            frame = self._buf.pop()
+            self.dropped += len(self._buf)
+            self._buf.clear()
+            return frame
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class CameraSource:
+    """
+    Kendi thread'inde kare üreten kaynak. Alt sınıflar `open()` ve `grab()`
+    yazar; `grab()` bir PointCloud ya da akış bittiyse None döner.
+    """
+
+    def __init__(self, queue_size: int = 4):
+        self.frames = FrameQueue(queue_size)
+        self.captured = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def open(self) -> bool:
+        return True
+
+    def grab(self):
+        raise NotImplementedError
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.frames.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _loop(self):
+        try:
+            while not self._stop.is_set():
+                cloud = self.grab()
+                if cloud is None:
+                    break
+                self.frames.put(Frame(self.captured, time.perf_counter(), cloud))
+                self.captured += 1
+        finally:
+            self.frames.close()
+
+
+class SimulatedCamera(CameraSource):
+    """Bir dizindeki PLY karelerini sabit FPS ile yeniden oynatır."""
+
+    def __init__(self, directory, fps: float = 10.0, loop: bool = True,
+                 preload: bool = False, queue_size: int = 4):
+        super().__init__(queue_size)
+        self.directory = Path(directory)
+        self.fps = fps
+        self.loop = loop
+        self.preload = preload
+        self._files = []
+        self._clouds = None
+        self._next_t = None
+
+    def open(self) -> bool:
+        if self.directory.is_dir():
+            self._files = sorted(self.directory.glob("*.ply"))
+        if self.preload and self._files:
+            self._clouds = [load_cloud(f).to_o3d() for f in self._files]
+        return bool(self._files)
+
+    def grab(self):
+        i = self.captured
+        if i >= len(self._files) and not self.loop:
+            return None
+
+        # Sabit zaman çizelgesi: geride kalınırsa beklemeden devam edilir
+        now = time.perf_counter()
+        if self._next_t is None:
+            self._next_t = now
+        if self._next_t > now and self._stop.wait(self._next_t - now):
+            return None
+        self._next_t += 1.0 / self.fps if self.fps > 0 else 0.0
+
+        k = i % len(self._files)
+        if self._clouds is not None:
+            return o3d.geometry.PointCloud(self._clouds[k])
+        # Kareler .pcb önbelleğinden okunur; PLY ayrıştırması ilk turda bir kez
+        return load_cloud(self._files[k]).to_o3d()
+
+
+SOURCES = {"simulated": SimulatedCamera}
+
+
+def open_camera(cfg: dict):
+    """
+    Ayar sözlüğünden kaynağı açar, ör.
+    {"source": "simulated", "directory": "dataset/screen", "fps": 10}.
+    Açılamazsa None döner.
+    """
+    cfg = dict(cfg or {})
+    cls = SOURCES.get(cfg.pop("source", None))
+    if cls is None:
+        return None
+    try:
+        cam = cls(**cfg)
+    except TypeError:
+        return None
+    return cam if cam.open() else None
@@ -0,0 +1,140 @@
+# ─── cli.py ───────────────────────────────────────────────────────────────────
+"""
+Başsız (headless) toplu çıkarım:
+
+    python -m inference "dataset/screen/*.ply" --cad-dir dataset/part -j 4
+
+Her tarama için bir JSON satırı stdout'a (veya --out dosyasına) akıtılır.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import open3d as o3d
+
+from inference import tracing
+from inference.cad import FACTOR, prewarm
+from inference.pipeline import run_scan
+from inference.registration import GLOBAL_BACKENDS
+from inference.signature import SIZE_TOL
+
+
+def collect_scans(spec: str):
+    """Dizin ya da glob deseninden sıralı PLY listesi."""
+    p = Path(spec)
+    if p.is_dir():
+        return sorted(p.glob("*.ply"))
+    return sorted(Path(f) for f in glob.glob(spec, recursive=True))
+
+
+def collect_cad(spec: str):
+    p = Path(spec)
+    if p.is_dir():
+        return sorted(f for f in p.iterdir() if f.suffix.lower() in (".stl", ".ply"))
+    return sorted(Path(f) for f in glob.glob(spec))
+
+
+def _quiet_open3d():
+    # Open3D uyarıları stdout'a yazar; JSON satır akışını bozmasın
+    o3d.utility.set_verbosity_level(o3d.utility.VerbosityLevel.Error)
+
+
+def _scan_job(scan, cad_paths, n_pts, factor, size_tol, point_to_plane, backend,
+              memory_budget, density, prefilter_fpfh):
+    _quiet_open3d()
+    try:
+        return run_scan(scan, cad_paths, n_pts, factor, size_tol, point_to_plane,
+                        backend, memory_budget, density, prefilter_fpfh)
+    except Exception as e:
+        return {"scan": str(scan), "error": str(e),
+                "traceback": traceback.format_exc()}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="python -m inference",
+        description="PLY taramalarında segmentasyon + CAD eşleştirme (GUI'siz).",
+    )
+    ap.add_argument("scans", help="PLY dizini ya da glob deseni")
+    ap.add_argument("--cad-dir", default="dataset/part",
+                    help="STL/PLY CAD kütüphanesi (dizin ya da glob)")
+    ap.add_argument("--cad-points", type=int, default=10000,
+                    help="CAD başına örneklenecek nokta sayısı")
+    ap.add_argument("--factor", type=float, default=FACTOR,
+                    help="CAD ölçek faktörü")
+    ap.add_argument("--prefilter-tol", type=float, default=SIZE_TOL,
+                    help="imza ön elemesinde segmentin parçayı aşabileceği oran")
+    ap.add_argument("--no-prefilter", action="store_true",
+                    help="tüm segment–parça çiftlerini kaydet (ön eleme yok)")
+    ap.add_argument("--prefilter-fpfh", action="store_true",
+                    help="ön eleme sıralamasına ortalama FPFH histogramını ekle")
+    ap.add_argument("--point-to-plane", action="store_true",
+                    help="ICP'de nokta-düzlem kestirimi (preprocess normalleri)")
+    ap.add_argument("--global-reg", choices=GLOBAL_BACKENDS, default="ransac",
+                    help="global kayıt: uyarlamalı RANSAC ya da Fast Global Registration")
+    ap.add_argument("--memory-mb", type=int, default=0,
+                    help="tarama başına kayıt bellek bütçesi; aşan segmentler "
+                         "alt örneklenir (0 = sınırsız)")
+    ap.add_argument("--auto-params", action="store_true",
+                    help="segmentasyon parametrelerini taramanın nokta "
+                         "aralığından türet")
+    ap.add_argument("-j", "--workers", type=int, default=0,
+                    help="paralel süreç sayısı (0 = CPU sayısı)")
+    ap.add_argument("-o", "--out", help="JSON satırlarının yazılacağı dosya")
+    ap.add_argument("--trace", metavar="JSON",
+                    help="aşama sürelerini Chrome trace olarak bu dosyaya yaz")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    scans = collect_scans(args.scans)
+    cad_paths = collect_cad(args.cad_dir)
+    if not scans:
+        print(f"Tarama bulunamadı: {args.scans}", file=sys.stderr)
+        return 2
+    if not cad_paths:
+        print(f"CAD dosyası bulunamadı: {args.cad_dir}", file=sys.stderr)
+        return 2
+
+    _quiet_open3d()
+    tracing.enable(bool(args.trace))
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    workers = args.workers or os.cpu_count() or 1
+    failed = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, max(len(scans), len(cad_paths))),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            # Önbelleği taramalardan önce aynı havuzda paralel ısıt; tarama
+            # işleri aynı dosyayı yeniden örneklemeye çalışmasın
+            stls = [p for p in cad_paths if Path(p).suffix.lower() == ".stl"]
+            for fut in prewarm(stls, args.cad_points, pool).values():
+                fut.result()
+            futures = [
+                tracing.submit(pool, _scan_job, s, cad_paths, args.cad_points,
+                               args.factor,
+                               None if args.no_prefilter else args.prefilter_tol,
+                               args.point_to_plane, args.global_reg,
+                               (args.memory_mb << 20) or None,
+                               args.auto_params, args.prefilter_fpfh)
+                for s in scans
+            ]
+            for fut in as_completed(futures):
+                res = tracing.result(fut)
+                failed += "error" in res
+                out.write(json.dumps(res, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.trace:
+        tracing.export_chrome(args.trace)
+    return 1 if failed else 0
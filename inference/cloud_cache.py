@@ -0,0 +1,214 @@
+# ─── cloud_cache.py ───────────────────────────────────────────────────────────
+"""
+Nokta bulutları için `np.memmap` ile kopyasız açılan ikili önbellek (.pcb).
+
+Düzen: sabit boyutlu başlık, ardından 64 bayta hizalı sütunlar:
+konumlar float32 (N, 3) ya da int16 (N, 3) + eksen başına ölçek/ofset,
+normaller float32 (N, 3), renkler uint8 (N, 3). Başlık kaynak dosyanın
+mtime/boyutunu taşır; kaynak değişince önbellek bayat sayılıp yeniden
+yazılır. PLY gibi kaynaklar ilk yüklemede şeffaf biçimde dönüştürülür.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import open3d as o3d
+
+SUFFIX = ".pcb"
+MAGIC = b"PCB1"
+VERSION = 1
+ALIGN = 64
+SCREEN_CACHE_DIR = Path("dataset/pcache")
+
+HAS_NORMALS, HAS_COLORS, QUANTIZED = 1, 2, 4
+
+HEADER = np.dtype([
+    ("magic", "S4"), ("version", "<u2"), ("flags", "<u2"), ("count", "<u8"),
+    ("src_mtime_ns", "<i8"), ("src_size", "<i8"),
+    ("scale", "<f8", 3), ("offset", "<f8", 3),
+])
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _layout(flags: int, count: int):
+    """[(ad, dtype, bayt ofseti)] — sütunlar başlıktan sonra hizalı sırayla."""
+    cols = [("positions", np.int16 if flags & QUANTIZED else np.float32)]
+    if flags & HAS_NORMALS:
+        cols.append(("normals", np.float32))
+    if flags & HAS_COLORS:
+        cols.append(("colors", np.uint8))
+    out, pos = [], _align(HEADER.itemsize)
+    for name, dtype in cols:
+        out.append((name, np.dtype(dtype), pos))
+        pos = _align(pos + count * 3 * np.dtype(dtype).itemsize)
+    return out, pos
+
+
+class CloudArrays:
+    """Önbellek dosyasının salt okunur sütun görünümleri."""
+
+    def __init__(self, positions, normals=None, colors=None,
+                 scale=None, offset=None):
+        self.positions = positions
+        self.normals = normals
+        self.colors = colors
+        self.scale = scale
+        self.offset = offset
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def quantized(self) -> bool:
+        return self.positions.dtype == np.int16
+
+    @property
+    def points(self) -> np.ndarray:
+        """float32 (N, 3); float32 önbellekte kopyasız, int16'da açılarak."""
+        if not self.quantized:
+            return self.positions
+        return (self.positions.astype(np.float32) + np.float32(32767)) \
+            * self.scale.astype(np.float32) + self.offset.astype(np.float32)
+
+    def to_o3d(self) -> o3d.geometry.PointCloud:
+        """Open3D algoritmaları için float64 bulut (burada kopya kaçınılmaz)."""
+        pcd = o3d.geometry.PointCloud(
+            o3d.utility.Vector3dVector(self.points.astype(np.float64)))
+        if self.normals is not None:
+            pcd.normals = o3d.utility.Vector3dVector(self.normals.astype(np.float64))
+        if self.colors is not None:
+            pcd.colors = o3d.utility.Vector3dVector(self.colors / 255.0)
+        return pcd
+
+
+def write_cache(path, points, normals=None, colors=None, quantize=False,
+                source=None):
+    """
+    Sütunları `path`'e yazar (geçici dosya + os.replace ile atomik).
+    colors: float [0, 1] ya da uint8; source: bayatlık için kaynak dosya.
+    """
+    path = Path(path)
+    points = np.asarray(points)
+    n = len(points)
+    header = np.zeros((), dtype=HEADER)
+    header["magic"], header["version"], header["count"] = MAGIC, VERSION, n
+    if source is not None:
+        st = os.stat(source)
+        header["src_mtime_ns"], header["src_size"] = st.st_mtime_ns, st.st_size
+
+    flags = 0
+    cols = {}
+    if quantize and n:
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        scale = np.where(hi > lo, (hi - lo) / 65534.0, 1.0)
+        header["scale"], header["offset"] = scale, lo
+        q = np.rint((points - lo) / scale) - 32767
+        cols["positions"] = q.astype(np.int16)
+        flags |= QUANTIZED
+    else:
+        cols["positions"] = points.astype(np.float32, copy=False)
+    if normals is not None and len(normals):
+        cols["normals"] = np.asarray(normals, dtype=np.float32)
+        flags |= HAS_NORMALS
+    if colors is not None and len(colors):
+        colors = np.asarray(colors)
+        if colors.dtype != np.uint8:
+            colors = np.clip(np.rint(colors * 255), 0, 255).astype(np.uint8)
+        cols["colors"] = colors[:, :3]
+        flags |= HAS_COLORS
+    header["flags"] = flags
+
+    layout, total = _layout(flags, n)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.truncate(total)
+            f.write(header.tobytes())
+            for name, dtype, offset in layout:
+                f.seek(offset)
+                f.write(np.ascontiguousarray(cols[name], dtype=dtype).tobytes())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def read_header(path):
+    """Başlık ya da dosya geçersizse None."""
+    try:
+        header = np.fromfile(path, dtype=HEADER, count=1)
+    except (OSError, ValueError):
+        return None
+    if len(header) != 1 or header[0]["magic"] != MAGIC \
+            or header[0]["version"] != VERSION:
+        return None
+    return header[0]
+
+
+def is_fresh(path, source=None) -> bool:
+    """Önbellek geçerli ve (verildiyse) kaynakla aynı mtime/boyutta mı?"""
+    header = read_header(path)
+    if header is None:
+        return False
+    if source is None:
+        return True
+    try:
+        st = os.stat(source)
+    except OSError:
+        return True              # kaynak yoksa eldeki önbellek kullanılır
+    return (int(header["src_mtime_ns"]) == st.st_mtime_ns
+            and int(header["src_size"]) == st.st_size)
+
+
+def read_cache(path) -> CloudArrays:
+    """Sütunları kopyasız `np.memmap` olarak açar."""
+    header = read_header(path)
+    if header is None:
+        raise ValueError(f"Geçersiz önbellek dosyası: {path}")
+    n, flags = int(header["count"]), int(header["flags"])
+    layout, _ = _layout(flags, n)
+    cols = {}
+    for name, dtype, offset in layout:
+        cols[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset,
+                               shape=(n, 3)) if n else np.zeros((0, 3), dtype)
+    return CloudArrays(
+        cols["positions"], cols.get("normals"), cols.get("colors"),
+        np.array(header["scale"]), np.array(header["offset"]),
+    )
+
+
+def cache_path(source, cache_dir=SCREEN_CACHE_DIR) -> Path:
+    """Kaynak yolundan çakışmasız önbellek dosya adı."""
+    source = Path(source)
+    tag = hashlib.blake2b(str(source.resolve()).encode(), digest_size=4).hexdigest()
+    return Path(cache_dir) / f"{source.stem}-{tag}{SUFFIX}"
+
+
+def load_cloud(source, cache_dir=SCREEN_CACHE_DIR, quantize=False) -> CloudArrays:
+    """
+    Kaynak bulutu (PLY/PCD/...) önbellekten yükler; önbellek yoksa ya da
+    bayatsa kaynağı bir kez okuyup dönüştürür. Önbellek yazılamazsa
+    (salt okunur dizin) okunan bulut doğrudan döner.
+    """
+    source = Path(source)
+    if source.suffix == SUFFIX:
+        return read_cache(source)
+    path = cache_path(source, cache_dir)
+    if is_fresh(path, source):
+        return read_cache(path)
+    pcd = o3d.io.read_point_cloud(str(source))
+    normals = np.asarray(pcd.normals) if pcd.has_normals() else None
+    colors = np.asarray(pcd.colors) if pcd.has_colors() else None
+    try:
+        write_cache(path, np.asarray(pcd.points), normals, colors, quantize, source)
+    except OSError:
+        return CloudArrays(np.asarray(pcd.points, dtype=np.float32),
+                           None if normals is None else normals.astype(np.float32),
+                           None if colors is None else
+                           np.clip(np.rint(colors * 255), 0, 255).astype(np.uint8))
+    return read_cache(path)
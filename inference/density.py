@@ -0,0 +1,115 @@
+# ─── density.py ───────────────────────────────────────────────────────────────
+"""
+Nokta yoğunluğundan segmentasyon parametreleri.
+
+Sabit voxel/eps değerleri tek bir sensörün birimini ve yoğunluğunu varsayar;
+uymadıklarında DBSCAN ya neredeyse hiçbir şey yapmaz ya da dev bir komşu
+aramasına dönüşür. Burada örneklenmiş kNN ile nokta aralığı s, birim ve
+sahne boyutu kestirilir. Uzunluklar s'nin katı, min_points ise eps
+diskindeki beklenen komşu sayısının (π (eps/s)²) oranı olarak türetilir.
+Voxel, bulutu en fazla `max_points` noktaya indirecek kadar büyütülür;
+böylece DBSCAN işi (bkz. `preview.work_units`) sensörden bağımsız kalır.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+import open3d as o3d
+
+from inference.feature_cache import quantize_voxel
+from inference.segmentation import SegmentParams, to_cloud
+from inference.tracing import span
+
+SAMPLE_POINTS = 2_000            # kNN sorgu noktası
+TREE_POINTS = 200_000            # kNN ağacının kurulduğu alt örnek
+KNN_K = 8
+MAX_POINTS = 500_000             # downsample sonrası nokta üst sınırı
+
+# (sahne köşegeni alt sınırı, metre/birim, ad); ilk uyan seçilir
+UNITS = ((50.0, 1e-3, "mm"), (0.0, 1.0, "m"))
+
+# Göreli parametreler: uzunluklar nokta aralığının katı, fill_* ise eps
+# diskindeki beklenen komşu sayısının oranı (min_points = fill · π (eps/s)²)
+RELATIVE_DEFAULTS = {
+    "voxel": 1.0, "plane_eps": 4.0,
+    "eps_1": 12.5, "fill_1": 0.25,
+    "eps_2": 7.5, "fill_2": 0.11,
+}
+
+CloudStats = namedtuple("CloudStats", "n spacing extent area unit unit_name")
+
+
+def analyze_cloud(pcd, sample: int = SAMPLE_POINTS, k: int = KNN_K,
+                  seed: int = 0) -> CloudStats:
+    """
+    Nokta aralığı, sahne boyutu ve birim kestirimi. Aralık, alt örnekte
+    k. komşu uzaklıklarının medyanından bulunur (yüzeyde d_k ≈ s·√(k/π));
+    alt örneğin seyrelmesi √(m/n) ile düzeltilir. Sabit tohumla aynı bulut
+    hep aynı sonucu verir (önbellek anahtarları kararlı kalır).
+    """
+    pts = np.asarray(pcd.points)
+    n = len(pts)
+    if n <= k:
+        raise ValueError(f"Yoğunluk analizi için en az {k + 1} nokta gerekli")
+    rng = np.random.default_rng(seed)
+    with span("density/analyze", n):
+        m = min(n, TREE_POINTS)
+        sub = pts[rng.choice(n, m, replace=False)] if m < n else pts
+        tree = o3d.geometry.KDTreeFlann(to_cloud(sub))
+        query = sub[rng.choice(m, min(m, sample), replace=False)]
+        d2 = np.array([tree.search_knn_vector_3d(q, k + 1)[2][-1] for q in query])
+        spacing = math.sqrt(float(np.median(d2)) * math.pi / k) * math.sqrt(m / n)
+
+        # Uç %1'lik dilimler atılır: tek tük aykırı nokta boyutu şişirmesin
+        lo, hi = np.percentile(sub, [1, 99], axis=0)
+        extent = hi - lo
+        ext = np.sort(extent)
+        area = max(float(ext[1] * ext[2]), 1e-12)
+        diag = float(np.linalg.norm(extent))
+        unit, unit_name = next((u, name) for lim, u, name in UNITS if diag >= lim)
+    return CloudStats(n, spacing, extent, area, unit, unit_name)
+
+
+def derive_params(stats: CloudStats, relative: dict = None,
+                  max_points: int = MAX_POINTS) -> SegmentParams:
+    """
+    Göreli parametrelerden (eksik anahtarlar `RELATIVE_DEFAULTS`) mutlak
+    `SegmentParams`. Downsample sonrası aralık max(s, voxel) alınır;
+    `voxel` katı 0 ise downsample kapalı kalır.
+    """
+    rel = dict(RELATIVE_DEFAULTS, **(relative or {}))
+    voxel = rel["voxel"] * stats.spacing
+    if voxel > 0 and max_points:
+        voxel = max(voxel, math.sqrt(stats.area / max_points))
+    voxel = quantize_voxel(voxel)
+    s = max(stats.spacing, voxel, 1e-12)
+
+    def dbscan(stage):
+        mult = rel[f"eps_{stage}"]
+        return mult * s, max(3, int(round(rel[f"fill_{stage}"] * math.pi * mult * mult)))
+
+    return SegmentParams(voxel, rel["plane_eps"] * s, *dbscan(1), *dbscan(2))
+
+
+def relative_params(params: SegmentParams, spacing: float) -> dict:
+    """`derive_params`'ın tersi: mutlak değerleri aralık katlarına çevirir."""
+    spacing = max(spacing, 1e-12)
+    s = max(spacing, params.voxel)
+
+    def fill(eps, pts):
+        return pts / max(math.pi * (eps / s) ** 2, 1e-12)
+
+    return {
+        "voxel": round(params.voxel / spacing, 4),
+        "plane_eps": round(params.plane_eps / s, 4),
+        "eps_1": round(params.eps_1 / s, 4),
+        "fill_1": round(fill(params.eps_1, params.pts_1), 4),
+        "eps_2": round(params.eps_2 / s, 4),
+        "fill_2": round(fill(params.eps_2, params.pts_2), 4),
+    }
+
+
+def auto_params(pcd, relative: dict = None,
+                max_points: int = MAX_POINTS) -> SegmentParams:
+    """Buluttan doğrudan parametre: `derive_params(analyze_cloud(pcd))`."""
+    return derive_params(analyze_cloud(pcd), relative, max_points)
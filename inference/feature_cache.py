@@ -0,0 +1,127 @@
+# ─── feature_cache.py ─────────────────────────────────────────────────────────
+"""
+CAD tarafı öznitelik önbelleği.
+
+Aynı CAD parçası her segment için yeniden voxel'lenip normal/FPFH
+hesaplanmasın diye (downsample bulut, normaller, FPFH) üçlüsü hem bellekte
+(LRU) hem de diskte (`dataset/STLtoPoint/features`) saklanır.
+Anahtar: parça kimliği (ad + içerik özeti), nokta sayısı, ölçek faktörü ve
+kuantize voxel boyutu. Disk tarafı `cad.trim_cache` bütçesine dahildir.
+"""
+import math
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import open3d as o3d
+
+# Voxel boyutu log2 ölçeğinde 1/8 adımla kuantize edilir (~%9 aralık)
+VOXEL_STEPS_PER_OCTAVE = 8
+
+
+def quantize_voxel(voxel: float) -> float:
+    """Yakın voxel değerlerini aynı önbellek anahtarına toplar."""
+    if voxel <= 0:
+        return voxel
+    q = round(math.log2(voxel) * VOXEL_STEPS_PER_OCTAVE)
+    return 2.0 ** (q / VOXEL_STEPS_PER_OCTAVE)
+
+
+class FeatureCache:
+    """(down, fpfh) çiftleri için bellek + disk önbelleği."""
+
+    def __init__(self, cache_dir, max_entries: int = 32):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self._mem = OrderedDict()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(cad_key, voxel: float) -> str:
+        """cad_key = `cad.cad_key` çıktısı (parça kimliği, nokta sayısı, ölçek)."""
+        name, n_pts, factor = cad_key
+        return f"{name}_{n_pts}pts_f{factor:g}_v{voxel:.6g}"
+
+    def get(self, cad_key, voxel: float, compute):
+        """
+        Önbellekte varsa döner; yoksa `compute()` ile (down, fpfh) üretip
+        saklar. Dönen nesneler paylaşılır, çağıran taraf değiştirmemelidir.
+        """
+        k = self.key(cad_key, voxel)
+        if k in self._mem:
+            self._mem.move_to_end(k)
+            self.hits += 1
+            return self._mem[k]
+
+        entry = self._load(k)
+        if entry is None:
+            self.misses += 1
+            entry = compute()
+            self._store(k, entry)
+        else:
+            self.hits += 1
+        self._remember(k, entry)
+        return entry
+
+    def clear(self):
+        self._mem.clear()
+
+    # ───────────────────────── internal
+    def _remember(self, k, entry):
+        self._mem[k] = entry
+        self._mem.move_to_end(k)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _path(self, k) -> Path:
+        return self.cache_dir / f"{k}.npz"
+
+    def _load(self, k):
+        path = self._path(k)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                down = o3d.geometry.PointCloud(
+                    o3d.utility.Vector3dVector(data["points"])
+                )
+                down.normals = o3d.utility.Vector3dVector(data["normals"])
+                fpfh = o3d.pipelines.registration.Feature()
+                fpfh.data = data["fpfh"]
+        except (OSError, KeyError, ValueError):
+            return None
+        try:
+            os.utime(path)               # disk LRU'su için son kullanım
+        except OSError:
+            pass
+        return down, fpfh
+
+    def _store(self, k, entry):
+        down, fpfh = entry
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(k)
+        # Paralel süreçler aynı dosyaya yazabilir: önce geçici dosya, sonra rename
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        try:
+            np.savez(
+                tmp,
+                points=np.asarray(down.points),
+                normals=np.asarray(down.normals),
+                fpfh=np.asarray(fpfh.data),
+            )
+            os.replace(tmp, path)
+        except OSError:
+            if tmp.exists():
+                tmp.unlink()
+
+
+_CACHE = None
+
+
+def feature_cache(cache_dir="dataset/STLtoPoint/features") -> FeatureCache:
+    """Süreç başına tek önbellek örneği."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = FeatureCache(cache_dir)
+    return _CACHE
@@ -0,0 +1,194 @@
+# ─── matching.py ──────────────────────────────────────────────────────────────
+"""
+Segmentlerin süreç havuzunda paralel hizalanması.
+
+Segmentler segmentasyon sonucunun float32 görünümleri olarak gönderilir;
+float64'e yalnız işçi süreçte, o segment için çevrilir. `memory_budget`
+(bayt) verilirse aynı anda havuzda olan işlerin tahmini tepe belleği bu
+sınırı aşmaz: işler sınırlı gruplar halinde gönderilir, tek başına sınırı
+aşan bir segment adımlı (kopyasız) alt örneklenir.
+"""
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+import open3d as o3d
+
+from inference import tracing
+from inference.assignment import assign_parts
+from inference.registration import register_part_to_segment, transform_points
+from inference.signature import SIZE_TOL, SignatureIndex, candidate_pairs, signature
+
+# Kütüphane eşleştirmesinde segment başına sonuç (part: kütüphane indisi, -1 = yok)
+SegmentMatch = namedtuple("SegmentMatch", "segment part fitness rmse pose")
+
+# Kayıt sırasında girdi noktası başına tahmini tepe bellek (bayt): float64
+# kopya, normaller, KD-ağacı ve voxel bulutunun FPFH'si dahil
+POINT_BYTES = 160
+
+
+def align_job(idx, part_pts: np.ndarray, part_nrm, seg_pts: np.ndarray,
+              cad_key=None, with_points: bool = True, point_to_plane: bool = False,
+              backend: str = "ransac"):
+    """
+    Süreç havuzunda çalışır: tek bir segmente hizalama yapar.
+    (idx, hizalanmış noktalar | None, poz | None, fitness, rmse) döner;
+    `with_points=False` ise noktalar geri taşınmaz (None).
+    """
+    part = o3d.geometry.PointCloud(o3d.utility.Vector3dVector(
+        np.asarray(part_pts, dtype=np.float64)))
+    if part_nrm is not None:
+        part.normals = o3d.utility.Vector3dVector(
+            np.asarray(part_nrm, dtype=np.float64))
+    seg  = o3d.geometry.PointCloud(o3d.utility.Vector3dVector(
+        np.asarray(seg_pts, dtype=np.float64)))
+    T, fit, rmse = register_part_to_segment(part, seg, cad_key,
+                                            point_to_plane=point_to_plane,
+                                            backend=backend)
+    if T is None:
+        return idx, None, None, fit, rmse
+    aligned = transform_points(part_pts, T) if with_points else None
+    return idx, aligned, T, fit, rmse
+
+
+def _points(seg) -> np.ndarray:
+    if isinstance(seg, o3d.geometry.PointCloud):
+        return np.asarray(seg.points)
+    return np.asarray(seg)
+
+
+def _rejected(idx):
+    # Ön elemeden geçemeyen çift: hizalanamamış gibi raporlanır
+    return idx, None, None, 0.0, np.inf
+
+
+def job_bytes(n_points: int) -> int:
+    """`n_points` noktalık bir kayıt işinin tahmini tepe belleği."""
+    return n_points * POINT_BYTES
+
+
+def fit_budget(pts: np.ndarray, budget, reserve: int = 0) -> np.ndarray:
+    """
+    Tek başına bütçeyi aşan segmenti adımlı görünümle (kopyasız) küçültür.
+    `reserve` aynı işte parçanın payıdır.
+    """
+    if not budget:
+        return pts
+    room = max(budget - reserve, POINT_BYTES)
+    step = -(-job_bytes(len(pts)) // room)
+    return pts[::step] if step > 1 else pts
+
+
+def run_bounded(pool, jobs, budget=None):
+    """
+    jobs: `[(maliyet, fn, args)]`. İşleri sırayla gönderir; havuzdaki işlerin
+    toplam maliyeti `budget`'ı aşmaz (en az bir iş her zaman çalışır,
+    `budget=None` hepsini birden gönderir). Sonuçları bitiş sırasıyla üretir;
+    erken çıkışta çalışan işler iptal edilir, bekleyenler hiç gönderilmez.
+    """
+    pending = deque(jobs)
+    running = {}
+    used = 0
+    try:
+        while pending or running:
+            while pending and (not running or budget is None
+                               or used + pending[0][0] <= budget):
+                cost, fn, args = pending.popleft()
+                running[tracing.submit(pool, fn, *args)] = cost
+                used += cost
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                used -= running.pop(fut)
+                if not fut.cancelled():
+                    yield tracing.result(fut)
+    finally:
+        for fut in running:
+            fut.cancel()
+
+
+def match_segments(pool, part_pcd, segments, cad_key=None, size_tol=SIZE_TOL,
+                   point_to_plane: bool = False, backend: str = "ransac",
+                   memory_budget=None, with_fpfh: bool = False):
+    """
+    Parçayı tüm segmentlere (N×3 nokta dizileri ya da PointCloud'lar)
+    aynı anda hizalar; sonuçları bitiş sırasına göre
+    `align_job` çıktısı olarak üretir. Döngüden erken çıkılırsa (break)
+    henüz başlamamış işler iptal edilir, çalışanların sonucu yok sayılır.
+
+    Boyut/şekil imzası parçaya uymayan segmentler RANSAC'a girmeden
+    başarısız olarak döner; kalanlar olasılık sırasıyla gönderilir
+    (`size_tol=None` ön elemeyi kapatır; `with_fpfh` sıralamaya ortalama
+    FPFH histogramını ekler). `memory_budget`: modül belgesi.
+    """
+    part_pts = np.asarray(part_pcd.points)
+    part_nrm = np.asarray(part_pcd.normals) if part_pcd.has_normals() else None
+    seg_pts = [_points(s) for s in segments]
+    order = list(range(len(seg_pts)))
+    if size_tol is not None and seg_pts:
+        index = SignatureIndex([part_pts], size_tol, with_fpfh=with_fpfh)
+        scored = []
+        for i, pts in enumerate(seg_pts):
+            ok, score = index.scores(signature(pts, with_fpfh))
+            if ok[0]:
+                scored.append((score[0], i))
+            else:
+                yield _rejected(i)
+        order = [i for _, i in sorted(scored)]
+    reserve = job_bytes(len(part_pts))
+    jobs = []
+    for i in order:
+        pts = fit_budget(seg_pts[i], memory_budget, reserve)
+        jobs.append((reserve + job_bytes(len(pts)), align_job,
+                     (i, part_pts, part_nrm, pts, cad_key, True,
+                      point_to_plane, backend)))
+    yield from run_bounded(pool, jobs, memory_budget)
+
+
+def match_library(pool, parts, segments, size_tol=SIZE_TOL,
+                  point_to_plane: bool = False, backend: str = "ransac",
+                  memory_budget=None, with_fpfh: bool = False):
+    """
+    Kütüphanedeki her parçayı (`[(PointCloud, cad_key)]`) her segmente aynı
+    anda hizalar; sonuçları bitiş sırasıyla `align_job` çıktısı olarak üretir,
+    idx = (segment, parça). Hizalanmış noktalar geri taşınmaz; gerekirse
+    `transform_points` ile pozdan üretilir. Erken çıkışta kalan işler iptal edilir.
+    İmza ön elemesinden geçemeyen çiftler kayıt yapılmadan başarısız döner.
+    `memory_budget`: modül belgesi; `with_fpfh`: `match_segments`.
+    """
+    arrays = [
+        (np.asarray(p.points), np.asarray(p.normals) if p.has_normals() else None, key)
+        for p, key in parts
+    ]
+    seg_pts = [_points(s) for s in segments]
+    keep, reject = candidate_pairs([a[0] for a in arrays], seg_pts, size_tol,
+                                   with_fpfh)
+    for idx in reject:
+        yield _rejected(idx)
+    jobs = []
+    for i, j in keep:
+        reserve = job_bytes(len(arrays[j][0]))
+        pts = fit_budget(seg_pts[i], memory_budget, reserve)
+        jobs.append((reserve + job_bytes(len(pts)), align_job,
+                     ((i, j), arrays[j][0], arrays[j][1], pts, arrays[j][2],
+                      False, point_to_plane, backend)))
+    yield from run_bounded(pool, jobs, memory_budget)
+
+
+def assign_library(results, n_segments: int, n_parts: int,
+                   min_fitness: float = 0.0):
+    """
+    `match_library` sonuçlarından bire bir atama (Macar algoritması).
+    Segment başına bir `SegmentMatch` listesi döner.
+    """
+    fitness = np.full((n_segments, n_parts), -1.0)
+    rmse = np.full((n_segments, n_parts), np.inf)
+    poses = {}
+    for (i, j), _, T, fit, err in results:
+        if T is not None:
+            fitness[i, j], rmse[i, j], poses[i, j] = fit, err, T
+    parts = assign_parts(fitness, rmse, min_fitness)
+    return [
+        SegmentMatch(i, -1, 0.0, None, None) if j < 0 else
+        SegmentMatch(i, int(j), float(fitness[i, j]), float(rmse[i, j]), poses[i, j])
+        for i, j in enumerate(parts)
+    ]
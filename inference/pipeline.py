@@ -0,0 +1,101 @@
+# ─── pipeline.py ──────────────────────────────────────────────────────────────
+"""Tek bir tarama için segmentasyon + CAD kütüphanesi eşleştirme (Qt'siz)."""
+import time
+from pathlib import Path
+
+import numpy as np
+
+from inference.cad import FACTOR, cad_key, ensure_point_cloud
+from inference.cloud_cache import load_cloud
+from inference.density import auto_params
+from inference.matching import fit_budget, job_bytes
+from inference.registration import register_part_to_segment
+from inference.segmentation import segment_cloud, to_cloud
+from inference.signature import SIZE_TOL, SignatureIndex
+
+
+def load_cad_library(cad_paths, n_pts: int, factor: float = FACTOR):
+    """{dosya adı: (ölçeklenmiş bulut, cad_key)} sözlüğü döner."""
+    library = {}
+    for path in cad_paths:
+        path = Path(path)
+        pcd = ensure_point_cloud(path, n_pts)
+        pcd.scale(factor, center=pcd.get_center())
+        library[path.name] = (pcd, cad_key(path, n_pts, factor))
+    return library
+
+
+def run_scan(scan_path, cad_paths, n_pts: int, factor: float = FACTOR,
+             size_tol=SIZE_TOL, point_to_plane: bool = False,
+             backend: str = "ransac", memory_budget=None,
+             density: bool = False, prefilter_fpfh: bool = False) -> dict:
+    """
+    Taramayı segmentlere ayırır ve her segment için kütüphanedeki en iyi
+    parçayı bulur. JSON'a yazılabilir bir sözlük döner. Kayıt yalnızca
+    imza ön elemesinden geçen parçalar için çalışır (`size_tol=None`: hepsi;
+    `prefilter_fpfh`: sıralamaya ortalama FPFH histogramı eklenir).
+    Segmentler tek tek kaydedilir; `memory_budget` (bayt) verilirse bütçeyi
+    aşan segment kayıttan önce adımlı alt örneklenir. `density=True` ise
+    segmentasyon parametreleri taramanın nokta aralığından türetilir.
+    """
+    timings = {}
+    t0 = time.perf_counter()
+    pcd = load_cloud(scan_path).to_o3d()
+    timings["load"] = time.perf_counter() - t0
+
+    t = time.perf_counter()
+    library = load_cad_library(cad_paths, n_pts, factor)
+    timings["cad"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    params = auto_params(pcd) if density else None
+    result = segment_cloud(pcd, params=params)
+    timings["segment"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    names = list(library)
+    index = (SignatureIndex([library[n][0] for n in names], size_tol,
+                            with_fpfh=prefilter_fpfh)
+             if size_tol is not None else None)
+    segments = []
+    registered = 0
+    reserve = max((job_bytes(len(p.points)) for p, _ in library.values()), default=0)
+    for i in range(len(result)):
+        seg = to_cloud(fit_budget(result.part_points(i), memory_budget, reserve))
+        aabb = seg.get_axis_aligned_bounding_box()
+        best = {"cad": None, "pose": None, "fitness": 0.0, "rmse": None}
+        best_rmse = np.inf
+        candidates = (names if index is None
+                      else [names[j] for j in index.rank(result.part_points(i))])
+        registered += len(candidates)
+        for name in candidates:
+            part, cad_key = library[name]
+            T, fit, rmse = register_part_to_segment(part, seg, cad_key,
+                                                    point_to_plane=point_to_plane,
+                                                    backend=backend)
+            if T is None:
+                continue
+            if fit > best["fitness"] or (fit == best["fitness"] and rmse < best_rmse):
+                best_rmse = rmse
+                best = {"cad": name, "pose": T.tolist(),
+                        "fitness": float(fit), "rmse": float(rmse)}
+        segments.append({
+            "index": i,
+            "n_points": int(result.sizes[i]),
+            "center": seg.get_center().tolist(),
+            "extent": aabb.get_extent().tolist(),
+            **best,
+        })
+    timings["match"] = time.perf_counter() - t
+    timings["total"] = time.perf_counter() - t0
+
+    return {
+        "scan": str(scan_path),
+        "n_points": len(pcd.points),
+        "n_ground": len(result.ground_points),
+        "factor": factor,
+        "segment_params": params._asdict() if params is not None else None,
+        "segments": segments,
+        "pairs": {"total": len(result) * len(names), "registered": registered},
+        "timings": timings,
+    }
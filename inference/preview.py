@@ -0,0 +1,54 @@
+# ─── preview.py ───────────────────────────────────────────────────────────────
+"""
+Canlı önizleme için vekil (proxy) bulut boyutlandırma.
+
+Tarama ağırlıklı olarak yüzeydir: voxel boyutu v iken nokta sayısı ~ A / v²,
+eps yarıçapındaki komşu sayısı ~ n · π eps² / A. DBSCAN maliyeti n · (1 + k)
+ile ölçeklendiğinden, ölçülen saniye/iş oranıyla zaman bütçesine sığan nokta
+sayısı ikinci dereceden denklemden bulunur.
+"""
+import math
+
+import numpy as np
+
+from inference.feature_cache import quantize_voxel
+
+MIN_PROXY_POINTS = 2_000
+
+
+def surface_area(pcd) -> float:
+    """Sınır kutusunun en büyük iki kenarının çarpımı (yüzey alanı tahmini)."""
+    ext = np.sort(np.asarray(pcd.get_max_bound()) - np.asarray(pcd.get_min_bound()))
+    return max(float(ext[1] * ext[2]), 1e-12)
+
+
+def work_units(n: int, eps: float, area: float) -> float:
+    """DBSCAN iş tahmini: n · (1 + beklenen komşu sayısı)."""
+    k = min(n, n * math.pi * eps * eps / area)
+    return n * (1.0 + k)
+
+
+def preview_points(eps: float, area: float, work_budget: float) -> int:
+    """work_units(n) = work_budget denkleminin çözümü."""
+    q = math.pi * eps * eps / area
+    if q * work_budget < 1e-9:
+        n = work_budget
+    else:
+        n = (math.sqrt(1.0 + 4.0 * q * work_budget) - 1.0) / (2.0 * q)
+    return max(MIN_PROXY_POINTS, int(n))
+
+
+def proxy_voxel(area: float, n_target: int) -> float:
+    """Yaklaşık `n_target` nokta bırakan voxel (önbellek için kuantize)."""
+    return quantize_voxel(math.sqrt(area / max(n_target, 1)))
+
+
+def scale_dbscan(eps: float, min_points: int, ratio: float, voxel: float):
+    """
+    Yoğunluğu `ratio` (vekil / tam) katına inen bulut için (eps, min_points).
+    eps vekil voxel aralığının altına inemez; büyüyen eps'in yüzey alanı da
+    min_points'e yansıtılır.
+    """
+    eps_p = max(eps, 1.5 * voxel)
+    grow = (eps_p / eps) ** 2 if eps > 0 else 1.0
+    return eps_p, max(3, int(round(min_points * ratio * grow)))
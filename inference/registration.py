@@ -0,0 +1,275 @@
+# ─── registration.py ──────────────────────────────────────────────────────────
+"""
+FPFH + RANSAC/FGR global kayıt ve çok ölçekli ICP ile parça → segment hizalama.
+
+Global kayıt iki arka uçtan biriyle yapılır: RANSAC (Open3D'nin güven
+tabanlı erken durmasıyla) ya da aynı FPFH öznitelikleri üzerinde Fast
+Global Registration.
+
+ICP tam çözünürlüklü bulutlar yerine global kaydın zaten ürettiği voxel
+bulutları üzerinde kabadan inceye (4×, 2×, 1× voxel) çalışır; her seviyede
+eşleşme mesafesi küçülür ve göreli değişim eşiğin altına inince erken
+çıkılır. İstenirse (`refine_points`) birkaç bin noktalık rastgele alt
+örneklerde son bir ince ayar yapılır; fitness/RMSE o zaman bu adımındır.
+"""
+import numpy as np
+import open3d as o3d
+
+from inference.cad import CACHE_DIR
+from inference.feature_cache import feature_cache, quantize_voxel
+from inference.tracing import span
+
+GLOBAL_BACKENDS = ("ransac", "fgr")
+RANSAC_CONFIDENCE = 0.999        # hedef güven (Open3D RANSACConvergenceCriteria)
+RANSAC_MAX_ITER = 50000          # düşük inlier oranında üst sınır
+RANSAC_N = 4
+
+ICP_LEVELS = (4.0, 2.0, 1.0)     # voxel çarpanları, kabadan inceye
+ICP_MAX_ITER = 30                # seviye başına üst sınır
+ICP_RELATIVE = 1e-6              # göreli fitness/RMSE değişimi: erken çıkış
+REFINE_POINTS = 5_000            # isteğe bağlı son ince ayarın alt örnek sınırı
+TRACK_LEVELS = (2.0, 1.0)        # izleme: önceki pozdan kısa ICP
+TRACK_MAX_ITER = 10
+
+
+def diagonal(pc: o3d.geometry.PointCloud) -> float:
+    aabb = pc.get_axis_aligned_bounding_box()
+    return np.linalg.norm(aabb.get_max_bound() - aabb.get_min_bound())
+
+def preprocess(pc: o3d.geometry.PointCloud, voxel: float):
+    with span("preprocess/downsample", len(pc.points)) as s:
+        down = pc.voxel_down_sample(voxel)
+        s.points_out = len(down.points)
+    with span("preprocess/normals", len(down.points)):
+        down.estimate_normals(
+            o3d.geometry.KDTreeSearchParamHybrid(radius=4 * voxel, max_nn=50)
+        )
+    with span("preprocess/fpfh", len(down.points)):
+        fpfh = o3d.pipelines.registration.compute_fpfh_feature(
+            down,
+            o3d.geometry.KDTreeSearchParamHybrid(radius=6 * voxel, max_nn=200),
+        )
+    return down, fpfh
+
+def global_reg(src_d, tgt_d, src_f, tgt_f, dist, backend: str = "ransac",
+               confidence: float = RANSAC_CONFIDENCE):
+    """
+    FPFH eşleşmelerinden kaba poz. RANSAC'ın erken durması Open3D'ye
+    bırakılır: `RANSACConvergenceCriteria(confidence=...)` bütçeyi o ana
+    kadarki en iyi inlier oranı w ile k = log(1 − güven) / log(1 − wⁿ)
+    iterasyona indirir; `RANSAC_MAX_ITER` yalnız üst sınırdır.
+    """
+    if backend not in GLOBAL_BACKENDS:
+        raise ValueError(f"Bilinmeyen global kayıt yöntemi: {backend}")
+    with span(f"global_reg/{backend}", len(src_d.points) + len(tgt_d.points)) as s:
+        r = _global_reg(src_d, tgt_d, src_f, tgt_f, dist, backend, confidence)
+        s.points_out = len(r.correspondence_set)
+    return r
+
+
+def _global_reg(src_d, tgt_d, src_f, tgt_f, dist, backend, confidence):
+    reg = o3d.pipelines.registration
+    if backend == "fgr":
+        return reg.registration_fgr_based_on_feature_matching(
+            src_d, tgt_d, src_f, tgt_f,
+            reg.FastGlobalRegistrationOption(maximum_correspondence_distance=dist),
+        )
+    return reg.registration_ransac_based_on_feature_matching(
+        src_d,
+        tgt_d,
+        src_f,
+        tgt_f,
+        mutual_filter=False,
+        max_correspondence_distance=dist,
+        estimation_method=reg.TransformationEstimationPointToPoint(),
+        ransac_n=RANSAC_N,
+        checkers=[
+            reg.CorrespondenceCheckerBasedOnEdgeLength(0.9),
+            reg.CorrespondenceCheckerBasedOnDistance(dist),
+        ],
+        criteria=reg.RANSACConvergenceCriteria(
+            max_iteration=RANSAC_MAX_ITER, confidence=confidence,
+        ),
+    )
+
+def _estimation(point_to_plane: bool):
+    reg = o3d.pipelines.registration
+    if point_to_plane:
+        return reg.TransformationEstimationPointToPlane()
+    return reg.TransformationEstimationPointToPoint()
+
+
+def _criteria(max_iteration: int = ICP_MAX_ITER):
+    return o3d.pipelines.registration.ICPConvergenceCriteria(
+        relative_fitness=ICP_RELATIVE, relative_rmse=ICP_RELATIVE,
+        max_iteration=max_iteration,
+    )
+
+
+def multiscale_icp(source, target, init, voxel: float,
+                   levels=ICP_LEVELS, point_to_plane: bool = False,
+                   max_iteration: int = ICP_MAX_ITER):
+    """
+    source/target: `preprocess` çıktısı (voxel boyutunda, normalli) bulutlar.
+    Her seviyede bulutlar `k · voxel` ile seyreltilir, eşleşme mesafesi de
+    `k · voxel` olur. Son seviyenin `RegistrationResult`'ını döner.
+    """
+    T, result = init, None
+    for k in levels:
+        src, tgt = source, target
+        if k > 1:
+            src = source.voxel_down_sample(k * voxel)
+            tgt = target.voxel_down_sample(k * voxel)
+            if point_to_plane:
+                tgt.normalize_normals()
+        if len(src.points) < 3 or len(tgt.points) < 3:
+            continue
+        with span(f"icp/{k:g}x", len(src.points)) as s:
+            result = o3d.pipelines.registration.registration_icp(
+                src, tgt, k * voxel, T, _estimation(point_to_plane),
+                _criteria(max_iteration),
+            )
+            s.points_out = len(result.correspondence_set)
+        T = result.transformation
+    return result
+
+
+def _subsample(pc: o3d.geometry.PointCloud, n: int, seed: int = 0):
+    if len(pc.points) <= n:
+        return pc
+    idx = np.random.default_rng(seed).choice(len(pc.points), n, replace=False)
+    return pc.select_by_index(np.sort(idx).tolist())
+
+
+def refine_icp(part, segment, init, voxel: float, max_points: int = REFINE_POINTS,
+               point_to_plane: bool = False):
+    """Sınırlı rastgele alt örneklerde tek ölçekli son ICP."""
+    src = _subsample(part, max_points)
+    tgt = _subsample(segment, max_points, seed=1)
+    if point_to_plane and not tgt.has_normals():
+        tgt = o3d.geometry.PointCloud(tgt)
+        tgt.estimate_normals(
+            o3d.geometry.KDTreeSearchParamHybrid(radius=4 * voxel, max_nn=30))
+    with span("icp/refine", len(src.points)) as s:
+        result = o3d.pipelines.registration.registration_icp(
+            src, tgt, voxel, init, _estimation(point_to_plane), _criteria(),
+        )
+        s.points_out = len(result.correspondence_set)
+    return result
+
+
+def transform_points(pts: np.ndarray, T: np.ndarray) -> np.ndarray:
+    return pts @ T[:3, :3].T + T[:3, 3]
+
+def translation(offset) -> np.ndarray:
+    T = np.eye(4)
+    T[:3, 3] = offset
+    return T
+
+def register_part_to_segment(part_orig: o3d.geometry.PointCloud,
+                             segment:   o3d.geometry.PointCloud,
+                             cad_key=None, point_to_plane: bool = False,
+                             refine_points: int = 0,
+                             backend: str = "ransac"):
+    """
+    Parçayı segmente kaydeder; (4×4 poz, fitness, rmse) döner.
+    Poz, `part_orig` koordinatlarından sahne koordinatlarına dönüşümdür.
+
+    cad_key = `cad.cad_key` çıktısı verilirse CAD tarafı öznitelikleri
+    önbellekten alınır ve voxel boyutu kuantize edilir. `point_to_plane`
+    ICP'de `preprocess` normallerini kullanır. `refine_points` > 0 ise en
+    fazla bu kadar noktalık alt örneklerde son ince ayar yapılır (örn.
+    `REFINE_POINTS`); varsayılan 0'da sonuç 1× voxel seviyesinindir. `backend`
+    global kaydı seçer: "ransac" ya da "fgr".
+    """
+    with span("register_part_to_segment", len(segment.points)):
+        return _register(part_orig, segment, cad_key, point_to_plane,
+                         refine_points, backend)
+
+def _register(part_orig, segment, cad_key, point_to_plane, refine_points, backend):
+    seg_diag = diagonal(segment)
+    if seg_diag == 0:
+        return None, 0, np.inf
+
+    # Başlangıç: parça merkezini segment merkezine taşı
+    offset = segment.get_center() - part_orig.get_center()
+
+    voxel = 0.01 * seg_diag
+    if cad_key is None:
+        src_d, src_f = preprocess(part_orig, voxel)
+    else:
+        voxel = quantize_voxel(voxel)
+        with span("register/cad_features", len(part_orig.points)):
+            src_d, src_f = feature_cache(CACHE_DIR / "features").get(
+                cad_key, voxel, lambda: preprocess(part_orig, voxel)
+            )
+    # FPFH ötelemeden bağımsız; yalnızca küçük downsample bulutun kopyası ötelenir
+    src_moved = o3d.geometry.PointCloud(src_d).translate(offset, relative=True)
+    tgt_d, tgt_f = preprocess(segment, voxel)
+
+    r = global_reg(src_moved, tgt_d, src_f, tgt_f, 1.5 * voxel, backend)
+    init = r.transformation @ translation(offset)
+    icp = multiscale_icp(src_d, tgt_d, init, voxel, point_to_plane=point_to_plane)
+    if icp is None:
+        return None, 0, np.inf
+    if refine_points:
+        icp = refine_icp(part_orig, segment, icp.transformation, voxel,
+                         refine_points, point_to_plane)
+    return icp.transformation, icp.fitness, icp.inlier_rmse
+
+def track_part_to_segment(part_orig: o3d.geometry.PointCloud,
+                          segment:   o3d.geometry.PointCloud,
+                          init: np.ndarray, cad_key=None,
+                          point_to_plane: bool = False,
+                          max_iteration: int = TRACK_MAX_ITER):
+    """
+    Önceki karenin pozundan (`init`) başlayan kısa ICP; FPFH ve global kayıt
+    yapılmaz. (4×4 poz, fitness, rmse) döner; `register_part_to_segment`
+    ile aynı poz ve voxel tanımlarını kullanır.
+    """
+    with span("track_part_to_segment", len(segment.points)):
+        return _track(part_orig, segment, init, cad_key, point_to_plane,
+                      max_iteration)
+
+def _track(part_orig, segment, init, cad_key, point_to_plane, max_iteration):
+    seg_diag = diagonal(segment)
+    if seg_diag == 0:
+        return None, 0, np.inf
+
+    voxel = 0.01 * seg_diag
+    if cad_key is None:
+        src_d = part_orig.voxel_down_sample(voxel)
+    else:
+        voxel = quantize_voxel(voxel)
+        src_d, _ = feature_cache(CACHE_DIR / "features").get(
+            cad_key, voxel, lambda: preprocess(part_orig, voxel)
+        )
+    tgt_d = segment.voxel_down_sample(voxel)
+    if point_to_plane:
+        tgt_d.estimate_normals(
+            o3d.geometry.KDTreeSearchParamHybrid(radius=4 * voxel, max_nn=50))
+    icp = multiscale_icp(src_d, tgt_d, init, voxel, TRACK_LEVELS,
+                         point_to_plane, max_iteration)
+    if icp is None:
+        return None, 0, np.inf
+    return icp.transformation, icp.fitness, icp.inlier_rmse
+
+def align_part_to_segment(part_orig: o3d.geometry.PointCloud,
+                          segment:   o3d.geometry.PointCloud,
+                          cad_key=None, **icp_options):
+    """
+    Hizalanmış parça bulutunu, fitness ve rmse ile döner. Bulut kopyalanıp
+    dönüştürülmez: noktalar (ve varsa normaller) pozdan tek geçişte üretilir.
+    """
+    with span("align_part_to_segment", len(segment.points)) as s:
+        T, fit, rmse = register_part_to_segment(part_orig, segment, cad_key,
+                                                **icp_options)
+        if T is None:
+            return None, fit, rmse
+        part_aligned = o3d.geometry.PointCloud(o3d.utility.Vector3dVector(
+            transform_points(np.asarray(part_orig.points), T)))
+        if part_orig.has_normals():
+            part_aligned.normals = o3d.utility.Vector3dVector(
+                np.asarray(part_orig.normals) @ T[:3, :3].T)
+        s.points_out = len(part_aligned.points)
+    return part_aligned, fit, rmse
@@ -0,0 +1,226 @@
+# ─── segmentation.py ──────────────────────────────────────────────────────────
+"""Zemin düzlemi (RANSAC) + iki aşamalı DBSCAN ile parça segmentasyonu."""
+from collections import namedtuple
+
+import numpy as np
+import open3d as o3d
+
+from inference.stage_cache import StageCache, cloud_digest
+from inference.tracing import span
+
+# Segmentasyon parametreleri (gerekirse düzenleyin)
+VOXEL_SZ  = 0.002
+PLANE_EPS = 0.422
+DB_EPS_1, DB_PTS_1 = 0.025, 120
+DB_EPS_2, DB_PTS_2 = 0.015, 20
+
+# segment_cloud parametreleri; bulut yoğunluğundan türetmek için bkz. density.py
+SegmentParams = namedtuple("SegmentParams", "voxel plane_eps eps_1 pts_1 eps_2 pts_2")
+DEFAULT_PARAMS = SegmentParams(VOXEL_SZ, PLANE_EPS, DB_EPS_1, DB_PTS_1, DB_EPS_2, DB_PTS_2)
+
+# Parça olmayan etiketler; sıralamada gürültü < zemin < parçalar
+NOISE, GROUND = -2, -1
+
+
+def to_cloud(pts: np.ndarray) -> o3d.geometry.PointCloud:
+    return o3d.geometry.PointCloud(
+        o3d.utility.Vector3dVector(np.asarray(pts, dtype=np.float64)))
+
+
+class SegmentationResult:
+    """
+    Segmentasyonun sıkıştırılmış gösterimi.
+
+    `points` (float32) ve `labels` etikete göre (tek bir argsort ile)
+    sıralanmıştır; `offsets` CSR tarzı sınırlardır: i. parça
+    `points[offsets[i]:offsets[i+1]]`. Parçalar ortak dizinin görünümleridir;
+    çizim ve eşleştirme bu görünümleri kopyalamadan kullanır, Open3D bulutu
+    (float64) yalnızca `part_cloud()` çağrıldığında oluşturulur.
+    """
+
+    def __init__(self, points: np.ndarray, labels: np.ndarray):
+        labels = np.asarray(labels, dtype=np.int32)
+        self.order = np.argsort(labels, kind="stable")
+        self.labels = labels[self.order]
+        self.points = np.asarray(points, dtype=np.float32)[self.order]
+        n_parts = int(self.labels[-1]) + 1 if len(self.labels) else 0
+        n_parts = max(n_parts, 0)
+        bounds = np.searchsorted(self.labels, np.arange(GROUND, n_parts + 1))
+        self.ground_start = int(bounds[0])
+        self.offsets = bounds[1:]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def ground_points(self) -> np.ndarray:
+        return self.points[self.ground_start:self.offsets[0]]
+
+    def part_points(self, i: int) -> np.ndarray:
+        return self.points[self.offsets[i]:self.offsets[i + 1]]
+
+    def part_indices(self, i: int) -> np.ndarray:
+        """i. parçanın downsample buluttaki indisleri."""
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+    def part_cloud(self, i: int) -> o3d.geometry.PointCloud:
+        return to_cloud(self.part_points(i))
+
+    def ground_cloud(self) -> o3d.geometry.PointCloud:
+        return to_cloud(self.ground_points)
+
+    def iter_part_points(self):
+        for i in range(len(self)):
+            yield self.part_points(i)
+
+
+class PlaneTracker:
+    """
+    Ardışık karelerde zemin düzlemini izler. Önceki model yeni karede
+    vektörel bir mesafe testiyle denenir; inlier oranı son tam RANSAC'taki
+    oranın `min_ratio` katının üstündeyse model inlier'larla ucuzca yeniden
+    oturtulur, değilse tam RANSAC'a düşülür.
+    """
+
+    REFIT_MAX_POINTS = 50_000
+
+    def __init__(self, distance_threshold: float = PLANE_EPS,
+                 num_iterations: int = 5000, min_ratio: float = 0.9):
+        self.distance_threshold = distance_threshold
+        self.num_iterations = num_iterations
+        self.min_ratio = min_ratio
+        self.reset()
+
+    def reset(self):
+        self.model = None
+        self.ratio = 0.0
+        self.warm = self.full = 0
+
+    def _inliers(self, pts: np.ndarray, model: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(
+            np.abs(pts @ model[:3] + model[3]) <= self.distance_threshold
+        )
+
+    def _refit(self, pts: np.ndarray) -> np.ndarray:
+        """En küçük kareler düzlemi; normal önceki modelle aynı yöne bakar."""
+        step = max(1, len(pts) // self.REFIT_MAX_POINTS)
+        sub = pts[::step]
+        c = sub.mean(axis=0)
+        _, vecs = np.linalg.eigh((sub - c).T @ (sub - c))
+        n = vecs[:, 0]
+        if n @ self.model[:3] < 0:
+            n = -n
+        return np.append(n, -n @ c)
+
+    def segment(self, pcd: o3d.geometry.PointCloud):
+        """(düzlem modeli [a, b, c, d], inlier indisleri) döner."""
+        pts = np.asarray(pcd.points)
+        n = max(len(pts), 1)
+        if self.model is not None:
+            inliers = self._inliers(pts, self.model)
+            if inliers.size / n >= self.min_ratio * self.ratio:
+                self.model = self._refit(pts[inliers])
+                self.warm += 1
+                return self.model, self._inliers(pts, self.model)
+
+        model, inliers = pcd.segment_plane(
+            distance_threshold=self.distance_threshold,
+            ransac_n=3,
+            num_iterations=self.num_iterations,
+        )
+        model = np.asarray(model, dtype=np.float64)
+        self.model = model / np.linalg.norm(model[:3])
+        inliers = np.asarray(inliers, dtype=np.int64)
+        self.ratio = inliers.size / n
+        self.full += 1
+        return self.model, inliers
+
+
+def _uncached(prev_key, name, params, compute):
+    return compute(), None
+
+
+def _cluster(pts: np.ndarray, inliers: np.ndarray,
+             p: SegmentParams = DEFAULT_PARAMS) -> SegmentationResult:
+    """Zemin dışı noktalarda iki aşamalı DBSCAN."""
+    labels = np.full(len(pts), NOISE, dtype=np.int32)
+    labels[inliers] = GROUND
+    obj_idx = np.flatnonzero(labels != GROUND)
+    if obj_idx.size == 0:
+        return SegmentationResult(pts, labels)
+
+    lbl1 = np.asarray(to_cloud(pts[obj_idx]).cluster_dbscan(
+        eps=p.eps_1, min_points=p.pts_1, print_progress=False), dtype=np.int32)
+
+    # 1. aşama kümeleri tek argsort ile gruplanır
+    order1 = np.argsort(lbl1, kind="stable")
+    bounds = np.searchsorted(lbl1[order1], np.arange(lbl1.max() + 2))
+    next_label = 0
+    for l1 in range(lbl1.max() + 1):
+        idx = obj_idx[order1[bounds[l1]:bounds[l1 + 1]]]
+        lbl2 = np.asarray(to_cloud(pts[idx]).cluster_dbscan(
+            eps=p.eps_2, min_points=p.pts_2, print_progress=False), dtype=np.int32)
+        keep = lbl2 >= 0
+        labels[idx[keep]] = lbl2[keep] + next_label
+        next_label += int(lbl2.max()) + 1
+
+    return SegmentationResult(pts, labels)
+
+
+def segment_cloud(pcd: o3d.geometry.PointCloud,
+                  plane_tracker: PlaneTracker = None,
+                  cache: StageCache = None,
+                  params: SegmentParams = None) -> SegmentationResult:
+    """
+    `plane_tracker` verilirse zemin düzlemi önceki karelerden sıcak başlatılır
+    (sürekli akışta); verilmezse her seferinde tam RANSAC çalışır.
+
+    `params` verilmezse modül sabitleri kullanılır. Verilirse takipçinin
+    düzlem eşiği de `params.plane_eps` olur.
+
+    `cache` verilirse aşama sonuçları girdi özeti + parametre zinciriyle
+    saklanır; düzlem aşaması önbellekten gelirse takipçi güncellenmez.
+    """
+    p = params or DEFAULT_PARAMS
+    if params is not None and plane_tracker is not None:
+        plane_tracker.distance_threshold = p.plane_eps
+    run = cache.stage if cache is not None else _uncached
+    root = cloud_digest(pcd) if cache is not None else None
+
+    # voxel <= 0: önbelleğe çağıranın bulutu değil kopyası girer (yerinde
+    # değişiklikler eski özetle saklanan kaydı bozmasın)
+    with span("segment_cloud/downsample", len(pcd.points)) as s:
+        down, key = run(root, "downsample", (p.voxel,),
+                        lambda: pcd.voxel_down_sample(p.voxel)
+                        if p.voxel > 0 else o3d.geometry.PointCloud(pcd))
+        s.points_out = len(down.points)
+    with span("segment_cloud/outliers", len(down.points)) as s:
+        pcd_ds, key = run(key, "outliers", (30, 2.0),
+                          lambda: down.remove_statistical_outlier(
+                              nb_neighbors=30, std_ratio=2.0)[0])
+        s.points_out = len(pcd_ds.points)
+    pts = np.asarray(pcd_ds.points)
+
+    def plane():
+        if plane_tracker is not None:
+            return np.asarray(plane_tracker.segment(pcd_ds)[1], dtype=np.int64)
+        return np.asarray(pcd_ds.segment_plane(
+            distance_threshold=p.plane_eps, ransac_n=3, num_iterations=5000
+        )[1], dtype=np.int64)
+
+    if plane_tracker is not None:
+        plane_params = (plane_tracker.distance_threshold, 3, plane_tracker.num_iterations)
+    else:
+        plane_params = (p.plane_eps, 3, 5000)
+    with span("segment_cloud/plane", len(pts)) as s:
+        inliers, key = run(key, "plane", plane_params, plane)
+        s.points_out = len(inliers)
+    with span("segment_cloud/clustering", len(pts) - len(inliers)) as s:
+        result, _ = run(key, "clustering", p[2:],
+                        lambda: _cluster(pts, inliers, p))
+        s.points_out = int(result.sizes.sum())
+    return result
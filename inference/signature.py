@@ -0,0 +1,136 @@
+# ─── signature.py ─────────────────────────────────────────────────────────────
+"""
+Segment–parça çiftlerini RANSAC'tan önce elemek için ucuz global tanımlayıcılar.
+
+Her bulut için dönmeden bağımsız bir imza çıkarılır: PCA eksenlerindeki
+boyutlar (büyükten küçüğe), bunların köşegeni, merkeze uzaklıkların
+köşegene göre normalize histogramı ve istenirse ortalama FPFH histogramı.
+Segment tek yönden görülen kısmi bir yüzey olabileceğinden boyut testi
+tek yönlüdür: segment hiçbir eksende parçadan belirgin biçimde büyük
+olamaz, en büyük boyutu da parçanınkinin küçük bir kesrinin altına inemez.
+
+Yoğunluk histogramı (komşu sayısı / nokta aralığı) yerine radyal histogram
+kullanılır: CAD örneklemesi ile tarama yoğunluğu birbirinden bağımsız
+olduğundan yoğunluk tanımlayıcısı şekli değil örneklemeyi ölçer; radyal
+dağılım ise kNN gerektirmez ve ölçekten bağımsızdır. Kısmi görünümde
+merkez ve köşegen kaydığından radyal fark yalnız segment parçanın büyük
+kısmını kaplıyorsa (`RADIAL_COVER`) skora eklenir.
+"""
+from collections import namedtuple
+
+import numpy as np
+import open3d as o3d
+
+SIZE_TOL = 0.25          # segment bir eksende parçadan en fazla bu oranda büyük
+MIN_COVER = 0.3          # segmentin en büyük boyutu / parçanınki alt sınırı
+RADIAL_COVER = 0.8       # radyal histogramın skora girdiği kaplama oranı
+HIST_BINS = 16
+MAX_POINTS = 20_000      # imza için alt örnekleme sınırı
+FPFH_VOXEL = 0.03        # FPFH voxel'i, bulutun kendi köşegenine oranla
+
+Signature = namedtuple("Signature", "extents diagonal radial fpfh")
+
+
+def _points(cloud) -> np.ndarray:
+    if isinstance(cloud, o3d.geometry.PointCloud):
+        return np.asarray(cloud.points)
+    return np.asarray(cloud)
+
+
+def signature(cloud, with_fpfh: bool = False) -> Signature:
+    """Bulut (ya da (N, 3) dizi) için `Signature`."""
+    pts = _points(cloud)
+    if len(pts) > MAX_POINTS:
+        pts = pts[::len(pts) // MAX_POINTS + 1]
+    pts = np.asarray(pts, dtype=np.float64)
+    if len(pts) < 3:
+        return Signature(np.zeros(3), 0.0, np.zeros(HIST_BINS), None)
+
+    X = pts - pts.mean(axis=0)
+    _, axes = np.linalg.eigh(X.T @ X)
+    proj = X @ axes
+    extents = np.sort(proj.max(axis=0) - proj.min(axis=0))[::-1]
+    diag = float(np.linalg.norm(extents))
+
+    r = np.linalg.norm(X, axis=1) / max(diag, 1e-12)
+    radial = np.histogram(r, bins=HIST_BINS, range=(0.0, 1.0))[0] / len(r)
+
+    fpfh = None
+    if with_fpfh and diag > 0:
+        voxel = FPFH_VOXEL * diag
+        down = o3d.geometry.PointCloud(o3d.utility.Vector3dVector(pts))
+        down = down.voxel_down_sample(voxel)
+        down.estimate_normals(
+            o3d.geometry.KDTreeSearchParamHybrid(radius=4 * voxel, max_nn=30))
+        f = np.asarray(o3d.pipelines.registration.compute_fpfh_feature(
+            down, o3d.geometry.KDTreeSearchParamHybrid(radius=6 * voxel, max_nn=100)
+        ).data)
+        if f.size:
+            fpfh = f.mean(axis=1)
+            fpfh /= max(fpfh.sum(), 1e-12)
+    return Signature(extents, diag, radial, fpfh)
+
+
+class SignatureIndex:
+    """
+    Parça imzalarının yığılmış dizileri; bir segment tüm parçalarla tek
+    vektörel işlemde karşılaştırılır.
+    """
+
+    def __init__(self, clouds, size_tol: float = SIZE_TOL,
+                 min_cover: float = MIN_COVER, with_fpfh: bool = False):
+        self.size_tol = size_tol
+        self.min_cover = min_cover
+        self.with_fpfh = with_fpfh
+        sigs = [signature(c, with_fpfh) for c in clouds]
+        self.extents = np.array([s.extents for s in sigs]).reshape(-1, 3)
+        self.radial = np.array([s.radial for s in sigs]).reshape(-1, HIST_BINS)
+        self.fpfh = (np.array([s.fpfh for s in sigs])
+                     if with_fpfh and sigs and all(s.fpfh is not None for s in sigs)
+                     else None)
+
+    def __len__(self):
+        return len(self.extents)
+
+    def scores(self, seg: Signature):
+        """
+        (uygun maskesi, skor) — skor küçükse parça daha olası. Skor boyut
+        oranlarının log farkı, radyal histogram (yalnız kaplama yeterliyse)
+        ve (varsa) FPFH L1 farkıdır.
+        """
+        ratio = seg.extents / np.maximum(self.extents, 1e-12)
+        ok = (ratio <= 1.0 + self.size_tol).all(axis=1) & (ratio[:, 0] >= self.min_cover)
+        score = np.abs(np.log(np.maximum(ratio[:, :2], 1e-12))).sum(axis=1)
+        covered = ratio[:, 0] >= RADIAL_COVER
+        score += 0.5 * covered * np.abs(self.radial - seg.radial).sum(axis=1)
+        if self.fpfh is not None and seg.fpfh is not None:
+            score += np.abs(self.fpfh - seg.fpfh).sum(axis=1)
+        return ok, score
+
+    def rank(self, segment):
+        """Segment için uygun parça indisleri, en olasıdan başlayarak."""
+        seg = segment if isinstance(segment, Signature) else signature(segment, self.with_fpfh)
+        ok, score = self.scores(seg)
+        idx = np.nonzero(ok)[0]
+        return idx[np.argsort(score[idx], kind="stable")]
+
+
+def candidate_pairs(parts, segments, size_tol: float = SIZE_TOL,
+                    with_fpfh: bool = False):
+    """
+    Kayıt edilecek (segment, parça) çiftleri ve elenenler: ([(i, j)], [(i, j)]).
+    Uygun çiftler segment içinde olasılık sırasıyla gelir; `size_tol=None`
+    ön elemeyi kapatır (tüm çiftler, kütüphane sırasıyla). `with_fpfh`
+    sıralamaya ortalama FPFH histogram farkını ekler.
+    """
+    n_parts = len(parts)
+    if size_tol is None:
+        return [(i, j) for i in range(len(segments)) for j in range(n_parts)], []
+    index = SignatureIndex(parts, size_tol, with_fpfh=with_fpfh)
+    keep, reject = [], []
+    for i, seg in enumerate(segments):
+        ranked = index.rank(seg)
+        keep += [(i, int(j)) for j in ranked]
+        chosen = set(ranked.tolist())
+        reject += [(i, j) for j in range(n_parts) if j not in chosen]
+    return keep, reject
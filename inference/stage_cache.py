@@ -0,0 +1,102 @@
+# ─── stage_cache.py ───────────────────────────────────────────────────────────
+"""
+Segmentasyon aşamaları için bellek sınırlı sonuç önbelleği.
+
+Her aşamanın anahtarı bir zincirdir: (önceki anahtar, aşama adı, parametreler).
+Kök, girdi bulutunun içerik özetidir; böylece bir parametre değişince yalnız
+o aşama ve sonrakiler yeniden hesaplanır, öncekiler önbellekten gelir.
+Önbellekteki değerler paylaşılır; çağıranlar bunları değiştirmemelidir.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import open3d as o3d
+
+
+def cloud_digest(pcd) -> tuple:
+    """Bulut (ya da (N, 3) dizi) içeriğinin kök anahtarı."""
+    pts = np.ascontiguousarray(
+        np.asarray(pcd.points if isinstance(pcd, o3d.geometry.PointCloud) else pcd)
+    )
+    h = hashlib.blake2b(pts.view(np.uint8), digest_size=16)
+    return ("cloud", pts.shape, h.hexdigest())
+
+
+def _sizeof(value) -> int:
+    """Değerin kabaca bellek ayak izi (bayt)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, o3d.geometry.PointCloud):
+        arrays = 1 + value.has_colors() + value.has_normals()
+        return len(value.points) * 24 * arrays
+    if isinstance(value, (tuple, list)):
+        return sum(_sizeof(v) for v in value)
+    if hasattr(value, "__dict__"):
+        return sum(_sizeof(v) for v in vars(value).values())
+    return 64
+
+
+class StageCache:
+    """Toplam boyutu `max_bytes` ile sınırlı LRU; thread güvenli."""
+
+    def __init__(self, max_bytes: int = 512 << 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        self._items = OrderedDict()          # anahtar -> (değer, boyut)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def stage(self, prev_key, name: str, params: tuple, compute):
+        """
+        (değer, anahtar) döner. Değer önbellekte yoksa `compute()` ile
+        hesaplanıp saklanır; dönen anahtar bir sonraki aşamaya verilir.
+        """
+        key = (prev_key, name, params)
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0], key
+        value = compute()
+        size = _sizeof(value)
+        with self._lock:
+            self.misses += 1
+            if size <= self.max_bytes and key not in self._items:
+                self._items[key] = (value, size)
+                self.nbytes += size
+                self._trim()
+        return value, key
+
+    def resize(self, max_bytes: int):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._trim()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def _trim(self):
+        while self.nbytes > self.max_bytes and self._items:
+            _, (_, size) = self._items.popitem(last=False)
+            self.nbytes -= size
+
+
+_CACHE = None
+
+
+def stage_cache(max_bytes: int = None) -> StageCache:
+    """Süreç başına tek önbellek; `max_bytes` verilirse sınır güncellenir."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = StageCache()
+    if max_bytes is not None:
+        _CACHE.resize(max_bytes)
+    return _CACHE
@@ -0,0 +1,151 @@
+# ─── stream.py ────────────────────────────────────────────────────────────────
+"""
+Kamera akışını segmentasyon (ve isteğe bağlı eşleştirme) hattına bağlar;
+sürekli işlem hızı ve uçtan uca gecikmeyi ölçer.
+
+    python -m inference.stream dataset/screen --fps 10 --seconds 30
+"""
+import argparse
+import json
+import sys
+import time
+from collections import deque
+
+import numpy as np
+import open3d as o3d
+
+from inference.camera import SimulatedCamera
+from inference.cad import FACTOR
+from inference.density import auto_params
+from inference.pipeline import load_cad_library
+from inference.registration import GLOBAL_BACKENDS, register_part_to_segment
+from inference.segmentation import PlaneTracker, segment_cloud
+from inference.signature import SignatureIndex
+from inference.tracking import PoseTracker
+
+
+class StreamStats:
+    """İşlenen kare sayısı, hız ve kayan pencerede gecikme istatistikleri."""
+
+    def __init__(self, window: int = 100):
+        self.latencies = deque(maxlen=window)
+        self.processed = 0
+        self.t_start = time.perf_counter()
+
+    def record(self, frame, t_done: float):
+        self.latencies.append(t_done - frame.timestamp)
+        self.processed += 1
+
+    def summary(self, source=None) -> dict:
+        elapsed = time.perf_counter() - self.t_start
+        lat = np.asarray(self.latencies) * 1e3
+        res = {
+            "processed": self.processed,
+            "fps": self.processed / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {
+                "mean": float(lat.mean()) if lat.size else 0.0,
+                "p50": float(np.percentile(lat, 50)) if lat.size else 0.0,
+                "p95": float(np.percentile(lat, 95)) if lat.size else 0.0,
+                "max": float(lat.max()) if lat.size else 0.0,
+            },
+        }
+        if source is not None:
+            res["captured"] = source.captured
+            res["dropped"] = source.frames.dropped
+        return res
+
+
+def run_stream(source, process, stats=None, should_stop=None,
+               on_result=None, duration: float = None):
+    """
+    Kaynaktan en yeni kareyi alıp `process(cloud)` ile işler; kaynak bitene,
+    `should_stop()` True olana ya da süre dolana kadar devam eder.
+    """
+    stats = stats or StreamStats()
+    t_end = time.perf_counter() + duration if duration else None
+    while not (should_stop and should_stop()):
+        if t_end is not None and time.perf_counter() >= t_end:
+            break
+        frame = source.frames.get_latest(timeout=0.5)
+        if frame is None:
+            if not source.running:
+                break
+            continue
+        out = process(frame.cloud)
+        stats.record(frame, time.perf_counter())
+        if on_result is not None:
+            on_result(frame, out)
+    return stats
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m inference.stream")
+    ap.add_argument("directory", help="yeniden oynatılacak PLY kareleri")
+    ap.add_argument("--fps", type=float, default=10.0)
+    ap.add_argument("--seconds", type=float, default=30.0)
+    ap.add_argument("--queue", type=int, default=4, help="kare kuyruğu boyutu")
+    ap.add_argument("--preload", action="store_true",
+                    help="kareleri belleğe önceden yükle (disk okuması ölçülmez)")
+    ap.add_argument("--cad", nargs="*", default=[],
+                    help="her segmenti bu CAD dosyalarıyla da eşleştir")
+    ap.add_argument("--cad-points", type=int, default=10000)
+    ap.add_argument("--global-reg", choices=GLOBAL_BACKENDS, default="ransac",
+                    help="eşleştirmede global kayıt yöntemi")
+    ap.add_argument("--track", action="store_true",
+                    help="poz izleme: izlenen segmentlerde yalnız önceki pozdan kısa ICP")
+    ap.add_argument("--track-min-fitness", type=float, default=0.5,
+                    help="bu fitness'ın altında tam global kayda dönülür")
+    ap.add_argument("--no-plane-tracking", action="store_true",
+                    help="her karede zemin düzlemi için tam RANSAC çalıştır")
+    ap.add_argument("--auto-params", action="store_true",
+                    help="segmentasyon parametrelerini ilk karenin nokta "
+                         "aralığından türet (sabit sensör)")
+    args = ap.parse_args(argv)
+
+    o3d.utility.set_verbosity_level(o3d.utility.VerbosityLevel.Error)
+    library = load_cad_library(args.cad, args.cad_points, FACTOR)
+    parts = list(library.values())
+    index = SignatureIndex([p for p, _ in parts])
+    tracker = None if args.no_plane_tracking else PlaneTracker()
+    poses = (PoseTracker(parts, args.track_min_fitness, backend=args.global_reg)
+             if args.track and library else None)
+
+    params = []
+
+    def process(cloud):
+        if args.auto_params and not params:
+            params.append(auto_params(cloud))
+        result = segment_cloud(cloud, tracker, params=params[0] if params else None)
+        if poses is not None:
+            poses.update(result)
+            return result
+        for i in range(len(result)) if library else ():
+            seg = result.part_cloud(i)
+            for j in index.rank(result.part_points(i)):
+                part, cad_key = parts[j]
+                register_part_to_segment(part, seg, cad_key,
+                                         backend=args.global_reg)
+        return result
+
+    cam = SimulatedCamera(args.directory, args.fps, loop=True,
+                          preload=args.preload, queue_size=args.queue)
+    if not cam.open():
+        print(f"PLY karesi bulunamadı: {args.directory}", file=sys.stderr)
+        return 2
+    cam.start()
+    try:
+        stats = run_stream(cam, process, duration=args.seconds)
+    finally:
+        cam.stop()
+    summary = stats.summary(cam)
+    if tracker is not None:
+        summary["plane"] = {"warm": tracker.warm, "full": tracker.full}
+    if poses is not None:
+        summary["pose"] = {"warm": poses.warm, "full": poses.full,
+                           "tracks": len(poses.tracks)}
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# ─── tracing.py ───────────────────────────────────────────────────────────────
+"""
+Hat aşamaları için hafif izleme aralıkları (span).
+
+    with span("preprocess/fpfh", len(down.points)) as s:
+        ...
+        s.points_out = len(out.points)
+
+Her aralık duvar süresi, süreç CPU süresi (Open3D iş parçacıkları dahil),
+giren/çıkan nokta sayısı ve RSS farkını kaydeder. Kayıtlar Chrome trace
+JSON'u olarak (`chrome://tracing`, Perfetto) yazılabilir ya da aşama başına
+özetlenebilir. İzleme kapalıyken `span()` paylaşılan boş bir nesne döner;
+maliyet tek bir bayrak okumasıdır.
+
+Süreç havuzuna `submit()` ile gönderilen işler kendi kayıtlarını sonuçla
+birlikte döndürür; `result()` bunları ana sürecin tamponuna ekler.
+"""
+import json
+import os
+import platform
+import threading
+import time
+from collections import deque, namedtuple
+
+try:
+    import resource
+except ImportError:              # Windows
+    resource = None
+
+MAX_EVENTS = 100_000             # en eski kayıtlar düşer
+
+# ts/dur: mikrosaniye (perf_counter, süreçler arası aynı saat); cpu: ms; rss: bayt
+SpanEvent = namedtuple("SpanEvent",
+                       "name ts dur cpu points_in points_out rss pid tid")
+
+_enabled = False
+_events = deque(maxlen=MAX_EVENTS)
+
+
+def current_rss() -> int:
+    """Süreç RSS değeri (bayt)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if resource is not None:
+        # ru_maxrss: Linux'ta KB, macOS'ta bayt
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if platform.system() == "Darwin" else rss * 1024
+    return 0
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def clear():
+    _events.clear()
+
+
+def events():
+    """Kaydedilmiş aralıkların kopyası (bitiş sırasıyla)."""
+    return list(_events)
+
+
+def collect():
+    """Kayıtları döner ve tamponu boşaltır (süreç havuzu işleri için)."""
+    out = list(_events)
+    _events.clear()
+    return out
+
+
+def merge(evts):
+    """Başka bir süreçten gelen kayıtları ekler."""
+    _events.extend(SpanEvent(*e) for e in evts or ())
+
+
+def run_traced(parent_pid: int, fn, *args):
+    """
+    Süreç havuzunda `fn(*args)`'ı izleme açıkken çalıştırır; (sonuç, kayıtlar)
+    döner. Aynı süreçte çalışıyorsa kayıtlar zaten ortak tampondadır.
+    """
+    if os.getpid() == parent_pid:
+        return fn(*args), ()
+    prev = _enabled
+    enable(True)
+    try:
+        return fn(*args), collect()
+    finally:
+        enable(prev)
+
+
+def submit(pool, fn, *args):
+    """
+    `pool.submit` gibi; izleme açıksa iş `run_traced` ile sarılır. Sonuç
+    `result()` ile alınmalıdır (kayıtlar ana sürecin tamponuna eklenir).
+    """
+    if not _enabled:
+        return pool.submit(fn, *args)
+    fut = pool.submit(run_traced, os.getpid(), fn, *args)
+    fut.traced = True
+    return fut
+
+
+def result(fut):
+    """`submit` future'ının sonucu; taşınan kayıtlar birleştirilir."""
+    res = fut.result()
+    if getattr(fut, "traced", False):
+        res, evts = res
+        merge(evts)
+    return res
+
+
+class Span:
+    """Tek bir aşamanın ölçümü; `end()` ya da `with` bloğu sonunda kaydedilir."""
+
+    __slots__ = ("name", "points_in", "points_out", "_t0", "_cpu0", "_rss0")
+
+    def __init__(self, name: str, points_in=None):
+        self.name = name
+        self.points_in = points_in
+        self.points_out = None
+        self._rss0 = current_rss()
+        self._cpu0 = time.process_time()
+        self._t0 = time.perf_counter()
+
+    def end(self, points_out=None):
+        t1 = time.perf_counter()
+        if points_out is not None:
+            self.points_out = points_out
+        _events.append(SpanEvent(
+            self.name, self._t0 * 1e6, (t1 - self._t0) * 1e6,
+            (time.process_time() - self._cpu0) * 1e3,
+            self.points_in, self.points_out, current_rss() - self._rss0,
+            os.getpid(), threading.get_ident(),
+        ))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.end()
+
+
+class _NullSpan:
+    """İzleme kapalıyken dönen, hiçbir şey kaydetmeyen aralık."""
+
+    __slots__ = ()
+    points_in = points_out = None
+
+    def __setattr__(self, name, value):
+        pass
+
+    def end(self, points_out=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+def span(name: str, points_in=None):
+    """İzleme açıksa yeni bir `Span`, değilse paylaşılan boş aralık."""
+    if not _enabled:
+        return _NULL
+    return Span(name, points_in)
+
+
+def summary(evts=None) -> dict:
+    """
+    Aşama adına göre toplamlar: {ad: {count, wall_ms, cpu_ms, points_in,
+    points_out, rss_mb}}; nokta sayıları son kaydın değerleridir.
+    """
+    out = {}
+    for e in _events if evts is None else evts:
+        s = out.setdefault(e.name, {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0,
+                                    "points_in": None, "points_out": None,
+                                    "rss_mb": 0.0})
+        s["count"] += 1
+        s["wall_ms"] += e.dur / 1e3
+        s["cpu_ms"] += e.cpu
+        s["rss_mb"] += e.rss / 2**20
+        if e.points_in is not None:
+            s["points_in"] = e.points_in
+        if e.points_out is not None:
+            s["points_out"] = e.points_out
+    return out
+
+
+def chrome_trace(evts=None) -> dict:
+    """Chrome trace biçimi ("X" tam olaylar, mikrosaniye)."""
+    trace = []
+    for e in _events if evts is None else evts:
+        args = {"cpu_ms": round(e.cpu, 3), "rss_delta_mb": round(e.rss / 2**20, 3)}
+        if e.points_in is not None:
+            args["points_in"] = e.points_in
+        if e.points_out is not None:
+            args["points_out"] = e.points_out
+        trace.append({"name": e.name, "cat": e.name.split("/", 1)[0], "ph": "X",
+                      "ts": e.ts, "dur": e.dur, "pid": e.pid, "tid": e.tid,
+                      "args": args})
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def export_chrome(path, evts=None):
+    with open(path, "w") as f:
+        json.dump(chrome_trace(evts), f)
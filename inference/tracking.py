@@ -0,0 +1,166 @@
+# ─── tracking.py ──────────────────────────────────────────────────────────────
+"""
+Ardışık karelerde parça pozlarının izlenmesi.
+
+Her iz son kabul edilen pozu, segmentin merkezini ve PCA boyutlarını tutar.
+Yeni karenin segmentleri izlere merkez uzaklığı ve boyut benzerliğiyle
+bire bir atanır; atanan segmentte yalnız önceki pozdan kısa bir ICP
+çalışır. Tam FPFH + global kayıt yalnız yeni izlerde ya da fitness
+`min_fitness` altına düştüğünde yapılır.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from inference.assignment import INVALID_COST, linear_assignment
+from inference.registration import (
+    register_part_to_segment, track_part_to_segment, translation,
+)
+from inference.segmentation import to_cloud
+from inference.signature import SIZE_TOL, SignatureIndex, signature
+
+# Karedeki segment başına sonuç (part: kütüphane indisi, warm: global kayıt atlandı)
+TrackMatch = namedtuple("TrackMatch", "segment track part fitness rmse pose warm")
+
+
+class Track:
+    """Tek bir segmentin izi: atanmış parça, son poz ve konum/boyut özeti."""
+
+    __slots__ = ("id", "part", "pose", "center", "extents", "fitness", "rmse", "missed")
+
+    def __init__(self, track_id, part, pose, center, extents, fitness, rmse):
+        self.id = track_id
+        self.part = part
+        self.pose = pose
+        self.center = center
+        self.extents = extents
+        self.fitness = fitness
+        self.rmse = rmse
+        self.missed = 0
+
+
+class PoseTracker:
+    """
+    parts: `[(PointCloud, cad_key)]` — `load_cad_library` değerleri gibi.
+
+    `max_shift` kareler arası merkez kaymasının iz köşegenine oranı,
+    `extent_tol` PCA boyutlarındaki göreli fark sınırıdır. `max_missed`
+    kare boyunca görülmeyen iz silinir. `size_tol=None` yeni izlerde imza
+    ön elemesini kapatır.
+    """
+
+    def __init__(self, parts, min_fitness: float = 0.5, max_shift: float = 0.5,
+                 extent_tol: float = 0.3, max_missed: int = 3,
+                 size_tol=SIZE_TOL, point_to_plane: bool = False,
+                 backend: str = "ransac"):
+        self.parts = list(parts)
+        self.min_fitness = min_fitness
+        self.max_shift = max_shift
+        self.extent_tol = extent_tol
+        self.max_missed = max_missed
+        self.point_to_plane = point_to_plane
+        self.backend = backend
+        self.index = (SignatureIndex([p for p, _ in self.parts], size_tol)
+                      if size_tol is not None else None)
+        self.reset()
+
+    def reset(self):
+        self.tracks = []
+        self._next_id = 0
+        self.warm = self.full = 0
+
+    def _associate(self, centers, extents):
+        """(iz indisi, segment indisi) çiftleri; kapı dışındakiler atanmaz."""
+        if not self.tracks or not len(centers):
+            return []
+        t_centers = np.array([t.center for t in self.tracks])
+        t_extents = np.array([t.extents for t in self.tracks])
+        t_diag = np.maximum(np.linalg.norm(t_extents, axis=1), 1e-12)
+        shift = np.linalg.norm(centers[None] - t_centers[:, None], axis=2) / t_diag[:, None]
+        rel = np.abs(extents[None] - t_extents[:, None]) / np.maximum(t_extents[:, None], 1e-12)
+        size = rel.max(axis=2)
+        cost = shift + size
+        cost[(shift > self.max_shift) | (size > self.extent_tol)] = INVALID_COST
+        rows, cols = linear_assignment(cost)
+        ok = cost[rows, cols] < INVALID_COST
+        return list(zip(rows[ok].tolist(), cols[ok].tolist()))
+
+    def _full(self, seg, sig):
+        """
+        Aday parçalar arasında tam kayıt; (parça, poz, fitness, rmse) ya da
+        fitness `min_fitness` altındaysa None (gürültü/zemin artıkları iz olmaz).
+        """
+        candidates = (self.index.rank(sig) if self.index is not None
+                      else range(len(self.parts)))
+        best = None
+        for j in candidates:
+            part, cad_key = self.parts[j]
+            T, fit, rmse = register_part_to_segment(
+                part, seg, cad_key, point_to_plane=self.point_to_plane,
+                backend=self.backend,
+            )
+            if T is not None and (best is None or fit > best[2]
+                                  or (fit == best[2] and rmse < best[3])):
+                best = (int(j), T, fit, rmse)
+        self.full += 1
+        if best is None or best[2] < self.min_fitness:
+            return None
+        return best
+
+    def update(self, result):
+        """
+        `SegmentationResult` ile izleri günceller; eşleşen her segment için
+        bir `TrackMatch` listesi döner (segment sırasıyla).
+        """
+        n = len(result)
+        pts = [result.part_points(i) for i in range(n)]
+        sigs = [signature(p) for p in pts]
+        centers = np.array([p.mean(axis=0, dtype=np.float64)
+                            for p in pts]).reshape(-1, 3)
+        extents = np.array([s.extents for s in sigs]).reshape(-1, 3)
+
+        matches = {}
+        seen, handled = set(), set()
+        for ti, si in self._associate(centers, extents):
+            track = self.tracks[ti]
+            handled.add(si)
+            seg = to_cloud(pts[si])
+            part, cad_key = self.parts[track.part]
+            init = translation(centers[si] - track.center) @ track.pose
+            T, fit, rmse = track_part_to_segment(
+                part, seg, init, cad_key, self.point_to_plane,
+            )
+            warm = T is not None and fit >= self.min_fitness
+            if warm:
+                self.warm += 1
+            else:
+                # Başarısız iz güncellenmez; görülmemiş sayılır
+                best = self._full(seg, sigs[si])
+                if best is None:
+                    continue
+                track.part, T, fit, rmse = best
+            seen.add(ti)
+            track.pose, track.fitness, track.rmse = T, fit, rmse
+            track.center, track.extents = centers[si], extents[si]
+            track.missed = 0
+            matches[si] = TrackMatch(si, track.id, track.part, fit, rmse, T, warm)
+
+        # Kaybolan izler birkaç kare tutulur (geçici örtülme)
+        for ti, track in enumerate(self.tracks):
+            if ti not in seen:
+                track.missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+
+        for si in range(n):
+            if si in handled:
+                continue
+            best = self._full(to_cloud(pts[si]), sigs[si])
+            if best is None:
+                continue
+            j, T, fit, rmse = best
+            track = Track(self._next_id, j, T, centers[si], extents[si], fit, rmse)
+            self._next_id += 1
+            self.tracks.append(track)
+            matches[si] = TrackMatch(si, track.id, j, fit, rmse, T, False)
+
+        return [matches[i] for i in sorted(matches)]
@@ -0,0 +1,92 @@
+"""assignment: Macar algoritması kaba kuvvete karşı ve INVALID_COST satırları."""
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("open3d")
+
+from inference import assignment  # noqa: E402
+from inference.assignment import INVALID_COST  # noqa: E402
+
+SHAPES = [(1, 1), (1, 5), (3, 3), (2, 4), (4, 2), (5, 5), (6, 3)]
+
+
+@pytest.fixture(params=["scipy", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "scipy":
+        if assignment._scipy_lsa is None:
+            pytest.skip("SciPy kurulu değil")
+    else:
+        monkeypatch.setattr(assignment, "_scipy_lsa", None)
+    return request.param
+
+
+def brute_force(cost):
+    """Tüm bire bir eşlemeler arasında en düşük toplam."""
+    n, m = cost.shape
+    if n > m:
+        return brute_force(cost.T)
+    return min(sum(cost[i, j] for i, j in enumerate(cols))
+               for cols in itertools.permutations(range(m), n))
+
+
+def check(cost):
+    rows, cols = assignment.linear_assignment(cost)
+    k = min(cost.shape)
+    assert len(rows) == len(cols) == k
+    assert len(set(rows.tolist())) == k and len(set(cols.tolist())) == k
+    assert np.all(np.diff(rows) > 0)
+    assert cost[rows, cols].sum() == pytest.approx(brute_force(cost))
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("seed", range(5))
+def test_random(backend, shape, seed):
+    check(np.random.default_rng(seed).uniform(size=shape))
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_ties(backend, shape):
+    check(np.random.default_rng(1).integers(0, 3, size=shape).astype(float))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_invalid_rows(backend, seed):
+    rng = np.random.default_rng(seed)
+    cost = rng.uniform(size=(4, 4))
+    cost[1] = INVALID_COST
+    cost[3, :2] = INVALID_COST
+    check(cost)
+
+
+def test_empty(backend):
+    rows, cols = assignment.linear_assignment(np.zeros((0, 3)))
+    assert len(rows) == len(cols) == 0
+
+
+def test_assign_parts(backend):
+    fitness = np.array([
+        [0.9, 0.8, 0.0],
+        [0.95, 0.1, 0.0],
+        [0.0, 0.0, 0.0],          # hiçbir parçayla hizalanamayan segment
+    ])
+    rmse = np.where(fitness > 0, 0.01, np.inf)
+    # Satır başına en iyi seçim 0. ve 1. segmenti aynı parçaya verirdi
+    assert assignment.assign_parts(fitness, rmse).tolist() == [1, 0, -1]
+
+
+def test_assign_parts_min_fitness(backend):
+    fitness = np.array([[0.9, 0.2], [0.3, 0.25]])
+    rmse = np.full(fitness.shape, 0.01)
+    assert assignment.assign_parts(fitness, rmse, min_fitness=0.5).tolist() == [0, -1]
+
+
+def test_match_cost():
+    fitness = np.array([[0.9, 0.5], [0.0, 0.7]])
+    rmse = np.array([[0.02, 0.04], [np.inf, 0.01]])
+    cost = assignment.match_cost(fitness, rmse)
+
+    assert cost[1, 0] == INVALID_COST
+    assert cost[0, 1] == pytest.approx(0.5 + assignment.RMSE_WEIGHT)
+    assert cost[0, 0] == pytest.approx(0.1 + assignment.RMSE_WEIGHT * 0.5)
@@ -0,0 +1,30 @@
+"""bench.runner.compare: gerileme eşiği mantığı."""
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("open3d")
+
+from bench.runner import compare  # noqa: E402
+
+
+def _results(**medians):
+    return {"results": {name: ({"median_s": s} if s is not None else {"error": "x"})
+                        for name, s in medians.items()}}
+
+
+def test_threshold():
+    baseline = _results(fast=1.0, same=1.0, edge=1.0, slow=2.0)
+    current = _results(fast=0.5, same=1.05, edge=1.1, slow=2.5)
+    # Eşik dahil değil: tam %10 artış gerileme sayılmaz
+    assert compare(current, baseline, 0.1) == [("slow", 2.0, 2.5, 1.25)]
+    assert [r[0] for r in compare(current, baseline, 0.0)] == ["same", "edge", "slow"]
+
+
+def test_skipped_cases():
+    baseline = _results(zero=0.0, failed=1.0)
+    current = _results(zero=5.0, failed=None, new=9.0)
+    assert compare(current, baseline, 0.1) == []
+
+
+def test_missing_baseline_results():
+    assert compare(_results(a=1.0), {}, 0.1) == []
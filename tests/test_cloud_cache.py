@@ -0,0 +1,100 @@
+"""cloud_cache: yazma → memmap okuma gidiş-dönüşü ve int16 nicemleme sınırları."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("open3d")
+
+from inference import cloud_cache  # noqa: E402
+
+
+@pytest.fixture
+def cloud():
+    rng = np.random.default_rng(0)
+    pts = rng.uniform([-5.0, 0.0, 2.0], [5.0, 0.5, 40.0], size=(1000, 3))
+    normals = rng.normal(size=(1000, 3))
+    colors = rng.uniform(0.0, 1.0, size=(1000, 3))
+    return pts, normals, colors
+
+
+def test_float_round_trip(tmp_path, cloud):
+    pts, normals, colors = cloud
+    path = tmp_path / "a.pcb"
+    cloud_cache.write_cache(path, pts, normals, colors)
+    arr = cloud_cache.read_cache(path)
+
+    assert isinstance(arr.positions, np.memmap)
+    assert not arr.quantized
+    assert len(arr) == len(pts)
+    np.testing.assert_array_equal(arr.points, pts.astype(np.float32))
+    np.testing.assert_array_equal(arr.normals, normals.astype(np.float32))
+    assert arr.colors.dtype == np.uint8
+    np.testing.assert_array_equal(arr.colors, np.rint(colors * 255).astype(np.uint8))
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_column_alignment(tmp_path, cloud):
+    pts, normals, colors = cloud
+    path = tmp_path / "a.pcb"
+    cloud_cache.write_cache(path, pts[:7], normals[:7], colors[:7])
+    layout, total = cloud_cache._layout(
+        cloud_cache.HAS_NORMALS | cloud_cache.HAS_COLORS, 7)
+
+    assert all(offset % cloud_cache.ALIGN == 0 for _, _, offset in layout)
+    assert path.stat().st_size == total
+
+
+def test_quantized_bounds(tmp_path, cloud):
+    pts, _, _ = cloud
+    path = tmp_path / "q.pcb"
+    cloud_cache.write_cache(path, pts, quantize=True)
+    arr = cloud_cache.read_cache(path)
+
+    assert arr.quantized
+    assert arr.positions.dtype == np.int16
+    # Eksen başına en küçük/en büyük değer int16 aralığının uçlarına düşer
+    assert arr.positions.min(axis=0).tolist() == [-32767] * 3
+    assert arr.positions.max(axis=0).tolist() == [32767] * 3
+    scale = (pts.max(axis=0) - pts.min(axis=0)) / 65534.0
+    np.testing.assert_allclose(arr.scale, scale)
+    np.testing.assert_allclose(arr.offset, pts.min(axis=0))
+    # Nicemleme hatası yarım adımı (float32 payıyla) geçmez
+    err = np.abs(arr.points - pts)
+    assert np.all(err <= scale / 2 + 1e-5 * np.abs(pts).max())
+
+
+def test_quantized_flat_axis(tmp_path):
+    pts = np.array([[0.0, 1.5, 0.0], [1.0, 1.5, 2.0], [0.5, 1.5, 1.0]])
+    path = tmp_path / "flat.pcb"
+    cloud_cache.write_cache(path, pts, quantize=True)
+    arr = cloud_cache.read_cache(path)
+
+    # Sabit eksen ölçek 1 alır ve değeri tam korunur
+    assert arr.scale[1] == 1.0
+    assert arr.positions[:, 1].tolist() == [-32767] * 3
+    np.testing.assert_array_equal(arr.points[:, 1], np.float32(1.5))
+
+
+def test_empty_cloud(tmp_path):
+    path = tmp_path / "empty.pcb"
+    cloud_cache.write_cache(path, np.zeros((0, 3)), quantize=True)
+    arr = cloud_cache.read_cache(path)
+
+    assert len(arr) == 0
+    assert arr.points.shape == (0, 3)
+
+
+def test_invalid_and_stale(tmp_path, cloud):
+    pts, _, _ = cloud
+    bad = tmp_path / "bad.pcb"
+    bad.write_bytes(b"not a cache")
+    assert cloud_cache.read_header(bad) is None
+    with pytest.raises(ValueError):
+        cloud_cache.read_cache(bad)
+
+    source = tmp_path / "scan.ply"
+    source.write_bytes(b"x")
+    path = tmp_path / "scan.pcb"
+    cloud_cache.write_cache(path, pts, source=source)
+    assert cloud_cache.is_fresh(path, source)
+    source.write_bytes(b"xy")
+    assert not cloud_cache.is_fresh(path, source)
@@ -0,0 +1,55 @@
+"""FrameQueue: latest-frame-wins düşürme politikası."""
+import threading
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("open3d")
+
+from inference.camera import Frame, FrameQueue  # noqa: E402
+
+
+def _frame(i):
+    return Frame(i, float(i), None)
+
+
+def test_overflow_drops_oldest():
+    q = FrameQueue(maxlen=4)
+    for i in range(6):
+        q.put(_frame(i))
+
+    assert len(q) == 4
+    assert q.dropped == 2
+    # En yeni kare döner, arada kalan üç kare de düşürülmüş sayılır
+    assert q.get_latest().index == 5
+    assert q.dropped == 5
+    assert len(q) == 0
+
+
+def test_timeout_returns_none():
+    q = FrameQueue()
+    assert q.get_latest(timeout=0.01) is None
+    assert q.dropped == 0
+
+
+def test_close_wakes_consumer():
+    q = FrameQueue()
+    out = []
+    t = threading.Thread(target=lambda: out.append(q.get_latest()))
+    t.start()
+    q.close()
+    t.join(timeout=2.0)
+
+    assert not t.is_alive()
+    assert out == [None]
+
+
+def test_put_wakes_consumer():
+    q = FrameQueue()
+    out = []
+    t = threading.Thread(target=lambda: out.append(q.get_latest(timeout=2.0)))
+    t.start()
+    q.put(_frame(7))
+    t.join(timeout=2.0)
+
+    assert [f.index for f in out] == [7]
@@ -0,0 +1,58 @@
+"""SegmentationResult: etiket sıralaması, CSR ofsetleri ve zemin dilimi."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("open3d")
+
+from inference.segmentation import GROUND, NOISE, SegmentationResult  # noqa: E402
+
+
+def _points(n):
+    # i. noktanın x koordinatı i: sıralamadan sonra kaynağı izlenebilir
+    return np.column_stack([np.arange(n), np.zeros(n), np.zeros(n)]).astype(np.float64)
+
+
+def test_offsets_and_parts():
+    labels = np.array([1, GROUND, 0, NOISE, 1, GROUND, 0])
+    res = SegmentationResult(_points(len(labels)), labels)
+
+    assert len(res) == 2
+    assert res.points.dtype == np.float32
+    assert res.labels.tolist() == [NOISE, GROUND, GROUND, 0, 0, 1, 1]
+    assert res.ground_start == 1
+    assert res.offsets.tolist() == [3, 5, 7]
+    assert res.sizes.tolist() == [2, 2]
+    # Kararlı sıralama: parça içi özgün sıra korunur
+    assert res.part_indices(0).tolist() == [2, 6]
+    assert res.part_indices(1).tolist() == [0, 4]
+    assert res.part_points(1)[:, 0].tolist() == [0.0, 4.0]
+    assert [p[:, 0].tolist() for p in res.iter_part_points()] == [[2.0, 6.0], [0.0, 4.0]]
+
+
+def test_ground_excludes_noise():
+    labels = np.array([NOISE, GROUND, 0, GROUND, NOISE])
+    res = SegmentationResult(_points(len(labels)), labels)
+
+    assert res.ground_points[:, 0].tolist() == [1.0, 3.0]
+    assert res.order[:res.ground_start].tolist() == [0, 4]
+
+
+@pytest.mark.parametrize("labels", [[], [NOISE], [GROUND, NOISE, GROUND]])
+def test_no_parts(labels):
+    labels = np.array(labels, dtype=np.int32)
+    res = SegmentationResult(_points(len(labels)), labels)
+
+    assert len(res) == 0
+    assert res.sizes.tolist() == []
+    assert len(res.ground_points) == int(np.sum(labels == GROUND))
+    assert list(res.iter_part_points()) == []
+
+
+def test_empty_label_gap():
+    # Hiç noktası olmayan ara etiket boş bir parça olarak kalır
+    labels = np.array([0, 2, 2])
+    res = SegmentationResult(_points(3), labels)
+
+    assert len(res) == 3
+    assert res.sizes.tolist() == [1, 0, 2]
+    assert len(res.part_points(1)) == 0